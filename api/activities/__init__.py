@@ -16,8 +16,11 @@ from activities.scoring import (  # noqa: F401
     pass1_biblical, pass2_structure, pass3_delivery, pass4_enrichment,
     classify_sermon, classify_segments, generate_summary,
 )
-from activities.rescore import rescore_sermon  # noqa: F401
+from activities.rescore import rescore_sermon, recompute_scores  # noqa: F401
 from activities.church import ensure_church  # noqa: F401
+from activities.beliefs import plan_cbv, compute_cbv  # noqa: F401
+from activities.feeds import list_feeds_to_poll, poll_feed  # noqa: F401
 from activities.misc import (  # noqa: F401
-    update_sermon, detect_ai_generation, summarize_sermon_content, download_rss_audio,
+    update_sermon, migrate_sermon_artifacts, release_admission_slot, acquire_admission_slot, load_pipeline_input, fail_queued_sermons, translate_transcript, detect_ai_generation,
+    summarize_sermon_content, download_rss_audio,
 )
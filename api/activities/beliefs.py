@@ -0,0 +1,32 @@
+"""Background church-beliefs (CBV) activities — see cbv.py."""
+
+import os
+
+from activities.helpers import _openai_client, log
+
+
+def _db():
+    from azure.cosmos import CosmosClient
+    cosmos = CosmosClient.from_connection_string(os.environ["COSMOS_CONNECTION_STRING"])
+    return cosmos.get_database_client("psr")
+
+
+def plan_cbv(input_data):
+    """Batches of a church's sermons whose CBV is missing or stale. Returns {"beliefsHash", "batches"}."""
+    import cbv
+    church_id = input_data["churchId"]
+    db = _db()
+    beliefs = cbv.church_beliefs(db, church_id)
+    if not beliefs:
+        return {"beliefsHash": None, "batches": []}
+    current_hash = cbv.beliefs_hash(beliefs)
+    batches = cbv.plan_batches(cbv.stale_sermons(db, church_id, current_hash))
+    log.info(f"[plan_cbv] {church_id}: {sum(len(b) for b in batches)} stale sermon(s) in {len(batches)} batch(es)")
+    return {"beliefsHash": current_hash, "batches": batches}
+
+
+def compute_cbv(input_data):
+    """Recompute CBV for one batch of a church's sermons (one LLM request). Returns {"computed": [ids]}."""
+    import cbv
+    written = cbv.compute(_db(), _openai_client(), input_data["churchId"], input_data["sermonIds"])
+    return {"computed": written}
@@ -3,62 +3,72 @@
 import os
 
 from activities.helpers import _openai_client, log
+from store import patch_fields
+import score_index
 
 
 def ensure_church(input_data):
-    """Auto-create a church entry if the pastor doesn't have one."""
+    """Auto-create a church entry if the pastor doesn't have one.
+
+    Pastors seen before resolve through pastor_index (one point read, no
+    churches query, no LLM call — including pastors the LLM couldn't place).
+    """
     import json as _json
     from azure.cosmos import CosmosClient
     from schema import UNASSIGNED_CHURCH_ID
+    import pastor_index
 
     pastor = input_data.get("pastor")
     sermon_id = input_data.get("sermonId")
 
     cosmos = CosmosClient.from_connection_string(os.environ["COSMOS_CONNECTION_STRING"])
     db = cosmos.get_database_client("psr")
-    try:
-        church_container = db.create_container_if_not_exists(
-            id="churches", partition_key={"paths": ["/id"], "kind": "Hash"},
-        )
-    except Exception:
-        church_container = db.get_container_client("churches")
-
-    try:
-        church_container.read_item(UNASSIGNED_CHURCH_ID, partition_key=UNASSIGNED_CHURCH_ID)
-    except Exception:
-        try:
-            church_container.create_item({
-                "id": UNASSIGNED_CHURCH_ID, "name": "Church Unassigned",
-                "city": "", "state": "", "url": "", "pastors": [], "autoCreated": True,
-            })
-        except Exception:
-            pass
 
     def _set_sermon_church(church_id):
         if not sermon_id:
             return
+        sermons = db.get_container_client("sermons")
         try:
-            sermon_container = db.get_container_client("sermons")
-            doc = sermon_container.read_item(sermon_id, partition_key=sermon_id)
-            doc["churchId"] = church_id
-            sermon_container.upsert_item(doc)
+            patch_fields(sermons, sermon_id, {"churchId": church_id})
         except Exception as e:
             log.warning(f"[ensure_church] Failed to set churchId on {sermon_id}: {e}")
+            return
+        score_index.safe_sync(sermons, sermon_id, "ensure_church")
 
-    def _assign_unassigned():
+    if not pastor:
         _set_sermon_church(UNASSIGNED_CHURCH_ID)
-        if pastor:
-            try:
-                ua = church_container.read_item(UNASSIGNED_CHURCH_ID, partition_key=UNASSIGNED_CHURCH_ID)
-                if not any(p["name"] == pastor for p in ua.get("pastors", [])):
-                    ua.setdefault("pastors", []).append({"name": pastor})
-                    church_container.upsert_item(ua)
-            except Exception:
-                pass
+        return {"ok": True, "church": None, "created": False, "churchId": None}
 
-    if not pastor:
+    indexed = pastor_index.lookup(pastor)
+    if indexed and indexed.get("churchId"):
+        _set_sermon_church(indexed["churchId"])
+        return {"ok": True, "church": indexed.get("church"), "created": False, "churchId": indexed["churchId"]}
+
+    try:
+        church_container = db.create_container_if_not_exists(
+            id="churches", partition_key={"paths": ["/id"], "kind": "Hash"},
+        )
+    except Exception:
+        church_container = db.get_container_client("churches")
+
+    def _assign_unassigned():
         _set_sermon_church(UNASSIGNED_CHURCH_ID)
-        return {"ok": True, "church": None, "created": False}
+        try:
+            ua = church_container.read_item(UNASSIGNED_CHURCH_ID, partition_key=UNASSIGNED_CHURCH_ID)
+        except Exception:
+            ua = {"id": UNASSIGNED_CHURCH_ID, "name": "Church Unassigned",
+                  "city": "", "state": "", "url": "", "pastors": [], "autoCreated": True}
+        try:
+            if not any(p["name"] == pastor for p in ua.get("pastors", [])):
+                ua.setdefault("pastors", []).append({"name": pastor})
+                church_container.upsert_item(ua)
+        except Exception:
+            pass
+
+    if indexed:
+        # Negative entry: the LLM couldn't place this pastor recently
+        _assign_unassigned()
+        return {"ok": True, "church": None, "created": False, "churchId": None}
 
     existing = list(church_container.query_items(
         "SELECT c.id, c.name FROM c WHERE ARRAY_CONTAINS(c.pastors, {'name': @p}, true)",
@@ -66,8 +76,9 @@ def ensure_church(input_data):
         enable_cross_partition_query=True,
     ))
     if existing:
+        pastor_index.record(pastor, existing[0]["id"], existing[0]["name"])
         _set_sermon_church(existing[0]["id"])
-        return {"ok": True, "church": existing[0]["name"], "created": False}
+        return {"ok": True, "church": existing[0]["name"], "created": False, "churchId": existing[0]["id"]}
 
     client = _openai_client()
     resp = client.chat.completions.create(
@@ -88,13 +99,15 @@ If you cannot confidently identify them, return: {{"name": null, "confidence": "
         result = _json.loads(resp.choices[0].message.content)
     except Exception:
         log.warning(f"[ensure_church] LLM returned unparseable response for {pastor}")
+        pastor_index.record(pastor, None)
         _assign_unassigned()
-        return {"ok": True, "church": None, "created": False}
+        return {"ok": True, "church": None, "created": False, "churchId": None}
 
     if not result.get("name") or result.get("confidence") == "low":
         log.info(f"[ensure_church] Could not identify church for {pastor}")
+        pastor_index.record(pastor, None)
         _assign_unassigned()
-        return {"ok": True, "church": None, "created": False}
+        return {"ok": True, "church": None, "created": False, "churchId": None}
 
     church_id = result["name"].lower().replace(" ", "-").replace("'", "")
     doc = {
@@ -106,8 +119,9 @@ If you cannot confidently identify them, return: {{"name": null, "confidence": "
     try:
         church_container.create_item(doc)
         log.info(f"[ensure_church] Auto-created church '{result['name']}' for {pastor}")
+        pastor_index.record(pastor, church_id, result["name"])
         _set_sermon_church(church_id)
-        return {"ok": True, "church": result["name"], "created": True}
+        return {"ok": True, "church": result["name"], "created": True, "churchId": church_id}
     except Exception as e:
         if "Conflict" in type(e).__name__ or "409" in str(e):
             existing_doc = church_container.read_item(church_id, partition_key=church_id)
@@ -117,8 +131,9 @@ If you cannot confidently identify them, return: {{"name": null, "confidence": "
                 existing_doc["pastors"] = pastors
                 church_container.upsert_item(existing_doc)
                 log.info(f"[ensure_church] Added {pastor} to existing church '{existing_doc['name']}'")
+            pastor_index.record(pastor, church_id, existing_doc["name"])
             _set_sermon_church(church_id)
-            return {"ok": True, "church": existing_doc["name"], "created": False}
+            return {"ok": True, "church": existing_doc["name"], "created": False, "churchId": church_id}
         log.warning(f"[ensure_church] Failed to create church for {pastor}: {e}")
         _assign_unassigned()
-        return {"ok": True, "church": None, "created": False}
+        return {"ok": True, "church": None, "created": False, "churchId": None}
@@ -0,0 +1,13 @@
+"""RSS feed polling activities (feed_poll_orchestrator)."""
+
+import feed_poll
+
+
+def list_feeds_to_poll(input_data):
+    """Ids of the active feeds this poll run covers (all, ``feedIds``, or only due ones)."""
+    return feed_poll.feeds_to_poll(input_data.get("feedIds"), due_only=input_data.get("dueOnly", False))
+
+
+async def poll_feed(input_data):
+    """Poll one feed — fetch, parse, submit new episodes, record the result. Never raises."""
+    return await feed_poll.poll_feed_by_id(input_data["feedId"])
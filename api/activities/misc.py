@@ -1,48 +1,94 @@
-"""Miscellaneous activities: update_sermon, AI detection, content summary, RSS download."""
+"""Miscellaneous activities: update_sermon, artifact migration, admission release, translation, AI detection, content summary, RSS download."""
 
 import json
 import os
 
 from activities.helpers import _openai_client, _cosmos_client
 from log import log
+from store import offload_updates, needs_migration, patch_fields, set_translation_artifacts
+import score_index
 
 
 def update_sermon(input_data):
-    """Patch a sermon document in Cosmos DB with etag check."""
+    """Patch changed fields onto a sermon document in Cosmos DB (no read-modify-write)."""
     container = _cosmos_client()
     sermon_id = input_data["sermonId"]
-    updates = input_data["updates"]
+    updates = offload_updates(sermon_id, input_data["updates"])
+    translation_artifacts = updates.pop("translationArtifacts", None)
 
     try:
-        doc = container.read_item(sermon_id, partition_key=sermon_id)
+        patch_fields(container, sermon_id, updates)
+        if translation_artifacts:
+            set_translation_artifacts(container, sermon_id, translation_artifacts)
     except Exception as e:
         if "NotFound" in type(e).__name__ or "CosmosResourceNotFoundError" in type(e).__name__:
             log.error(f"[update_sermon] {sermon_id}: not found in Cosmos")
             return {"ok": False, "error": "not_found"}
         raise
 
-    etag = doc.get("_etag")
-    doc.update(updates)
+    if score_index.TRACKED_FIELDS & updates.keys():
+        score_index.safe_sync(container, sermon_id, "update_sermon")
+    return {"ok": True}
 
-    try:
-        kwargs = {}
-        if etag:
-            from azure.core import MatchConditions
-            kwargs["etag"] = etag
-            kwargs["match_condition"] = MatchConditions.IfNotModified
-        container.upsert_item(doc, **kwargs)
-    except Exception as e:
-        if "PreconditionFailed" in type(e).__name__ or "412" in str(e):
-            log.warning(f"[update_sermon] {sermon_id}: etag mismatch, re-reading and retrying")
-            doc = container.read_item(sermon_id, partition_key=sermon_id)
-            doc.update(updates)
-            container.upsert_item(doc)
-        else:
-            raise
 
+def migrate_sermon_artifacts(input_data):
+    """Move one sermon's inline transcript/translations/history to blob artifacts."""
+    container = _cosmos_client()
+    sermon_id = input_data["sermonId"]
+    doc = container.read_item(sermon_id, partition_key=sermon_id)
+    if not needs_migration(doc):
+        return {"ok": True, "migrated": False}
+
+    before = len(json.dumps(doc, default=str))
+    moved = {k: doc[k] for k in ("transcript", "previousScores") if doc.get(k)}
+    if doc.get("translations"):
+        moved["translations"] = doc["translations"]
+        moved["translationArtifacts"] = doc.get("translationArtifacts")
+    doc.update(offload_updates(sermon_id, moved))
+
+    from azure.core import MatchConditions
+    container.replace_item(sermon_id, doc, etag=doc.get("_etag"), match_condition=MatchConditions.IfNotModified)
+    after = len(json.dumps(doc, default=str))
+    log.info(f"[migrate_artifacts] {sermon_id}: {before} → {after} bytes")
+    return {"ok": True, "migrated": True, "bytesBefore": before, "bytesAfter": after}
+
+
+def release_admission_slot(input_data):
+    """Give back the lane slot the work queue dispatcher took for this orchestration."""
+    import admission
+    admission.release_slot(input_data.get("lane", "interactive"))
     return {"ok": True}
 
 
+def acquire_admission_slot(input_data):
+    """Take a lane slot for work an orchestration starts itself (bulk import children)."""
+    import admission
+    return {"ok": admission.acquire_slot(input_data.get("lane", "interactive"))}
+
+
+def fail_queued_sermons(input_data):
+    """Fail a bulk import's unstarted (still ``queued``) sermons after the import itself failed."""
+    import bulk_import
+    failed = bulk_import.fail_queued(_cosmos_client(), input_data["sermonIds"], input_data.get("error") or "Import failed")
+    return {"ok": True, "failed": failed}
+
+
+def load_pipeline_input(input_data):
+    """Read a pipeline input stored as an artifact (bulk import, reaper resubmits)."""
+    from store import get_artifact
+    return get_artifact(input_data["artifact"])
+
+
+def translate_transcript(input_data):
+    """Translate a sermon's transcript and store it as a translation artifact (long transcripts)."""
+    import translation
+    container = _cosmos_client()
+    sermon_id = input_data["sermonId"]
+    doc = container.read_item(sermon_id, partition_key=sermon_id)
+    _, stats = translation.translate_and_store(container, doc, input_data["language"])
+    return {"ok": True, "sermonId": sermon_id, "language": input_data["language"], **stats}
+
+
 def detect_ai_generation(input_data):
     """Detect if transcript was AI-generated. Returns {"aiScore": 1|2|3, "aiReasoning": str}."""
     client = _openai_client()
@@ -6,6 +6,8 @@ from activities.scoring import (
     classify_sermon, classify_segments, generate_summary,
 )
 from activities.misc import update_sermon
+from store import load_transcript, load_previous_scores
+import recompute
 
 
 def rescore_sermon(input_data):
@@ -13,7 +15,7 @@ def rescore_sermon(input_data):
 
     Supports selective per-pass rescore via input_data["passes"].
     """
-    from schema import (normalize_scores, compute_composite, PIPELINE_VERSION,
+    from schema import (normalize_scores, compute_composite, PIPELINE_VERSION, SCORING_CODE_VERSION,
                         SCORING_MODELS, PASS_HASHES, PASS_CATEGORIES, detect_stale_passes)
     import datetime
 
@@ -24,12 +26,6 @@ def rescore_sermon(input_data):
     if doc.get("status") != "complete":
         return {"ok": False, "error": "sermon not complete"}
 
-    transcript = doc["transcript"]["fullText"]
-    audio_metrics = doc.get("audioMetrics")
-    duration = doc.get("duration") or 0
-    word_count = len(transcript.split())
-    wpm = round(word_count / (duration / 60), 1) if duration > 0 else 130
-
     requested = input_data.get("passes")
     if requested is None:
         run_passes = {"pass1", "pass2", "pass3", "pass4", "classify", "segments", "summary"}
@@ -46,10 +42,26 @@ def rescore_sermon(input_data):
     if not run_passes:
         return {"ok": True, "compositePsr": doc.get("compositePsr"), "passesRun": [], "message": "all passes up to date"}
 
+    scoring_passes = {"pass1", "pass2", "pass3"}
+    if run_passes == {"recompute"}:
+        # Code-side scoring only — re-derive from stored rawScores, no transcript, no LLM
+        outcome = recompute.recompute_sermon(container, doc)
+        composite = recompute.derive(doc)["compositePsr"] if outcome == "updated" else doc.get("compositePsr")
+        return {"ok": outcome != "conflict", "compositePsr": composite, "passesRun": ["recompute"], "recompute": outcome}
+    if run_passes & scoring_passes:
+        run_passes.discard("recompute")  # the LLM path re-derives everything anyway
+
+    stored = load_transcript(doc)
+    transcript = stored["fullText"]
+    audio_metrics = doc.get("audioMetrics")
+    duration = doc.get("duration") or 0
+    word_count = len(transcript.split())
+    wpm = round(word_count / (duration / 60), 1) if duration > 0 else 130
+
     log.info(f"[rescore] {sermon_id}: running passes {sorted(run_passes)}")
 
     existing_cats = doc.get("categories", {})
-    scoring_changed = any(p in run_passes for p in ("pass1", "pass2", "pass3"))
+    scoring_changed = bool(run_passes & scoring_passes)
 
     raw_scores = {}
     if "pass1" in run_passes:
@@ -87,10 +99,11 @@ def rescore_sermon(input_data):
         classification = {"sermonType": doc.get("sermonType", "topical"),
                           "confidence": doc.get("classificationConfidence", 50)}
 
+    audio_available = audio_metrics is not None
     if scoring_changed:
         categories, norm_applied = normalize_scores(
             raw_scores, classification["sermonType"], classification["confidence"],
-            audio_available=audio_metrics is not None)
+            audio_available=audio_available)
         composite = compute_composite(categories)
     else:
         categories = existing_cats
@@ -113,7 +126,7 @@ def rescore_sermon(input_data):
         categories, consistency_flags = consistency_check(categories, enrichment)
         composite = compute_composite(categories)
 
-    existing_segs = doc.get("transcript", {}).get("segments", [])
+    existing_segs = stored["segments"] or []
     if "segments" in run_passes:
         if len(existing_segs) <= 3 and word_count > 200:
             import re
@@ -152,7 +165,7 @@ def rescore_sermon(input_data):
         if p in PASS_HASHES:
             pass_versions[p] = PASS_HASHES[p]
 
-    previous = doc.get("previousScores", [])
+    previous = load_previous_scores(doc)
     if scoring_changed:
         previous.append({
             "compositePsr": doc.get("compositePsr"),
@@ -172,20 +185,34 @@ def rescore_sermon(input_data):
             "compositePsr": composite, "categories": categories,
             "sermonType": classification["sermonType"],
             "classificationConfidence": classification["confidence"],
-            "normalizationApplied": norm_applied,
+            "normalizationApplied": norm_applied, "audioAvailable": audio_available,
             "rawScores": {k: raw_scores[k]["score"] for k in raw_scores},
             "strengths": summary.get("strengths"), "improvements": summary.get("improvements"),
             "summary": summary.get("summary"), "previousScores": previous,
-            "consistencyFlags": consistency_flags,
+            "consistencyFlags": consistency_flags, "scoringCodeVersion": SCORING_CODE_VERSION,
         })
     if "pass4" in run_passes:
         updates["enrichment"] = enrichment
     if "segments" in run_passes:
-        updates["transcript"] = {"fullText": transcript, "segments": classified_segs}
+        updates["transcript"] = {"fullText": transcript, "segments": classified_segs, "wordCount": word_count}
     if not scoring_changed and "summary" in run_passes:
         updates.update({"strengths": summary.get("strengths"), "improvements": summary.get("improvements"),
                         "summary": summary.get("summary")})
 
     update_sermon({"sermonId": sermon_id, "updates": updates})
 
+    if "recompute" in run_passes:
+        # Non-scoring passes ran (e.g. new enrichment) — re-derive scores from the updated doc
+        merged = {**doc, **updates}
+        if recompute.recompute_sermon(container, merged) == "updated":
+            composite = recompute.derive(merged)["compositePsr"]
+
     return {"ok": True, "compositePsr": composite, "passesRun": sorted(run_passes)}
+
+
+def recompute_scores(input_data):
+    """One page of the bulk no-LLM recompute (recompute_orchestrator). See recompute.recompute_batch."""
+    return recompute.recompute_batch(
+        _cosmos_client(), after=input_data.get("after"), sermon_ids=input_data.get("sermonIds"),
+        stale_only=input_data.get("staleOnly", False),
+    )
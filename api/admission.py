@@ -0,0 +1,167 @@
+"""Upload admission control — constant-cost point operations on the ``control`` container.
+
+Replaces the cross-partition ``COUNT(1)`` queries the upload routes used to
+run (status = 'processing', and per-IP uploads in the last hour), which grew
+with the corpus and failed open.
+
+* Pipeline slots — one counter document, ``inflight``, with a total ``count``
+  and one counter per lane (``interactive``, ``rss``, ``rescore``, ``bulk``). A slot is
+  taken with a filtered patch (``incr`` only ``WHERE`` the lane and total
+  limits still hold), so acquisition is atomic without an etag retry loop.
+  RESERVED_INTERACTIVE slots are off-limits to the background lanes, so a
+  user upload never waits behind an RSS backfill or a bulk rescore. The work
+  queue dispatcher takes slots; orchestrators give them back when they
+  finish (``activity_release_slot``).
+* Per-IP upload rate — sliding-window counter. One TTL'd bucket document per
+  IP per hour; the previous bucket is weighted by how much of it still falls
+  inside the trailing hour.
+
+Cosmos errors propagate; the upload routes fail closed (503).
+"""
+
+import hashlib
+import math
+import os
+import time
+
+from log import log
+from store import patch_fields
+
+MAX_CONCURRENT = 3
+RESERVED_INTERACTIVE = 1  # slots only the interactive lane may use
+LANE_LIMITS = {"interactive": MAX_CONCURRENT, "rss": 2, "rescore": 1, "bulk": 2}
+MAX_UPLOADS_PER_HOUR = 5
+RATE_WINDOW_SECONDS = 3600
+SLOT_DOC_ID = "inflight"
+
+_container = None
+
+
+def _control_container():
+    """Get or create the control Cosmos container (per-item TTL enabled)."""
+    global _container
+    if _container is None:
+        from azure.cosmos import CosmosClient
+        cosmos = CosmosClient.from_connection_string(os.environ["COSMOS_CONNECTION_STRING"])
+        db = cosmos.get_database_client("psr")
+        try:
+            _container = db.create_container_if_not_exists(
+                id="control", partition_key={"paths": ["/id"], "kind": "Hash"}, default_ttl=-1,
+            )
+        except Exception:
+            _container = db.get_container_client("control")
+    return _container
+
+
+def _ensure_doc(container, doc_id, doc):
+    from azure.cosmos import exceptions
+    try:
+        container.create_item({"id": doc_id, **doc})
+    except exceptions.CosmosResourceExistsError:
+        pass
+
+
+def _guarded_incr(container, doc_id, predicate, seed, fields=("count",)):
+    """incr ``fields`` by 1 if ``predicate`` holds, creating the doc from ``seed`` on first use."""
+    from azure.cosmos import exceptions
+    for _ in range(2):
+        try:
+            patch_fields(container, doc_id, incr={f: 1 for f in fields}, filter_predicate=predicate)
+            return True
+        except exceptions.CosmosAccessConditionFailedError:
+            return False
+        except exceptions.CosmosResourceNotFoundError:
+            _ensure_doc(container, doc_id, seed)
+    return False
+
+
+# ── Pipeline slots ──
+
+def _slot_predicate(lane):
+    conditions = [f"c.count < {MAX_CONCURRENT}", f"(c.{lane} ?? 0) < {LANE_LIMITS[lane]}"]
+    if lane != "interactive":
+        conditions.append(f"c.count - (c.interactive ?? 0) < {MAX_CONCURRENT - RESERVED_INTERACTIVE}")
+    return "FROM c WHERE " + " AND ".join(conditions)
+
+
+def acquire_slot(lane="interactive"):
+    """Take a pipeline slot for ``lane``. False when the lane (or the pipeline) is full."""
+    seed = {"count": 0, **{name: 0 for name in LANE_LIMITS}}
+    return _guarded_incr(_control_container(), SLOT_DOC_ID, _slot_predicate(lane), seed,
+                         fields=("count", lane))
+
+
+def release_slot(lane="interactive"):
+    """Give a ``lane`` slot back. Never drives a counter below zero.
+
+    Slots taken before the counter doc had lane fields only counted ``count``;
+    when the lane counter is already at zero, only ``count`` is given back.
+    """
+    from azure.cosmos import exceptions
+    container = _control_container()
+    try:
+        patch_fields(container, SLOT_DOC_ID, incr={"count": -1, lane: -1},
+                     filter_predicate=f"FROM c WHERE c.count > 0 AND (c.{lane} ?? 0) > 0")
+        return
+    except exceptions.CosmosResourceNotFoundError:
+        log.warning("[admission] release_slot: no slot counter doc")
+        return
+    except exceptions.CosmosAccessConditionFailedError:
+        pass
+    try:
+        patch_fields(container, SLOT_DOC_ID, incr={"count": -1}, filter_predicate="FROM c WHERE c.count > 0")
+    except (exceptions.CosmosAccessConditionFailedError, exceptions.CosmosResourceNotFoundError):
+        log.warning(f"[admission] release_slot: {lane} counter already at zero")
+
+
+def slots_in_use():
+    """In-flight counters: {"count": total, "interactive": n, "rss": n, "rescore": n, "bulk": n}."""
+    from azure.cosmos import exceptions
+    try:
+        doc = _control_container().read_item(SLOT_DOC_ID, partition_key=SLOT_DOC_ID)
+    except exceptions.CosmosResourceNotFoundError:
+        doc = {}
+    return {"count": doc.get("count", 0), **{name: doc.get(name, 0) for name in LANE_LIMITS}}
+
+
+# ── Per-IP upload rate ──
+
+def _rate_doc_id(client_ip, window):
+    # Hashed so raw IPs never end up in document ids (and '/', '?', '#' can't break them)
+    return f"rate-{hashlib.sha256(client_ip.encode()).hexdigest()[:16]}-{window}"
+
+
+def _bucket_count(container, doc_id):
+    from azure.cosmos import exceptions
+    try:
+        return container.read_item(doc_id, partition_key=doc_id).get("count", 0)
+    except exceptions.CosmosResourceNotFoundError:
+        return 0
+
+
+def take_upload_token(client_ip, limit=MAX_UPLOADS_PER_HOUR, now=None):
+    """Count one upload for ``client_ip``. False if that would exceed ``limit`` in the trailing hour."""
+    now = time.time() if now is None else now
+    window = int(now // RATE_WINDOW_SECONDS)
+    overlap = 1 - (now % RATE_WINDOW_SECONDS) / RATE_WINDOW_SECONDS
+
+    container = _control_container()
+    previous = _bucket_count(container, _rate_doc_id(client_ip, window - 1)) * overlap
+    allowed = math.ceil(limit - previous)  # current bucket must stay below this
+    if allowed <= 0:
+        return False
+    return _guarded_incr(container, _rate_doc_id(client_ip, window),
+                         f"FROM c WHERE c.count < {allowed}",
+                         {"count": 0, "ttl": 2 * RATE_WINDOW_SECONDS})
+
+
+def refund_upload_token(client_ip, now=None):
+    """Undo ``take_upload_token`` for an upload that was not accepted after all."""
+    from azure.cosmos import exceptions
+    now = time.time() if now is None else now
+    try:
+        patch_fields(_control_container(), _rate_doc_id(client_ip, int(now // RATE_WINDOW_SECONDS)),
+                     incr={"count": -1}, filter_predicate="FROM c WHERE c.count > 0")
+    except (exceptions.CosmosAccessConditionFailedError, exceptions.CosmosResourceNotFoundError):
+        pass
+
@@ -0,0 +1,173 @@
+"""Bulk sermon import — archived manuscripts in one request, one parent orchestration.
+
+POST /api/admin/import takes either
+
+* a zip of manuscripts (any extension ``_extract_text`` handles; the title
+  is the file name), or
+* NDJSON, one sermon per line:
+  ``{"text": "...", "title": "...", "pastor": "...", "date": "YYYY-MM-DD", "filename": "..."}``
+
+Documents are extracted one at a time (zip members are opened individually,
+NDJSON is read line by line) and handed to a thread pool that writes the
+pipeline-input artifact and creates the ``queued`` sermon doc, so at most
+IMPORT_WRITE_WORKERS transcripts are held in memory at once. The Python
+Cosmos SDK has no bulk executor; concurrent point creates are its
+equivalent.
+
+The sermons then run through ``bulk_import_orchestrator``: a single parent
+queued in the ``bulk`` lane that drives ``text_sermon_orchestrator``
+sub-orchestrations up to IMPORT_CONCURRENCY at a time and reports progress in
+its custom status. Each running child holds a ``bulk`` slot, so the fan-out
+is also capped by admission (lane limit, RESERVED_INTERACTIVE) and never
+waits behind, or holds up, admin rescores.
+"""
+
+import concurrent.futures
+import datetime
+import io
+import json
+import os
+import uuid
+import zipfile
+
+from log import log
+from helpers import _extract_text, ALLOWED_TEXT_EXTENSIONS
+from schema import new_sermon_doc, fail_sermon_doc
+from store import put_artifact, patch_fields
+import admission
+
+MAX_IMPORT_DOCS = 500
+MAX_DOC_BYTES = 10 * 1024 * 1024
+MIN_WORDS = 50
+IMPORT_CONCURRENCY = 2
+MAX_IMPORT_CONCURRENCY = admission.LANE_LIMITS["bulk"]  # more children than lane slots would only wait
+IMPORT_WRITE_WORKERS = 8
+
+
+def _zip_documents(body):
+    with zipfile.ZipFile(io.BytesIO(body)) as z:
+        for info in z.infolist():
+            name = os.path.basename(info.filename)
+            if info.is_dir() or not name or name.startswith(".") or info.filename.startswith("__MACOSX/"):
+                continue
+            if os.path.splitext(name)[1].lower() not in ALLOWED_TEXT_EXTENSIONS:
+                yield name, None, {}, "Unsupported format"
+                continue
+            if info.file_size > MAX_DOC_BYTES:
+                yield name, None, {}, "File too large (max 10MB)"
+                continue
+            try:
+                with z.open(info) as member:
+                    data = member.read(MAX_DOC_BYTES + 1)
+                text = _extract_text(data, name, "")
+            except ValueError as e:
+                yield name, None, {}, str(e) or "Could not extract text"
+                continue
+            except Exception as e:
+                # Malformed .docx/.odt XML, a corrupt member, … — skip the file, keep the import going
+                log.warning(f"[bulk_import] {name}: extraction failed: {e!r}")
+                yield name, None, {}, "Could not extract text"
+                continue
+            yield name, text, {"title": os.path.splitext(name)[0]}, None
+
+
+def _ndjson_documents(body):
+    for line_no, line in enumerate(io.BytesIO(body), 1):
+        line = line.strip()
+        if not line:
+            continue
+        name = f"line {line_no}"
+        try:
+            record = json.loads(line)
+        except ValueError:
+            yield name, None, {}, "Invalid JSON"
+            continue
+        if not isinstance(record, dict):
+            yield name, None, {}, "Expected a JSON object"
+            continue
+        meta = {k: record.get(k) for k in ("title", "pastor", "date")}
+        yield record.get("filename") or name, record.get("text") or record.get("transcript"), meta, None
+
+
+def iter_documents(body, filename="", content_type=""):
+    """Yield ``(name, text, metadata, error)`` for each document in a zip or NDJSON upload."""
+    ext = os.path.splitext(filename or "")[1].lower()
+    if ext == ".zip" or "zip" in content_type or body[:4] == b"PK\x03\x04":
+        try:
+            yield from _zip_documents(body)
+        except zipfile.BadZipFile:
+            raise ValueError("Not a valid zip file")
+    else:
+        yield from _ndjson_documents(body)
+
+
+def _create_one(container, import_id, name, text, meta, defaults):
+    sermon_id = str(uuid.uuid4())
+    word_count = len(text.split())
+    title = meta.get("title") or None
+    pastor = meta.get("pastor") or defaults.get("pastor")
+    put_artifact(f"{sermon_id}/pipeline-input.json.gz", {
+        "sermonId": sermon_id,
+        "transcript": text,
+        "wordCount": word_count,
+        "userTitle": title,
+        "userPastor": pastor,
+    })
+    doc = new_sermon_doc(sermon_id, name, title, pastor, status="queued")
+    if meta.get("date"):
+        doc["date"] = meta["date"]
+    doc["inputType"] = "text"
+    doc["importId"] = import_id
+    doc["uploadedAt"] = datetime.datetime.utcnow().isoformat() + "Z"
+    container.create_item(doc)
+    return sermon_id
+
+
+def create_sermons(container, import_id, documents, defaults=None):
+    """Validate and create queued sermon docs for ``documents``.
+
+    Returns ``(sermon_ids, skipped)``; ``skipped`` lists ``{"name", "error"}``.
+    """
+    defaults = defaults or {}
+    sermon_ids, skipped = [], []
+    with concurrent.futures.ThreadPoolExecutor(max_workers=IMPORT_WRITE_WORKERS) as pool:
+        futures = {}
+        for name, text, meta, error in documents:
+            if not error and not text:
+                error = "No text"
+            if not error and len(text.split()) < MIN_WORDS:
+                error = f"Transcript too short (under {MIN_WORDS} words)"
+            if not error and len(futures) + len(sermon_ids) >= MAX_IMPORT_DOCS:
+                error = f"Import limit reached ({MAX_IMPORT_DOCS} sermons)"
+            if error:
+                skipped.append({"name": name, "error": error})
+                continue
+            futures[pool.submit(_create_one, container, import_id, name, text, meta, defaults)] = name
+            if len(futures) >= IMPORT_WRITE_WORKERS * 2:
+                _collect(futures, sermon_ids, skipped, concurrent.futures.FIRST_COMPLETED)
+        _collect(futures, sermon_ids, skipped, concurrent.futures.ALL_COMPLETED)
+    return sermon_ids, skipped
+
+
+def fail_queued(container, sermon_ids, error):
+    """Fail import sermons still ``queued`` (their parent gave up). Returns how many were failed."""
+    from azure.cosmos import exceptions
+    failed = 0
+    for sermon_id in sermon_ids:
+        try:
+            patch_fields(container, sermon_id, fail_sermon_doc(error), filter_predicate="FROM c WHERE c.status = 'queued'")
+            failed += 1
+        except (exceptions.CosmosAccessConditionFailedError, exceptions.CosmosResourceNotFoundError):
+            pass
+    return failed
+
+
+def _collect(futures, sermon_ids, skipped, return_when):
+    done, _ = concurrent.futures.wait(futures, return_when=return_when)
+    for future in done:
+        name = futures.pop(future)
+        try:
+            sermon_ids.append(future.result())
+        except Exception as e:
+            log.error(f"[bulk_import] {name}: create failed: {e}")
+            skipped.append({"name": name, "error": "Failed to create sermon record"})
@@ -0,0 +1,167 @@
+"""Church-beliefs-and-values (CBV) checks — which of a church's beliefs a sermon touches.
+
+Church lookup is indexed: the sermon's ``churchId`` (set by ensure_church),
+then the pastor index, then an ``ARRAY_CONTAINS`` query projected to ids.
+Only the ``beliefs`` field of the church is fetched — a single-partition
+projection, not the whole document with every scraped page.
+
+Results are stored on the sermon as ``cbv`` with ``cbvBeliefsHash`` — the
+hash of the beliefs they were computed against. ``cbv_orchestrator``
+recomputes a church's stale sermons in the background (after upsert_church
+and after a sermon completes), several sermons per LLM request
+(``plan_batches`` packs them by word count), so page views rarely pay for
+the LLM call and edited beliefs don't leave stale results behind.
+"""
+
+import hashlib
+import json
+
+from log import log
+from schema import UNASSIGNED_CHURCH_ID
+
+CBV_MAX_WORDS = 4000     # per sermon, truncated to stay within token limits
+CBV_BATCH_WORDS = 12000  # per request
+CBV_BATCH_SIZE = 4
+CBV_MODEL = "gpt-5-nano"
+
+_SYSTEM_PROMPT = ("You check whether a sermon references specific church beliefs/values. "
+                  "For each belief, determine if the sermon meaningfully touches on that theme — "
+                  "it doesn't need to quote it verbatim, just clearly relate to the concept. "
+                  "Return JSON: {\"results\": [{\"title\": \"...\", \"referenced\": true/false}]}")
+_BATCH_SYSTEM_PROMPT = ("You check whether sermons reference specific church beliefs/values. "
+                        "For each sermon and each belief, determine if the sermon meaningfully touches on that theme — "
+                        "it doesn't need to quote it verbatim, just clearly relate to the concept. "
+                        "Judge every sermon on its own. Return JSON: "
+                        "{\"sermons\": [{\"id\": \"<sermon id>\", \"results\": [{\"title\": \"...\", \"referenced\": true/false}]}]}")
+
+
+def resolve_church_id(db, sermon):
+    """Church id for a sermon doc, or None."""
+    import pastor_index
+    church_id = sermon.get("churchId")
+    if church_id and church_id != UNASSIGNED_CHURCH_ID:
+        return church_id
+    pastor = sermon.get("pastor")
+    if not pastor:
+        return None
+    indexed = pastor_index.lookup(pastor)
+    if indexed is not None:
+        return indexed.get("churchId") if indexed.get("churchId") != UNASSIGNED_CHURCH_ID else None
+    rows = list(db.get_container_client("churches").query_items(
+        "SELECT VALUE c.id FROM c WHERE ARRAY_CONTAINS(c.pastors, {'name': @p}, true)",
+        parameters=[{"name": "@p", "value": pastor}],
+        enable_cross_partition_query=True,
+    ))
+    return next((r for r in rows if r != UNASSIGNED_CHURCH_ID), None)
+
+
+def church_beliefs(db, church_id):
+    """The ``beliefs`` list of a church (empty if none / missing)."""
+    rows = list(db.get_container_client("churches").query_items(
+        "SELECT VALUE c.beliefs FROM c WHERE c.id = @id",
+        parameters=[{"name": "@id", "value": church_id}],
+        partition_key=church_id,
+    ))
+    return (rows[0] if rows else None) or []
+
+
+def beliefs_hash(beliefs):
+    """Stable short hash of a beliefs list — stored with each CBV result."""
+    return hashlib.sha256(json.dumps(beliefs, sort_keys=True).encode()).hexdigest()[:16]
+
+
+def belief_lines(beliefs):
+    """Prompt lines for a beliefs list (dicts with title/description, or legacy strings)."""
+    lines = "\n".join(f"- {b['title']}: {b.get('description', '')}" for b in beliefs if isinstance(b, dict))
+    if not lines:
+        # Legacy format (list of strings)
+        lines = "\n".join(f"- {b}" for b in beliefs if isinstance(b, str))
+    return lines
+
+
+def _truncate(transcript):
+    return " ".join(transcript.split()[:CBV_MAX_WORDS])
+
+
+def check_sermons(client, beliefs, sermons):
+    """CBV for ``sermons`` — a list of (sermon_id, transcript) — in one request.
+
+    Returns {sermon_id: {"results": [...]}}; sermons missing from the
+    model's answer are left out. Raises ValueError on an unparseable reply.
+    """
+    lines = belief_lines(beliefs)
+    if len(sermons) == 1:
+        system = _SYSTEM_PROMPT
+        user = f"Church beliefs:\n{lines}\n\nSermon transcript:\n{_truncate(sermons[0][1])}"
+    else:
+        system = _BATCH_SYSTEM_PROMPT
+        user = f"Church beliefs:\n{lines}\n\n" + "\n\n".join(
+            f"Sermon {sermon_id}:\n{_truncate(transcript)}" for sermon_id, transcript in sermons)
+
+    resp = client.chat.completions.create(
+        model=CBV_MODEL,
+        response_format={"type": "json_object"},
+        messages=[{"role": "system", "content": system}, {"role": "user", "content": user}],
+    )
+    try:
+        data = json.loads(resp.choices[0].message.content)
+    except Exception as e:
+        raise ValueError("AI response parse error") from e
+
+    if len(sermons) == 1:
+        return {sermons[0][0]: data}
+    wanted = {sermon_id for sermon_id, _ in sermons}
+    return {s["id"]: {"results": s.get("results", [])}
+            for s in data.get("sermons", []) if isinstance(s, dict) and s.get("id") in wanted}
+
+
+def plan_batches(sermons):
+    """Pack ``sermons`` — dicts with id and words — into request-sized batches of ids."""
+    batches, current, current_words = [], [], 0
+    for sermon in sermons:
+        words = min(sermon.get("words") or CBV_MAX_WORDS, CBV_MAX_WORDS)
+        if current and (current_words + words > CBV_BATCH_WORDS or len(current) >= CBV_BATCH_SIZE):
+            batches.append(current)
+            current, current_words = [], 0
+        current.append(sermon["id"])
+        current_words += words
+    if current:
+        batches.append(current)
+    return batches
+
+
+def stale_sermons(db, church_id, current_hash):
+    """Completed sermons of ``church_id`` whose CBV is missing or from other beliefs."""
+    return list(db.get_container_client("sermons").query_items(
+        "SELECT c.id, c.transcript.wordCount AS words FROM c WHERE c.churchId = @church AND c.status = 'complete'"
+        " AND (NOT IS_DEFINED(c.cbvBeliefsHash) OR c.cbvBeliefsHash != @hash)",
+        parameters=[{"name": "@church", "value": church_id}, {"name": "@hash", "value": current_hash}],
+        enable_cross_partition_query=True,
+    ))
+
+
+def compute(db, client, church_id, sermon_ids, beliefs=None):
+    """Recompute and store CBV for ``sermon_ids`` in one request. Returns the ids written."""
+    from store import load_transcript, patch_fields
+    beliefs = church_beliefs(db, church_id) if beliefs is None else beliefs
+    if not beliefs:
+        return []
+    current_hash = beliefs_hash(beliefs)
+    container = db.get_container_client("sermons")
+
+    sermons = []
+    for sermon_id in sermon_ids:
+        transcript = load_transcript(container.read_item(sermon_id, partition_key=sermon_id))["fullText"]
+        if transcript:
+            sermons.append((sermon_id, transcript))
+    if not sermons:
+        return []
+
+    written = []
+    for sermon_id, result in check_sermons(client, beliefs, sermons).items():
+        try:
+            patch_fields(container, sermon_id, {"cbv": result, "cbvBeliefsHash": current_hash})
+            written.append(sermon_id)
+        except Exception as e:
+            log.warning(f"[cbv] {sermon_id}: failed to store result: {e}")
+    return written
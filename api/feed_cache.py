@@ -0,0 +1,149 @@
+"""Short-lived shared cache of parsed feeds.
+
+The admin flow is preview → poll, and create_feed parses the feed right
+before its first poll — each step used to download and parse every feed
+again within seconds. ``fetch_parsed`` sits in front of
+``feed_fetcher.fetch_parsed`` and keeps each result for
+FEED_CACHE_TTL_SECONDS (env, default 10 minutes) in one document per feed
+URL on the ``control`` container, so the poll activities (separate
+function invocations, possibly other hosts) see what preview fetched:
+
+    {"id": "feedcache-<url hash>", "type": "feed-cache", "url": "…", "fetchedAt": 1760000000.0,
+     "validators": {"etag", "lastModified", "bodyHash"}, "parsed": {"entries": […], "title": "…",
+     "complete": true, "sortedByDate": true, "stop": {…}} | null, "ttl": 600}
+
+Entries are stored compact — normalised GUID, audio URL, title, publish
+time, plus the author/summary fields sermon docs carry — and come back as
+feedparser-shaped dicts. A cached parse serves a request if it parsed the
+whole feed or stopped at the same place (``stop``); a caller whose
+``httpCache`` already has the cached body hash gets "unchanged". Cache
+failures never fail a fetch.
+"""
+
+import datetime
+import hashlib
+import json
+import os
+import time
+
+from log import log
+
+FEED_CACHE_TTL_SECONDS = int(os.environ.get("FEED_CACHE_TTL_SECONDS", "600"))
+MAX_CACHED_BYTES = 1_500_000  # Cosmos items cap at 2MB
+
+
+def _doc_id(url):
+    return f"feedcache-{hashlib.sha256(url.encode()).hexdigest()[:32]}"
+
+
+def _container():
+    import admission
+    return admission._control_container()
+
+
+def _stop_key(stop):
+    cutoff = stop.get("cutoff")
+    return {
+        "stop_guid": stop.get("stop_guid"),
+        "cutoff": cutoff.isoformat() if cutoff else None,
+        "max_items": stop.get("max_items"),
+        "assume_sorted": bool(stop.get("assume_sorted")),
+    }
+
+
+def _compact(entry):
+    import feed_poll
+    pub = entry.get("published_parsed")
+    audio_type = next((e.get("type") for e in entry.get("enclosures", []) if e.get("type", "").startswith("audio/")),
+                      "audio/mpeg")
+    return {
+        "guid": feed_poll.entry_guid(entry),
+        "audioUrl": feed_poll.episode_audio_url(entry),
+        "audioType": audio_type,
+        "title": entry.get("title"),
+        "published": datetime.datetime(*pub[:6]).isoformat() if pub else None,
+        "author": entry.get("author") or None,
+        "subtitle": entry.get("subtitle") or None,
+        "summary": entry.get("summary") or None,
+        "link": entry.get("link") or None,
+        "image": (entry.get("image") or {}).get("href") or None,
+    }
+
+
+def _expand(item):
+    entry = {"id": item["guid"], "enclosures": [], "links": []}
+    if item.get("audioUrl"):
+        entry["enclosures"].append({"href": item["audioUrl"], "type": item.get("audioType") or "audio/mpeg"})
+    if item.get("published"):
+        entry["published_parsed"] = datetime.datetime.fromisoformat(item["published"]).timetuple()
+    if item.get("image"):
+        entry["image"] = {"href": item["image"]}
+    for key in ("title", "author", "subtitle", "summary", "link"):
+        if item.get(key) is not None:
+            entry[key] = item[key]
+    return entry
+
+
+def _read(url):
+    from azure.cosmos import exceptions
+    doc_id = _doc_id(url)
+    try:
+        doc = _container().read_item(doc_id, partition_key=doc_id)
+    except exceptions.CosmosResourceNotFoundError:
+        return None
+    except Exception as e:
+        log.warning(f"[feed_cache] read failed for {url}: {e}")
+        return None
+    if time.time() - doc.get("fetchedAt", 0) > FEED_CACHE_TTL_SECONDS:
+        return None
+    return doc
+
+
+def _write(url, parsed, validators, stop):
+    doc = {"id": _doc_id(url), "type": "feed-cache", "url": url, "fetchedAt": time.time(),
+           "validators": validators, "parsed": None, "ttl": FEED_CACHE_TTL_SECONDS}
+    try:
+        if parsed is not None:
+            doc["parsed"] = {
+                "entries": [_compact(e) for e in parsed.entries],
+                "title": parsed.feed.get("title"),
+                "complete": parsed.complete,
+                "sortedByDate": parsed.sorted_by_date,
+                "stop": _stop_key(stop),
+            }
+        if len(json.dumps(doc)) > MAX_CACHED_BYTES:
+            log.info(f"[feed_cache] {url}: parsed feed too large to cache")
+            return
+        _container().upsert_item(doc)
+    except Exception as e:
+        log.warning(f"[feed_cache] write failed for {url}: {e}")
+
+
+def _from_cache(doc, cache, stop):
+    """(hit, parsed) for a cached result, or (False, None) if it can't serve this request."""
+    import feed_stream
+    validators = doc.get("validators") or {}
+    if cache and cache.get("bodyHash") and cache["bodyHash"] == validators.get("bodyHash"):
+        return True, None
+    cached = doc.get("parsed")
+    if cached is None or not (cached["complete"] or cached.get("stop") == _stop_key(stop)):
+        return False, None
+    return True, feed_stream.ParsedFeed([_expand(e) for e in cached["entries"]], {"title": cached.get("title")},
+                                        complete=cached["complete"], sorted_by_date=cached.get("sortedByDate"))
+
+
+async def fetch_parsed(http, url, cache=None, **stop):
+    """``feed_fetcher.fetch_parsed`` through the shared cache: (parsed or None if unchanged, validators)."""
+    import asyncio
+    import feed_fetcher
+
+    doc = await asyncio.to_thread(_read, url)
+    if doc is not None:
+        hit, parsed = _from_cache(doc, cache, stop)
+        if hit:
+            log.info(f"[feed_cache] hit for {url}")
+            return parsed, doc["validators"]
+
+    parsed, validators = await feed_fetcher.fetch_parsed(http, url, cache, **stop)
+    await asyncio.to_thread(_write, url, parsed, validators, stop)
+    return parsed, validators
@@ -0,0 +1,93 @@
+"""Concurrent RSS feed fetching for poll/preview.
+
+Feeds are downloaded with one shared aiohttp session, at most
+FEED_CONCURRENCY at a time, each bounded by FEED_TIMEOUT_SECONDS and
+MAX_FEED_BYTES. Parsing (feed_stream — incremental, stops at the first
+already-seen item) is CPU-bound, so it runs in a worker thread instead of
+on the event loop.
+
+Requests are conditional: the feed doc keeps ``httpCache`` — the last
+successful poll's ``ETag``, ``Last-Modified`` and a hash of the body — and
+a 304, or a 200 with an identical body, comes back as "unchanged" without
+parsing.
+"""
+
+import asyncio
+import hashlib
+
+FEED_CONCURRENCY = 8
+FEED_TIMEOUT_SECONDS = 30
+MAX_FEED_BYTES = 20 * 1024 * 1024
+USER_AGENT = "PSR/1.0 (+feed poller)"
+
+
+class FeedFetchError(Exception):
+    """Feed could not be downloaded (HTTP error, timeout, oversize)."""
+
+
+def session():
+    """Shared HTTP session for one poll/preview run (use as ``async with``)."""
+    import aiohttp
+    return aiohttp.ClientSession(
+        timeout=aiohttp.ClientTimeout(total=FEED_TIMEOUT_SECONDS),
+        headers={"User-Agent": USER_AGENT},
+        connector=aiohttp.TCPConnector(limit=FEED_CONCURRENCY),
+    )
+
+
+async def fetch(http, url, cache=None):
+    """Download a feed. Returns (body, response headers); body is None on 304 Not Modified."""
+    headers = {}
+    if cache and cache.get("etag"):
+        headers["If-None-Match"] = cache["etag"]
+    if cache and cache.get("lastModified"):
+        headers["If-Modified-Since"] = cache["lastModified"]
+    try:
+        async with http.get(url, headers=headers) as resp:
+            if resp.status == 304:
+                return None, dict(resp.headers)
+            if resp.status >= 400:
+                raise FeedFetchError(f"HTTP {resp.status}")
+            body = await resp.content.read(MAX_FEED_BYTES + 1)
+            if len(body) > MAX_FEED_BYTES:
+                raise FeedFetchError(f"Feed larger than {MAX_FEED_BYTES // (1024 * 1024)}MB")
+            return body, dict(resp.headers)
+    except asyncio.TimeoutError:
+        raise FeedFetchError(f"Timed out after {FEED_TIMEOUT_SECONDS}s")
+
+
+def http_cache(body, headers, previous=None):
+    """Validators to store on the feed doc after a successful poll."""
+    lowered = {k.lower(): v for k, v in (headers or {}).items()}
+    previous = previous or {}
+    return {
+        "etag": lowered.get("etag") or previous.get("etag"),
+        "lastModified": lowered.get("last-modified") or previous.get("lastModified"),
+        "bodyHash": hashlib.sha256(body).hexdigest() if body is not None else previous.get("bodyHash"),
+    }
+
+
+async def parse(body, **stop):
+    """Parse a downloaded feed in a worker thread (``stop``: feed_stream.parse_entries early-stop options)."""
+    import feed_stream
+    return await asyncio.to_thread(feed_stream.parse_entries, body, **stop)
+
+
+async def fetch_parsed(http, url, cache=None, **stop):
+    """Download and parse one feed. Returns (parsed, new httpCache); parsed is None if unchanged."""
+    body, headers = await fetch(http, url, cache)
+    validators = http_cache(body, headers, cache)
+    if body is None or (cache and cache.get("bodyHash") == validators["bodyHash"]):
+        return None, validators
+    return await parse(body, **stop), validators
+
+
+async def gather_bounded(coros, limit=FEED_CONCURRENCY):
+    """Await ``coros`` with at most ``limit`` running at once; results in input order."""
+    semaphore = asyncio.Semaphore(limit)
+
+    async def _run(coro):
+        async with semaphore:
+            return await coro
+
+    return await asyncio.gather(*(_run(c) for c in coros), return_exceptions=True)
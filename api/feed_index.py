@@ -0,0 +1,135 @@
+"""Per-feed seen-GUID index for RSS polling.
+
+Poll and preview used to rebuild a feed's known GUIDs with a cross-partition
+``SELECT c.feedGuid FROM c WHERE c.feedId = @fid`` over ``sermons`` — cost
+that grew with every episode the feed ever had. Instead each feed has one
+document on the ``control`` container:
+
+    {"id": "feedguids-<feed id>", "type": "feed-guids", "feedId": "…", "guids": ["0f3a…", …]}
+
+``guids`` is a sorted list of 64-bit GUID hashes (16 hex chars each), so a
+feed with thousands of episodes stays a small document and dedup is one
+point read. The poll adds each submitted GUID (see ``record_or_forget``); feeds without
+an index yet (subscribed before it existed) are rebuilt once from the
+sermons query — the exact fallback.
+"""
+
+import bisect
+import hashlib
+
+from log import log
+
+MAX_WRITE_ATTEMPTS = 3
+
+
+def guid_key(guid):
+    return hashlib.sha256((guid or "").encode()).hexdigest()[:16]
+
+
+def _doc_id(feed_id):
+    return f"feedguids-{feed_id}"
+
+
+def _container():
+    import admission
+    return admission._control_container()
+
+
+def _read(feed_id):
+    from azure.cosmos import exceptions
+    doc_id = _doc_id(feed_id)
+    try:
+        return _container().read_item(doc_id, partition_key=doc_id)
+    except exceptions.CosmosResourceNotFoundError:
+        return None
+
+
+def _rebuild(feed_id, sermon_container):
+    rows = sermon_container.query_items(
+        "SELECT VALUE c.feedGuid FROM c WHERE c.feedId = @fid",
+        parameters=[{"name": "@fid", "value": feed_id}],
+        enable_cross_partition_query=True,
+    )
+    keys = sorted({guid_key(g) for g in rows if g})
+    try:
+        _container().upsert_item({"id": _doc_id(feed_id), "type": "feed-guids", "feedId": feed_id, "guids": keys})
+    except Exception as e:
+        log.warning(f"[feed_index] {feed_id}: failed to store rebuilt index: {e}")
+    log.info(f"[feed_index] {feed_id}: rebuilt from sermons ({len(keys)} guid(s))")
+    return keys
+
+
+class SeenGuids:
+    """Membership test over a feed's sorted GUID hashes."""
+
+    def __init__(self, keys):
+        self._keys = list(keys)
+
+    def __contains__(self, guid):
+        key = guid_key(guid)
+        i = bisect.bisect_left(self._keys, key)
+        return i < len(self._keys) and self._keys[i] == key
+
+    def __len__(self):
+        return len(self._keys)
+
+    def add(self, guid):
+        key = guid_key(guid)
+        i = bisect.bisect_left(self._keys, key)
+        if i == len(self._keys) or self._keys[i] != key:
+            self._keys.insert(i, key)
+
+
+def seen(feed_id, sermon_container):
+    """GUIDs already submitted for ``feed_id`` (one point read; rebuilt if the index is missing)."""
+    doc = _read(feed_id)
+    if doc is None:
+        return SeenGuids(_rebuild(feed_id, sermon_container))
+    return SeenGuids(doc.get("guids") or [])
+
+
+def record(feed_id, guids):
+    """Add submitted ``guids`` to the feed's index (merged with concurrent writers via etag)."""
+    from azure.core import MatchConditions
+    from azure.cosmos import exceptions
+    new_keys = {guid_key(g) for g in guids if g}
+    if not new_keys:
+        return
+    container = _container()
+    for _ in range(MAX_WRITE_ATTEMPTS):
+        doc = _read(feed_id)
+        if doc is None:
+            # No index to extend — the next seen() rebuilds it from sermons, these included
+            return
+        doc["guids"] = sorted(set(doc.get("guids") or []) | new_keys)
+        try:
+            container.replace_item(doc["id"], doc, etag=doc["_etag"], match_condition=MatchConditions.IfNotModified)
+            return
+        except exceptions.CosmosAccessConditionFailedError:
+            continue
+    raise RuntimeError(f"feed index for {feed_id} kept changing; {len(new_keys)} guid(s) not recorded")
+
+
+def record_or_forget(feed_id, guids):
+    """``record``, dropping the index if that fails so the next ``seen`` rebuilds it exactly. Never raises.
+
+    A stale index would let the next poll submit these episodes again.
+    """
+    try:
+        record(feed_id, guids)
+        return
+    except Exception as e:
+        log.warning(f"[feed_index] {feed_id}: failed to record {len(guids)} guid(s) ({e}); dropping index for rebuild")
+    try:
+        forget(feed_id)
+    except Exception as e:
+        log.error(f"[feed_index] {feed_id}: failed to drop stale index ({e}); next poll may resubmit episodes")
+
+
+def forget(feed_id):
+    """Drop a feed's index (feed deleted)."""
+    from azure.cosmos import exceptions
+    try:
+        _container().delete_item(_doc_id(feed_id), partition_key=_doc_id(feed_id))
+    except exceptions.CosmosResourceNotFoundError:
+        pass
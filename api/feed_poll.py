@@ -0,0 +1,257 @@
+"""RSS feed polling — one feed at a time, run by feed_poll_orchestrator.
+
+``poll_feed`` is the whole per-feed step: conditional fetch (feed_fetcher,
+through the short-lived feed_cache shared with preview),
+incremental parse (feed_stream), dedup against the seen-GUID index
+(feed_index), sermon creation + work-queue enqueue, and the feed doc's
+result and next poll time (feed_schedule). It records its own outcome
+and never raises, so one feed can't fail another.
+
+feed_poll_orchestrator fans out one ``activity_poll_feed`` per feed
+(POST /api/feeds/poll and the hourly timer both start it). Preview
+(routes.feeds) shares the entry selection helpers.
+"""
+
+import datetime
+import os
+import uuid
+
+import work_queue
+from log import log
+from schema import new_sermon_doc
+from helpers import _feeds_container
+from store import patch_fields
+
+
+def select_entries(feed_doc, entries):
+    """Entries eligible for submission: the backfill on first poll, then only those published since subscribing."""
+    if not feed_doc.get("lastPolledAt") and feed_doc.get("backfillCount", 0) > 0:
+        return entries[:feed_doc["backfillCount"]]
+    if feed_doc.get("lastPolledAt"):
+        sub_dt = datetime.datetime.fromisoformat(feed_doc["createdAt"].replace("Z", "+00:00"))
+        filtered = []
+        for e in entries:
+            pub = e.get("published_parsed")
+            if pub:
+                pub_dt = datetime.datetime(*pub[:6], tzinfo=datetime.timezone.utc)
+                if pub_dt >= sub_dt:
+                    filtered.append(e)
+        return filtered
+    return entries
+
+
+def stop_conditions(feed_doc):
+    """Where feed_stream may stop parsing: the backfill on first poll, then lastSeenGuid / the subscription date."""
+    if not feed_doc.get("lastPolledAt"):
+        backfill = feed_doc.get("backfillCount", 0)
+        return {"max_items": backfill} if backfill > 0 else {}
+    return {
+        "stop_guid": feed_doc.get("lastSeenGuid"),
+        "cutoff": datetime.datetime.fromisoformat(feed_doc["createdAt"].replace("Z", "+00:00")),
+        "assume_sorted": feed_doc.get("sortedByDate") is True,
+    }
+
+
+def entry_guid(entry):
+    return entry.get("id") or entry.get("link", "")
+
+
+def episode_audio_url(entry):
+    """First audio enclosure (or audio link) of a feed entry, or None."""
+    for enc in entry.get("enclosures", []):
+        if enc.get("type", "").startswith("audio/"):
+            return enc.get("href") or enc.get("url")
+    for link in entry.get("links", []):
+        if link.get("type", "").startswith("audio/"):
+            return link.get("href")
+    return None
+
+
+def active_feeds(feed_container, feed_ids=None, due_only=False):
+    """Active feeds; ``due_only`` keeps those whose nextPollAt has passed (see feed_schedule)."""
+    if due_only:
+        feeds = list(feed_container.query_items(
+            "SELECT * FROM c WHERE c.active = true"
+            " AND (NOT IS_DEFINED(c.nextPollAt) OR IS_NULL(c.nextPollAt) OR c.nextPollAt <= @now)",
+            parameters=[{"name": "@now", "value": datetime.datetime.utcnow().isoformat() + "Z"}],
+            enable_cross_partition_query=True,
+        ))
+    else:
+        feeds = list(feed_container.query_items(
+            "SELECT * FROM c WHERE c.active = true", enable_cross_partition_query=True
+        ))
+    if feed_ids:
+        feed_ids_set = set(feed_ids)
+        feeds = [f for f in feeds if f["id"] in feed_ids_set]
+    return feeds
+
+
+def submit_episodes(feed_doc, entries, sermon_container):
+    """Create + enqueue a sermon for each new audio entry. Returns the number queued.
+
+    Dedup is against the feed's seen-GUID index; submitted GUIDs are added
+    to it even if a later entry fails, so a retry doesn't duplicate them.
+    """
+    import feed_index
+    feed_id = feed_doc["id"]
+    known_guids = feed_index.seen(feed_id, sermon_container)
+    submitted = []
+    try:
+        return _submit_new(feed_doc, entries, known_guids, sermon_container, submitted)
+    finally:
+        if submitted:
+            feed_index.record_or_forget(feed_id, submitted)  # never raises over a submit error
+
+
+def _unqueue(sermon_container, feed_id, sermon_id, guid, submitted):
+    """Undo a sermon doc whose enqueue failed, so it isn't left 'queued' with nothing to run it.
+
+    Deleted, the episode is picked up again by the next poll. If even that
+    fails, the doc is failed and its GUID recorded, so the next poll doesn't
+    create a duplicate.
+    """
+    from schema import fail_sermon_doc
+    try:
+        sermon_container.delete_item(sermon_id, partition_key=sermon_id)
+        return
+    except Exception as e:
+        log.error(f"[poll_feed] {feed_id}: could not remove unqueued sermon {sermon_id}: {e}")
+    try:
+        patch_fields(sermon_container, sermon_id, fail_sermon_doc("Processing failed to start"))
+        submitted.append(guid)
+    except Exception as e:
+        log.critical(f"[poll_feed] {feed_id}: sermon {sermon_id} left queued without a queue entry: {e}")
+
+
+def _submit_new(feed_doc, entries, known_guids, sermon_container, submitted):
+    feed_id = feed_doc["id"]
+    new_count = 0
+    for entry in entries:
+        guid = entry_guid(entry)
+        if guid in known_guids:
+            continue
+        audio_url = episode_audio_url(entry)
+        if not audio_url:
+            continue
+
+        sermon_id = str(uuid.uuid4())
+        title = entry.get("title", "Untitled Episode")
+        pastor = entry.get("author") or None
+        pub = entry.get("published_parsed")
+        date = f"{pub.tm_year}-{pub.tm_mon:02d}-{pub.tm_mday:02d}" if pub else None
+        doc = new_sermon_doc(sermon_id, f"rss-{feed_id}", title, pastor=pastor, status="queued")
+        if date:
+            doc["date"] = date
+        doc["feedId"] = feed_id
+        doc["feedGuid"] = guid
+        doc["inputType"] = "rss"
+        doc["uploadedAt"] = datetime.datetime.utcnow().isoformat() + "Z"
+        doc["rssAudioUrl"] = audio_url
+        if feed_doc.get("churchId"):
+            doc["churchId"] = feed_doc["churchId"]
+        doc["rssMeta"] = {
+            "subtitle": entry.get("subtitle") or None,
+            "summary": entry.get("summary") or None,
+            "link": entry.get("link") or None,
+            "image": (entry.get("image") or {}).get("href") or None,
+        }
+        sermon_container.create_item(doc)
+
+        try:
+            work_queue.enqueue(sermon_id, "rss_sermon_orchestrator", {
+                "sermonId": sermon_id,
+                "audioUrl": audio_url,
+                "userTitle": title,
+                "userPastor": pastor,
+                "churchId": feed_doc.get("churchId"),
+            }, lane="rss")
+        except Exception:
+            _unqueue(sermon_container, feed_id, sermon_id, guid, submitted)
+            raise
+        new_count += 1
+        known_guids.add(guid)
+        submitted.append(guid)
+        log.info(f"[poll_feed] {feed_id}: queued '{title}' ({sermon_id})")
+    return new_count
+
+
+async def poll_feed(http, feed_doc, feed_container, sermon_container):
+    """Poll one feed and record its result and next poll time on the feed doc. Never raises."""
+    import asyncio
+    import feed_cache
+    import feed_schedule
+
+    feed_id = feed_doc["id"]
+    now = datetime.datetime.now(datetime.timezone.utc)
+    polled_at = datetime.datetime.utcnow().isoformat() + "Z"
+    empty_polls = feed_doc.get("emptyPolls") or 0
+    try:
+        parsed, http_cache = await feed_cache.fetch_parsed(http, feed_doc["feedUrl"], feed_doc.get("httpCache"),
+                                                           **stop_conditions(feed_doc))
+        if parsed is None or (not parsed.entries and parsed.complete):
+            # 304 / identical body: nothing to parse, no sermon queries. Empty feed: back off like a dormant one.
+            unchanged = parsed is None
+            await asyncio.to_thread(patch_fields, feed_container, feed_id, {
+                "lastPolledAt": polled_at,
+                "lastPollResult": {"new": 0, "errors": 0 if unchanged else 1, "unchanged": unchanged, "timestamp": polled_at},
+                "httpCache": http_cache if unchanged else feed_doc.get("httpCache"),
+                "emptyPolls": empty_polls + 1,
+                "nextPollAt": feed_schedule.next_poll_at(feed_doc.get("publishHistory"), now, empty_polls + 1),
+            })
+            if not unchanged:
+                log.warning(f"[poll_feed] {feed_id}: no entries in feed")
+                return {"feedId": feed_id, "new": 0, "error": "No entries"}
+            log.info(f"[poll_feed] {feed_id}: unchanged")
+            return {"feedId": feed_id, "new": 0, "unchanged": True}
+
+        entries = select_entries(feed_doc, parsed.entries)
+
+        new_count = await asyncio.to_thread(submit_episodes, feed_doc, entries, sermon_container)
+
+        feed_doc["lastPolledAt"] = polled_at
+        feed_doc["lastPollResult"] = {"new": new_count, "errors": 0, "timestamp": feed_doc["lastPolledAt"]}
+        if entries:
+            feed_doc["lastSeenGuid"] = entry_guid(entries[0])
+        feed_doc["httpCache"] = http_cache
+        if parsed.sorted_by_date is not None:
+            feed_doc["sortedByDate"] = parsed.sorted_by_date
+        feed_doc["publishHistory"] = feed_schedule.update_history(feed_doc.get("publishHistory"), parsed.entries)
+        feed_doc["emptyPolls"] = 0 if new_count else empty_polls + 1
+        feed_doc["nextPollAt"] = feed_schedule.next_poll_at(feed_doc["publishHistory"], now, feed_doc["emptyPolls"])
+        await asyncio.to_thread(feed_container.upsert_item, feed_doc)
+        log.info(f"[poll_feed] {feed_id}: {new_count} new episode(s), next poll {feed_doc['nextPollAt']}")
+        return {"feedId": feed_id, "new": new_count}
+
+    except Exception as e:
+        log.error(f"[poll_feed] {feed_id} failed: {e}", exc_info=True)
+        feed_doc["lastPollResult"] = {"new": 0, "errors": 1, "timestamp": polled_at}
+        feed_doc["nextPollAt"] = feed_schedule.error_retry_at(now)
+        try:
+            await asyncio.to_thread(feed_container.upsert_item, feed_doc)
+        except Exception:
+            pass
+        return {"feedId": feed_id, "new": 0, "error": str(e)}
+
+
+def feeds_to_poll(feed_ids=None, due_only=False):
+    """Ids of the active feeds a poll run covers."""
+    return [f["id"] for f in active_feeds(_feeds_container(), feed_ids, due_only=due_only)]
+
+
+async def poll_feed_by_id(feed_id):
+    """Poll one feed by id (activity_poll_feed). Returns its result dict."""
+    import feed_fetcher
+    from azure.cosmos import CosmosClient, exceptions
+
+    feed_container = _feeds_container()
+    try:
+        feed_doc = feed_container.read_item(feed_id, partition_key=feed_id)
+    except exceptions.CosmosResourceNotFoundError:
+        return {"feedId": feed_id, "new": 0, "error": "Feed not found"}
+    if not feed_doc.get("active"):
+        return {"feedId": feed_id, "new": 0, "skipped": "inactive"}
+
+    cosmos = CosmosClient.from_connection_string(os.environ["COSMOS_CONNECTION_STRING"])
+    sermon_container = cosmos.get_database_client("psr").get_container_client("sermons")
+    async with feed_fetcher.session() as http:
+        return await poll_feed(http, feed_doc, feed_container, sermon_container)
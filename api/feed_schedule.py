@@ -0,0 +1,102 @@
+"""Adaptive per-feed polling schedule.
+
+Churches publish on a weekly rhythm — Sunday afternoon, Wednesday night —
+or go quiet for months. Each feed doc keeps ``publishHistory``, the last
+HISTORY_SIZE episode publish times, and after every poll ``next_poll_at``
+picks when to look again:
+
+* Active feeds: the publish times form a (weekday, hour) histogram in UTC.
+  The next poll is PUBLISH_LAG after the next prominent slot. While a slot
+  is open and its episode hasn't shown up, the feed is polled every
+  FOLLOW_UP_INTERVAL for FOLLOW_UP_WINDOW. Polls are never more than
+  MAX_ACTIVE_INTERVAL apart, in case the rhythm changes.
+* Dormant feeds (nothing for DORMANT_AFTER, or for three median gaps):
+  the interval doubles with every empty poll (``emptyPolls``), from
+  DORMANT_BASE up to DORMANT_MAX.
+* No history yet: DEFAULT_INTERVAL.
+
+poll_feeds_timer runs hourly and polls only feeds whose ``nextPollAt``
+has passed. Manual polls ignore the schedule.
+"""
+
+import collections
+import datetime
+import statistics
+
+HISTORY_SIZE = 60
+DEFAULT_INTERVAL = datetime.timedelta(hours=12)
+MIN_INTERVAL = datetime.timedelta(minutes=30)
+MAX_ACTIVE_INTERVAL = datetime.timedelta(hours=24)
+PUBLISH_LAG = datetime.timedelta(minutes=30)
+FOLLOW_UP_INTERVAL = datetime.timedelta(hours=1)
+FOLLOW_UP_WINDOW = datetime.timedelta(hours=8)
+DORMANT_AFTER = datetime.timedelta(days=45)
+DORMANT_BASE = datetime.timedelta(days=1)
+DORMANT_MAX = datetime.timedelta(days=14)
+ERROR_RETRY = datetime.timedelta(hours=2)
+SLOT_SHARE = 0.25  # a slot is "prominent" with at least this share of the busiest slot's episodes
+
+
+def _iso(dt):
+    return dt.astimezone(datetime.timezone.utc).replace(tzinfo=None).isoformat() + "Z"
+
+
+def _parse(value):
+    return datetime.datetime.fromisoformat(value.replace("Z", "+00:00"))
+
+
+def update_history(history, entries):
+    """Merge the publish times of parsed ``entries`` into ``history`` (ISO strings, newest first)."""
+    times = {_parse(h) for h in history or []}
+    for entry in entries:
+        pub = entry.get("published_parsed")
+        if pub:
+            times.add(datetime.datetime(*pub[:6], tzinfo=datetime.timezone.utc))
+    return [_iso(t) for t in sorted(times, reverse=True)[:HISTORY_SIZE]]
+
+
+def _slots(times):
+    counts = collections.Counter((t.weekday(), t.hour) for t in times)
+    busiest = max(counts.values())
+    return {slot for slot, n in counts.items() if n >= max(1, busiest * SLOT_SHARE)}
+
+
+def _slot_starts(slots, start, end):
+    """Start times of ``slots`` occurrences between ``start`` and ``end``."""
+    t = start.replace(minute=0, second=0, microsecond=0)
+    while t <= end:
+        if (t.weekday(), t.hour) in slots:
+            yield t
+        t += datetime.timedelta(hours=1)
+
+
+def next_poll_at(history, now, empty_polls=0):
+    """When to poll a feed next (ISO string), given its publish history."""
+    times = sorted((_parse(h) for h in history or []), reverse=True)
+    if not times:
+        return _iso(now + DEFAULT_INTERVAL)
+
+    latest = times[0]
+    gaps = [(a - b).total_seconds() for a, b in zip(times, times[1:]) if a > b]
+    typical_gap = datetime.timedelta(seconds=statistics.median(gaps)) if gaps else DEFAULT_INTERVAL
+    if now - latest > max(DORMANT_AFTER, 3 * typical_gap):
+        backoff = min(DORMANT_BASE * (2 ** min(empty_polls, 8)), DORMANT_MAX)
+        return _iso(now + backoff)
+
+    slots = _slots(times)
+    # An expected episode that hasn't appeared yet — keep checking for a while
+    for start in _slot_starts(slots, now - FOLLOW_UP_WINDOW, now):
+        if latest < start:
+            return _iso(now + max(FOLLOW_UP_INTERVAL, MIN_INTERVAL))
+    upcoming = next(_slot_starts(slots, now + datetime.timedelta(hours=1), now + datetime.timedelta(days=8)), None)
+    target = upcoming + PUBLISH_LAG if upcoming else now + MAX_ACTIVE_INTERVAL
+    return _iso(min(max(target, now + MIN_INTERVAL), now + MAX_ACTIVE_INTERVAL))
+
+
+def error_retry_at(now):
+    return _iso(now + ERROR_RETRY)
+
+
+def is_due(feed_doc, now):
+    next_at = feed_doc.get("nextPollAt")
+    return not next_at or _parse(next_at) <= now
@@ -27,5 +27,5 @@ from helpers import (  # noqa: F401
 from routes.sermons import upload_sermon, list_sermons, get_sermon  # noqa: F401
 from routes.feeds import (  # noqa: F401
     list_feeds, preview_feeds, poll_feeds_manual,
-    _preview_feeds, _poll_all_feeds,
+    _preview_feeds, poll_feeds_status,
 )
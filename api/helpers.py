@@ -1,10 +1,16 @@
 """Shared helpers used across route modules."""
 
+import gzip
 import json
 import os
 
 import azure.functions as func
 
+try:  # in requirements.txt; guarded so a dev env without the wheel still serves gzip
+    import brotli
+except ImportError:
+    brotli = None
+
 
 ALLOWED_TYPES = {
     "audio/mpeg": ".mp3",
@@ -32,6 +38,8 @@ ALLOWED_TEXT_TYPES = {
 ALLOWED_TEXT_EXTENSIONS = {".txt", ".md", ".html", ".htm", ".csv", ".rtf", ".xml", ".pdf", ".doc", ".docx", ".odt"}
 MAX_TEXT_SIZE = 10 * 1024 * 1024  # 10MB
 
+COMPRESS_MIN_BYTES = 1024  # below this, compression overhead outweighs the savings
+
 
 _ALLOWED_ORIGIN_SUFFIXES = (".howwas.church",)
 _ALLOWED_ORIGINS_EXACT = frozenset()  # add exact origins here if needed
@@ -53,12 +61,108 @@ def _cors_origin(req) -> str | None:
     return None
 
 
-def _json_response(body, status=200, headers=None, req=None):
-    resp = func.HttpResponse(
-        json.dumps(body, default=str),
-        status_code=status,
-        mimetype="application/json",
-    )
+def _strong_etag(*parts) -> str:
+    """Build a strong ETag from a Cosmos ``_etag`` (plus response variant) or a serialized body."""
+    import hashlib
+    digest = hashlib.sha256("|".join(str(p) for p in parts).encode()).hexdigest()[:32]
+    return f'"{digest}"'
+
+
+def _content_etag(body) -> str:
+    """Strong ETag for responses assembled from several documents (no single Cosmos _etag)."""
+    return _strong_etag(json.dumps(body, sort_keys=True, default=str))
+
+
+def _if_none_match(req):
+    """Return the request's If-None-Match header, or None."""
+    header = req.headers.get("If-None-Match") if req else None
+    return header if isinstance(header, str) and header.strip() else None
+
+
+def _encoded_etag(etag, encoding):
+    """The ETag of ``etag``'s representation under a content ``encoding`` (identity keeps ``etag``).
+
+    Strong validators must differ per representation, so gzip and br bodies get a suffix.
+    """
+    return f'{etag[:-1]}-{encoding}"' if encoding and etag.endswith('"') else etag
+
+
+def _matched_etag(req, etag):
+    """The If-None-Match tag matching any encoded representation of ``etag``, or None."""
+    header = _if_none_match(req)
+    if not etag or not header:
+        return None
+    tags = {t.strip().removeprefix("W/") for t in header.split(",")}
+    if "*" in tags:
+        return etag
+    return next((v for v in (etag, _encoded_etag(etag, "gzip"), _encoded_etag(etag, "br")) if v in tags), None)
+
+
+def _etag_matches(req, etag) -> bool:
+    """True if the request carries an If-None-Match header matching ``etag`` (in any encoding)."""
+    return _matched_etag(req, etag) is not None
+
+
+def _accepted_encoding(req):
+    """Pick the best response encoding from Accept-Encoding: "br", "gzip", or None."""
+    header = req.headers.get("Accept-Encoding") if req else None
+    if not isinstance(header, str):
+        return None
+    accepted = {}
+    for part in header.split(","):
+        name, _, params = part.strip().partition(";")
+        q = 1.0
+        if params.strip().startswith("q="):
+            try:
+                q = float(params.strip()[2:])
+            except ValueError:
+                q = 0.0
+        accepted[name.strip().lower()] = q
+    if brotli is not None and accepted.get("br", 0) > 0:
+        return "br"
+    if accepted.get("gzip", 0) > 0:
+        return "gzip"
+    return None
+
+
+def _encode_body(payload: bytes, encoding: str) -> bytes:
+    if encoding == "br":
+        return brotli.compress(payload, quality=5)
+    return gzip.compress(payload, compresslevel=6)
+
+
+def _json_response(body, status=200, headers=None, req=None, etag=None, compact=False):
+    """JSON response.
+
+    With ``etag``, answers a matching If-None-Match with 304 and no body.
+    With ``req``, bodies over COMPRESS_MIN_BYTES are gzip/br encoded per Accept-Encoding,
+    and ``etag`` gets the encoding as a suffix (one strong validator per representation).
+    ``compact`` drops the whitespace json.dumps puts after separators.
+    """
+    encoding = None
+    matched = _matched_etag(req, etag) if etag and status == 200 else None
+    if matched:
+        # The client's cached representation is still current: echo the validator it holds
+        resp = func.HttpResponse(status_code=304)
+        etag = matched
+    else:
+        payload = json.dumps(body, default=str, separators=(",", ":") if compact else None).encode()
+        encoding = _accepted_encoding(req) if len(payload) >= COMPRESS_MIN_BYTES else None
+        if encoding:
+            payload = _encode_body(payload, encoding)
+            if etag:
+                etag = _encoded_etag(etag, encoding)
+        resp = func.HttpResponse(
+            payload,
+            status_code=status,
+            mimetype="application/json",
+        )
+    if encoding:
+        resp.headers["Content-Encoding"] = encoding
+    if req is not None:
+        resp.headers["Vary"] = "Accept-Encoding"
+    if etag:
+        resp.headers["ETag"] = etag
     if headers:
         for k, v in headers.items():
             resp.headers[k] = v
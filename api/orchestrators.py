@@ -1,5 +1,6 @@
 """Durable Functions orchestrators + activity registrations."""
 
+import datetime
 import time
 
 import azure.durable_functions as df
@@ -7,14 +8,19 @@ import azure.durable_functions as df
 from log import log
 from schema import (
     normalize_scores, compute_composite, consistency_check, fail_sermon_doc,
-    PIPELINE_VERSION, SCORING_MODELS, PASS_HASHES,
+    PIPELINE_VERSION, SCORING_CODE_VERSION, SCORING_MODELS, PASS_HASHES, UNASSIGNED_CHURCH_ID,
 )
 from helpers import _default_audio_metrics
+import work_queue
+import reaper
+import bulk_import
 from activities import (
     transcribe, analyze_audio, pass1_biblical, pass2_structure,
     pass3_delivery, pass4_enrichment, classify_sermon, classify_segments,
     generate_summary, update_sermon, rescore_sermon, detect_ai_generation,
-    summarize_sermon_content, download_rss_audio, ensure_church,
+    summarize_sermon_content, download_rss_audio, ensure_church, migrate_sermon_artifacts,
+    release_admission_slot, acquire_admission_slot, load_pipeline_input, fail_queued_sermons, plan_cbv, compute_cbv, translate_transcript,
+    list_feeds_to_poll, poll_feed, recompute_scores,
 )
 
 bp = df.Blueprint()
@@ -40,6 +46,34 @@ def _set_status(context, sermon_id, step):
         log.info(f"[orchestrator] {sermon_id}: {step}")
 
 
+def _release_admission(context, input_data):
+    """Release the pipeline slot the work queue dispatcher took (``admitted``/``lane`` in the input)."""
+    if not input_data.get("admitted"):
+        return
+    try:
+        yield context.call_activity_with_retry("activity_release_slot", RETRY_LIGHT, {
+            "sermonId": input_data.get("sermonId", context.instance_id),
+            "lane": input_data.get("lane", "interactive"),
+        })
+    except Exception as e:
+        if not context.is_replaying:
+            log.error(f"[orchestrator] {context.instance_id}: slot release failed ({e})")
+
+
+def _precompute_cbv(context, sermon_id, church):
+    """Compute the new sermon's CBV now so the first page view doesn't wait for it (non-fatal)."""
+    church_id = (church or {}).get("churchId")
+    if not church_id or church_id == UNASSIGNED_CHURCH_ID:
+        return
+    try:
+        yield context.call_activity_with_retry("activity_compute_cbv", RETRY_LIGHT, {
+            "churchId": church_id, "sermonIds": [sermon_id],
+        })
+    except Exception as e:
+        if not context.is_replaying:
+            log.warning(f"[orchestrator] {sermon_id}: CBV precompute failed ({e}), non-fatal")
+
+
 @bp.orchestration_trigger(context_name="context")
 def sermon_orchestrator(context: df.DurableOrchestrationContext):
     """Main pipeline: transcribe → score → store."""
@@ -47,6 +81,7 @@ def sermon_orchestrator(context: df.DurableOrchestrationContext):
     sermon_id = input_data["sermonId"]
     blob_url = input_data["blobUrl"]
 
+    church = None  # set once the sermon is complete; its CBV is precomputed after the slot is released
     try:
         _set_status(context, sermon_id, "transcribing")
 
@@ -136,7 +171,7 @@ def sermon_orchestrator(context: df.DurableOrchestrationContext):
         sermon_type = classification["sermonType"]
         confidence = classification["confidence"]
 
-        categories, norm_applied = normalize_scores(raw_scores, sermon_type, confidence)
+        categories, norm_applied = normalize_scores(raw_scores, sermon_type, confidence, audio_available=True)
         categories, consistency_flags = consistency_check(categories, enrichment)
         composite = compute_composite(categories)
         raw_score_map = {k: raw_scores[k]["score"] for k in raw_scores}
@@ -163,9 +198,10 @@ def sermon_orchestrator(context: df.DurableOrchestrationContext):
             "categories": categories,
             "strengths": summary_result.get("strengths"),
             "improvements": summary_result.get("improvements"),
-            "transcript": {"fullText": transcript_text, "segments": classified_segments},
+            "transcript": {"fullText": transcript_text, "segments": classified_segments, "wordCount": transcript_result["wordCount"]},
             "classificationConfidence": confidence,
             "normalizationApplied": norm_applied,
+            "audioAvailable": True,
             "rawScores": raw_score_map,
             "audioMetrics": audio_metrics,
             "wpmFlag": wpm_flag,
@@ -175,6 +211,7 @@ def sermon_orchestrator(context: df.DurableOrchestrationContext):
             "aiReasoning": ai_reasoning,
             "sermonSummary": content_summary,
             "pipelineVersion": PIPELINE_VERSION,
+            "scoringCodeVersion": SCORING_CODE_VERSION,
             "scoringModels": SCORING_MODELS,
             "passVersions": PASS_HASHES,
         }
@@ -184,7 +221,7 @@ def sermon_orchestrator(context: df.DurableOrchestrationContext):
         })
 
         try:
-            yield context.call_activity_with_retry("activity_ensure_church", RETRY_LIGHT, {
+            church = yield context.call_activity_with_retry("activity_ensure_church", RETRY_LIGHT, {
                 "pastor": classification["pastor"], "sermonId": sermon_id,
             })
         except Exception as e:
@@ -208,16 +245,27 @@ def sermon_orchestrator(context: df.DurableOrchestrationContext):
                     f"AND error recording failed ({update_err}). Sermon stuck at 'processing'."
                 )
 
+    yield from _release_admission(context, input_data)
+    yield from _precompute_cbv(context, sermon_id, church)
+
 
 @bp.orchestration_trigger(context_name="context")
 def text_sermon_orchestrator(context: df.DurableOrchestrationContext):
     """Pipeline for text-only sermons: skip transcription + Parselmouth."""
     input_data = context.get_input()
     sermon_id = input_data["sermonId"]
-    transcript_text = input_data["transcript"]
-    word_count = input_data["wordCount"]
 
+    church = None  # set once the sermon is complete; its CBV is precomputed after the slot is released
     try:
+        if "transcript" not in input_data:
+            # Bulk import children (and reaper resubmits of them) reference the stored pipeline input
+            stored = yield context.call_activity_with_retry("activity_load_pipeline_input", RETRY_LIGHT, {
+                "sermonId": sermon_id, "artifact": input_data["inputArtifact"],
+            })
+            input_data = {**stored, **input_data}
+        transcript_text = input_data["transcript"]
+        word_count = input_data["wordCount"]
+
         estimated_duration = word_count / 140 * 60
         wpm = 140.0
 
@@ -309,9 +357,10 @@ def text_sermon_orchestrator(context: df.DurableOrchestrationContext):
             "categories": categories,
             "strengths": summary_result.get("strengths"),
             "improvements": summary_result.get("improvements"),
-            "transcript": {"fullText": transcript_text, "segments": classified_segments},
+            "transcript": {"fullText": transcript_text, "segments": classified_segments, "wordCount": word_count},
             "classificationConfidence": confidence,
             "normalizationApplied": norm_applied,
+            "audioAvailable": False,
             "rawScores": raw_score_map,
             "audioMetrics": None,
             "inputType": "text",
@@ -322,6 +371,7 @@ def text_sermon_orchestrator(context: df.DurableOrchestrationContext):
             "aiReasoning": ai_reasoning,
             "sermonSummary": content_summary,
             "pipelineVersion": PIPELINE_VERSION,
+            "scoringCodeVersion": SCORING_CODE_VERSION,
             "scoringModels": SCORING_MODELS,
             "passVersions": PASS_HASHES,
         }
@@ -331,7 +381,7 @@ def text_sermon_orchestrator(context: df.DurableOrchestrationContext):
         })
 
         try:
-            yield context.call_activity_with_retry("activity_ensure_church", RETRY_LIGHT, {
+            church = yield context.call_activity_with_retry("activity_ensure_church", RETRY_LIGHT, {
                 "pastor": classification["pastor"], "sermonId": sermon_id,
             })
         except Exception as e:
@@ -355,6 +405,9 @@ def text_sermon_orchestrator(context: df.DurableOrchestrationContext):
                     f"AND error recording failed ({update_err}). Sermon stuck at 'processing'."
                 )
 
+    yield from _release_admission(context, input_data)
+    yield from _precompute_cbv(context, sermon_id, church)
+
 
 @bp.orchestration_trigger(context_name="context")
 def rss_sermon_orchestrator(context: df.DurableOrchestrationContext):
@@ -363,6 +416,7 @@ def rss_sermon_orchestrator(context: df.DurableOrchestrationContext):
     sermon_id = input_data["sermonId"]
     audio_url = input_data["audioUrl"]
 
+    church = None  # set once the sermon is complete; its CBV is precomputed after the slot is released
     try:
         _set_status(context, sermon_id, "downloading")
 
@@ -433,7 +487,7 @@ def rss_sermon_orchestrator(context: df.DurableOrchestrationContext):
         raw_scores = {**pass1, **pass2, **pass3}
         sermon_type = classification["sermonType"]
         confidence = classification["confidence"]
-        categories, norm_applied = normalize_scores(raw_scores, sermon_type, confidence)
+        categories, norm_applied = normalize_scores(raw_scores, sermon_type, confidence, audio_available=True)
         categories, consistency_flags = consistency_check(categories, enrichment)
         composite = compute_composite(categories)
         raw_score_map = {k: raw_scores[k]["score"] for k in raw_scores}
@@ -456,9 +510,10 @@ def rss_sermon_orchestrator(context: df.DurableOrchestrationContext):
             "categories": categories,
             "strengths": summary_result.get("strengths"),
             "improvements": summary_result.get("improvements"),
-            "transcript": {"fullText": transcript_text, "segments": classified_segments},
+            "transcript": {"fullText": transcript_text, "segments": classified_segments, "wordCount": transcript_result["wordCount"]},
             "classificationConfidence": confidence,
             "normalizationApplied": norm_applied,
+            "audioAvailable": True,
             "rawScores": raw_score_map,
             "audioMetrics": audio_metrics,
             "wpmFlag": wpm_flag,
@@ -469,6 +524,7 @@ def rss_sermon_orchestrator(context: df.DurableOrchestrationContext):
             "sermonSummary": content_summary,
             "blobUrl": blob_url,
             "pipelineVersion": PIPELINE_VERSION,
+            "scoringCodeVersion": SCORING_CODE_VERSION,
             "scoringModels": SCORING_MODELS,
             "passVersions": PASS_HASHES,
         }
@@ -480,7 +536,7 @@ def rss_sermon_orchestrator(context: df.DurableOrchestrationContext):
         })
 
         try:
-            yield context.call_activity_with_retry("activity_ensure_church", RETRY_LIGHT, {
+            church = yield context.call_activity_with_retry("activity_ensure_church", RETRY_LIGHT, {
                 "pastor": classification["pastor"], "sermonId": sermon_id,
             })
         except Exception:
@@ -499,6 +555,9 @@ def rss_sermon_orchestrator(context: df.DurableOrchestrationContext):
         except Exception:
             pass
 
+    yield from _release_admission(context, input_data)
+    yield from _precompute_cbv(context, sermon_id, church)
+
 
 @bp.orchestration_trigger(context_name="context")
 def rescore_orchestrator(context: df.DurableOrchestrationContext):
@@ -520,9 +579,289 @@ def rescore_orchestrator(context: df.DurableOrchestrationContext):
                 log.error(f"[rescore] {sermon_id} failed: {e}")
 
     context.set_custom_status({"done": True, "results": results})
+    yield from _release_admission(context, input_data)
     return results
 
 
+@bp.orchestration_trigger(context_name="context")
+def recompute_orchestrator(context: df.DurableOrchestrationContext):
+    """Re-derive scores from stored rawScores/enrichment for every complete sermon (or ``sermonIds``) — no LLM.
+
+    One activity per page of recompute.RECOMPUTE_PAGE sermons, in id order.
+    """
+    input_data = context.get_input() or {}
+    totals = {"processed": 0, "updated": 0, "unchanged": 0, "skipped": 0, "conflict": 0, "error": 0}
+    after = None
+    while True:
+        page = yield context.call_activity_with_retry("activity_recompute_scores", RETRY_LIGHT, {
+            "after": after, "sermonIds": input_data.get("sermonIds"), "staleOnly": input_data.get("staleOnly", False),
+        })
+        for key in totals:
+            totals[key] += page.get(key, 0)
+        after = page.get("lastId")
+        context.set_custom_status({**totals, "done": False})
+        if page.get("done") or not page.get("processed"):
+            break
+
+    if not context.is_replaying:
+        log.info(f"[recompute] done — {totals['processed']} sermon(s), {totals['updated']} updated")
+    context.set_custom_status({**totals, "done": True})
+    return totals
+
+
+IMPORT_SLOT_WAIT_SECONDS = 60
+
+
+def _release_import_slot(context, import_id, lane):
+    try:
+        yield context.call_activity_with_retry("activity_release_slot", RETRY_LIGHT, {"sermonId": import_id, "lane": lane})
+    except Exception as e:
+        if not context.is_replaying:
+            log.error(f"[bulk_import] {import_id}: slot release failed ({e})")
+
+
+def _fail_unstarted(context, import_id, sermon_ids, error):
+    """Fail children that never started — left 'queued', the reaper (which scans 'processing') never would."""
+    try:
+        yield context.call_activity_with_retry("activity_fail_queued_sermons", RETRY_LIGHT, {
+            "sermonIds": sermon_ids, "error": error,
+        })
+    except Exception as e:
+        if not context.is_replaying:
+            log.critical(f"[bulk_import] {import_id}: could not fail {len(sermon_ids)} unstarted sermon(s) ({e})")
+
+
+@bp.orchestration_trigger(context_name="context")
+def bulk_import_orchestrator(context: df.DurableOrchestrationContext):
+    """Run a bulk import's sermons through the text pipeline, up to ``concurrency`` sub-orchestrations at a time.
+
+    Every running child holds a pipeline slot in the import's lane and is
+    started ``admitted``, so it gives the slot back itself when it finishes
+    (and the reaper counts it). The first child inherits the slot the
+    dispatcher admitted the import with; each further one takes its own
+    (activity_acquire_slot), so imports never get around MAX_CONCURRENT or the
+    interactive reservation.
+    """
+    input_data = context.get_input()
+    import_id = input_data["importId"]
+    sermon_ids = input_data["sermonIds"]
+    concurrency = input_data.get("concurrency") or bulk_import.IMPORT_CONCURRENCY
+    lane = input_data.get("lane", "bulk")
+    held = bool(input_data.get("admitted"))  # a slot taken but not yet handed to a child
+
+    running = []  # (task, sermon_id)
+    next_index, completed, failed, not_started = 0, 0, [], []
+    try:
+        while next_index < len(sermon_ids) or running:
+            while next_index < len(sermon_ids) and len(running) < concurrency:
+                if not held:
+                    slot = yield context.call_activity_with_retry("activity_acquire_slot", RETRY_LIGHT, {"lane": lane})
+                    if not slot["ok"]:
+                        break
+                    held = True
+                sermon_id = sermon_ids[next_index]
+                next_index += 1
+                try:
+                    yield context.call_activity_with_retry("activity_update_sermon", RETRY_LIGHT, {
+                        "sermonId": sermon_id, "updates": {"status": "processing"},
+                    })
+                except Exception as e:
+                    failed.append(sermon_id)
+                    not_started.append(sermon_id)
+                    if not context.is_replaying:
+                        log.error(f"[bulk_import] {import_id}/{sermon_id}: could not start ({e})")
+                    continue  # the slot goes to the next sermon
+                task = context.call_sub_orchestrator("text_sermon_orchestrator", {
+                    "sermonId": sermon_id, "inputArtifact": f"{sermon_id}/pipeline-input.json.gz",
+                    "admitted": True, "lane": lane,
+                }, instance_id=sermon_id)
+                held = False
+                running.append((task, sermon_id))
+            if held:
+                held = False  # nothing left to start with it
+                yield from _release_import_slot(context, import_id, lane)
+            if not running:
+                if next_index < len(sermon_ids):
+                    # No slot free — wait for the pipeline to drain a little
+                    yield context.create_timer(context.current_utc_datetime
+                                               + datetime.timedelta(seconds=IMPORT_SLOT_WAIT_SECONDS))
+                continue
+
+            done = yield context.task_any([task for task, _ in running])
+            sermon_id = next(sid for task, sid in running if task is done)
+            running = [(task, sid) for task, sid in running if task is not done]
+            if isinstance(done.result, Exception):
+                failed.append(sermon_id)
+                if not context.is_replaying:
+                    log.error(f"[bulk_import] {import_id}/{sermon_id}: pipeline failed ({done.result})")
+                try:
+                    yield context.call_activity_with_retry("activity_update_sermon", RETRY_LIGHT, {
+                        "sermonId": sermon_id, "updates": fail_sermon_doc(str(done.result)),
+                    })
+                except Exception:
+                    pass
+            else:
+                completed += 1
+            context.set_custom_status({"importId": import_id, "total": len(sermon_ids), "completed": completed,
+                                       "failed": failed, "running": [sid for _, sid in running]})
+    except Exception as e:
+        if not context.is_replaying:
+            log.error(f"[bulk_import] {import_id}: import failed ({e})")
+        yield from _fail_unstarted(context, import_id, not_started + sermon_ids[next_index:],
+                                   "Import failed before this sermon started")
+        if held:
+            yield from _release_import_slot(context, import_id, lane)
+        raise
+
+    if held:  # no sermons to hand it to
+        yield from _release_import_slot(context, import_id, lane)
+    if not_started:
+        yield from _fail_unstarted(context, import_id, not_started, "Import could not start this sermon")
+    summary = {"done": True, "importId": import_id, "total": len(sermon_ids), "completed": completed, "failed": failed}
+    context.set_custom_status(summary)
+    return summary
+
+
+CBV_CONCURRENCY = 3
+CBV_MAX_ROUNDS = 3
+
+
+@bp.orchestration_trigger(context_name="context")
+def cbv_orchestrator(context: df.DurableOrchestrationContext):
+    """Recompute stale CBV results for one church, CBV_CONCURRENCY batched requests at a time.
+
+    Re-plans after each round, so beliefs edited while it runs are picked up
+    (upsert_church doesn't start a second instance for the same church).
+    """
+    church_id = context.get_input()["churchId"]
+    computed, failed_batches, rounds = 0, 0, 0
+    plan = {}
+    while rounds < CBV_MAX_ROUNDS:
+        plan = yield context.call_activity_with_retry("activity_plan_cbv", RETRY_LIGHT, {"churchId": church_id})
+        batches = plan["batches"]
+        if not batches:
+            break
+        rounds += 1
+        for start in range(0, len(batches), CBV_CONCURRENCY):
+            window = batches[start:start + CBV_CONCURRENCY]
+            tasks = [context.call_activity_with_retry("activity_compute_cbv", RETRY_LLM, {
+                "churchId": church_id, "sermonIds": batch,
+            }) for batch in window]
+            try:
+                results = yield context.task_all(tasks)
+            except Exception as e:
+                # task_all fails fast; unfinished sermons stay stale and are re-planned next round
+                failed_batches += len(window)
+                results = []
+                if not context.is_replaying:
+                    log.error(f"[cbv] {church_id}: batch failed ({e})")
+            computed += sum(len(r.get("computed", [])) for r in results)
+            context.set_custom_status({"churchId": church_id, "round": rounds, "computed": computed,
+                                       "batchesDone": min(start + len(window), len(batches)),
+                                       "batches": len(batches)})
+
+    summary = {"done": True, "churchId": church_id, "beliefsHash": plan.get("beliefsHash"),
+               "computed": computed, "failedBatches": failed_batches, "rounds": rounds}
+    context.set_custom_status(summary)
+    return summary
+
+
+@bp.orchestration_trigger(context_name="context")
+def translation_orchestrator(context: df.DurableOrchestrationContext):
+    """Translate one long transcript off the HTTP request (see routes.sermons.translate_sermon)."""
+    input_data = context.get_input()
+    context.set_custom_status({"sermonId": input_data["sermonId"], "language": input_data["language"], "step": "translating"})
+    result = yield context.call_activity_with_retry("activity_translate_transcript", RETRY_LIGHT, input_data)
+    context.set_custom_status({**result, "done": True})
+    return result
+
+
+FEED_POLL_CONCURRENCY = 8
+
+
+@bp.orchestration_trigger(context_name="context")
+def feed_poll_orchestrator(context: df.DurableOrchestrationContext):
+    """Poll RSS feeds — one activity per feed, FEED_POLL_CONCURRENCY at a time — then dispatch the queue.
+
+    Started by POST /api/feeds/poll (all or ``feedIds``) and the hourly
+    poll_feeds_timer (``dueOnly``).
+    """
+    input_data = context.get_input() or {}
+    feed_ids = yield context.call_activity_with_retry("activity_list_feeds_to_poll", RETRY_LIGHT, input_data)
+
+    results = []
+    for start in range(0, len(feed_ids), FEED_POLL_CONCURRENCY):
+        window = feed_ids[start:start + FEED_POLL_CONCURRENCY]
+        tasks = [context.call_activity("activity_poll_feed", {"feedId": fid}) for fid in window]
+        try:
+            results.extend((yield context.task_all(tasks)))
+        except Exception as e:
+            # poll_feed records its own errors; this is the host failing the activity — retry one by one
+            for fid in window:
+                try:
+                    results.append((yield context.call_activity("activity_poll_feed", {"feedId": fid})))
+                except Exception as e2:
+                    results.append({"feedId": fid, "new": 0, "error": str(e2)})
+            if not context.is_replaying:
+                log.warning(f"[feed_poll] window failed ({e}), retried feed by feed")
+        context.set_custom_status({"polled": len(results), "total": len(feed_ids),
+                                   "new": sum(r.get("new", 0) for r in results)})
+
+    total_new = sum(r.get("new", 0) for r in results)
+    if total_new:
+        try:
+            yield context.call_activity("activity_dispatch_queue", {})
+        except Exception as e:
+            if not context.is_replaying:
+                log.warning(f"[feed_poll] dispatch failed ({e}); queued episodes wait for the dispatch timer")
+
+    summary = {"done": True, "polled": len(results), "new": total_new,
+               "unchanged": sum(1 for r in results if r.get("unchanged")),
+               "errors": [r for r in results if "error" in r], "results": results}
+    context.set_custom_status({k: v for k, v in summary.items() if k != "results"})
+    if not context.is_replaying:
+        log.info(f"[feed_poll] done — {len(results)} feed(s), {total_new} new episode(s), {len(summary['errors'])} error(s)")
+    return summary
+
+
+ARTIFACT_MIGRATION_BATCH = 20
+
+
+@bp.orchestration_trigger(context_name="context")
+def artifact_migration_orchestrator(context: df.DurableOrchestrationContext):
+    """Move inline transcripts/translations/history to blob artifacts, a batch at a time."""
+    sermon_ids = context.get_input()["sermonIds"]
+
+    migrated, failed, bytes_saved = 0, [], 0
+    for start in range(0, len(sermon_ids), ARTIFACT_MIGRATION_BATCH):
+        batch = sermon_ids[start:start + ARTIFACT_MIGRATION_BATCH]
+        tasks = [context.call_activity_with_retry("activity_migrate_sermon_artifacts", RETRY_LIGHT, {"sermonId": sid})
+                 for sid in batch]
+        try:
+            results = yield context.task_all(tasks)
+        except Exception:
+            # task_all fails fast; retry the batch one by one so a single bad doc doesn't sink it
+            results = []
+            for sid in batch:
+                try:
+                    results.append((yield context.call_activity("activity_migrate_sermon_artifacts", {"sermonId": sid})))
+                except Exception as e2:
+                    failed.append(sid)
+                    results.append(None)
+                    if not context.is_replaying:
+                        log.error(f"[migrate_artifacts] {sid} failed: {e2}")
+        for r in results:
+            if r and r.get("migrated"):
+                migrated += 1
+                bytes_saved += r["bytesBefore"] - r["bytesAfter"]
+        context.set_custom_status({"processed": min(start + len(batch), len(sermon_ids)), "total": len(sermon_ids),
+                                   "migrated": migrated, "failed": failed})
+
+    summary = {"done": True, "total": len(sermon_ids), "migrated": migrated, "failed": failed, "bytesSaved": bytes_saved}
+    context.set_custom_status(summary)
+    return summary
+
+
 # ─────────────────────────────────────────────
 #  Activity Function Registrations
 # ─────────────────────────────────────────────
@@ -599,6 +938,86 @@ def activity_summarize_content(input: dict):
 def activity_rescore_sermon(input: dict):
     return _run_activity("rescore_sermon", rescore_sermon, input)
 
+@bp.activity_trigger(input_name="input")
+def activity_recompute_scores(input: dict):
+    return _run_activity("recompute_scores", recompute_scores, input)
+
 @bp.activity_trigger(input_name="input")
 def activity_download_rss_audio(input: dict):
     return _run_activity("download_rss_audio", download_rss_audio, input)
+
+@bp.activity_trigger(input_name="input")
+def activity_plan_cbv(input: dict):
+    return _run_activity("plan_cbv", plan_cbv, input)
+
+@bp.activity_trigger(input_name="input")
+def activity_compute_cbv(input: dict):
+    return _run_activity("compute_cbv", compute_cbv, input)
+
+@bp.activity_trigger(input_name="input")
+def activity_fail_queued_sermons(input: dict):
+    return _run_activity("fail_queued_sermons", fail_queued_sermons, input)
+
+@bp.activity_trigger(input_name="input")
+def activity_acquire_slot(input: dict):
+    return _run_activity("acquire_slot", acquire_admission_slot, input)
+
+@bp.activity_trigger(input_name="input")
+def activity_load_pipeline_input(input: dict):
+    return _run_activity("load_pipeline_input", load_pipeline_input, input)
+
+@bp.activity_trigger(input_name="input")
+def activity_translate_transcript(input: dict):
+    return _run_activity("translate_transcript", translate_transcript, input)
+
+@bp.activity_trigger(input_name="input")
+def activity_list_feeds_to_poll(input: dict):
+    return _run_activity("list_feeds_to_poll", list_feeds_to_poll, input)
+
+@bp.activity_trigger(input_name="input")
+async def activity_poll_feed(input: dict):
+    return await poll_feed(input)
+
+@bp.activity_trigger(input_name="input")
+def activity_migrate_sermon_artifacts(input: dict):
+    return _run_activity("migrate_sermon_artifacts", migrate_sermon_artifacts, input)
+
+@bp.activity_trigger(input_name="input")
+@bp.durable_client_input(client_name="starter")
+async def activity_release_slot(input: dict, starter: df.DurableOrchestrationClient):
+    """Release a finished orchestration's lane slot and hand it straight to the next queued entry."""
+    _run_activity("release_slot", release_admission_slot, input)
+    started = await work_queue.dispatch(starter)
+    return {"ok": True, "started": started}
+
+
+@bp.activity_trigger(input_name="input")
+@bp.durable_client_input(client_name="starter")
+async def activity_dispatch_queue(input: dict, starter: df.DurableOrchestrationClient):
+    """Start queued work after a feed poll enqueued episodes."""
+    started = await work_queue.dispatch(starter)
+    return {"ok": True, "started": started}
+
+
+# ─────────────────────────────────────────────
+#  Work queue safety net
+# ─────────────────────────────────────────────
+
+@bp.timer_trigger(schedule="0 */1 * * * *", arg_name="timer", run_on_startup=False)
+@bp.durable_client_input(client_name="starter")
+@bp.function_name("dispatch_queue_timer")
+async def dispatch_queue_timer(timer, starter: df.DurableOrchestrationClient):
+    """Timer: start queued work if slots freed up without a dispatch (e.g. a release failed)."""
+    started = await work_queue.dispatch(starter)
+    if started:
+        log.info(f"[dispatch_queue_timer] started {len(started)} queued entr{'y' if len(started) == 1 else 'ies'}")
+
+
+@bp.timer_trigger(schedule="0 */10 * * * *", arg_name="timer", run_on_startup=False)
+@bp.durable_client_input(client_name="starter")
+@bp.function_name("reaper_timer")
+async def reaper_timer(timer, starter: df.DurableOrchestrationClient):
+    """Timer: reclaim sermons stuck in 'processing' and leaked pipeline slots, then refill the freed slots."""
+    report = await reaper.reap(starter)
+    if report["reclaimed"] or report["slotsReclaimed"]:
+        await work_queue.dispatch(starter)
@@ -0,0 +1,113 @@
+"""Pastor → church index for ensure_church.
+
+One document per normalised pastor name on the ``control`` container
+(``pastor-<hash>``), so resolving a pastor is a point read instead of a
+cross-partition ``ARRAY_CONTAINS`` query over ``churches``:
+
+    {"id": "pastor-…", "type": "pastor", "name": "john smith", "churchId": "grace-church", "church": "Grace Church"}
+
+Pastors the LLM could not place are indexed too, with ``churchId: null``
+and a TTL, so a repeat upload doesn't pay for the same low-confidence
+lookup again until NEGATIVE_TTL_SECONDS have passed. Both kinds are also
+kept in a small in-process cache (per function host).
+
+The index fills itself: ensure_church records every resolution, and
+upsert_church/delete_church keep it in step with admin edits. Pastors not
+yet indexed fall back to the churches query.
+"""
+
+import hashlib
+import re
+import time
+import unicodedata
+
+from log import log
+
+NEGATIVE_TTL_SECONDS = 7 * 24 * 3600
+POSITIVE_CACHE_SECONDS = 600
+NEGATIVE_CACHE_SECONDS = 3600
+CACHE_MAX_ENTRIES = 2048
+
+_HONORIFICS = re.compile(r"^(?:pastor|rev(?:erend)?|dr|bishop|elder|apostle|father|fr|pr)\.?\s+")
+_cache = {}  # normalised name → (expires_at, entry)
+
+
+def normalize_name(name):
+    """Case-, accent-, punctuation- and title-insensitive form of a pastor name."""
+    text = unicodedata.normalize("NFKD", name or "")
+    text = "".join(ch for ch in text if not unicodedata.combining(ch)).casefold()
+    text = re.sub(r"[^\w\s]", " ", text)
+    text = re.sub(r"\s+", " ", text).strip()
+    while True:
+        stripped = _HONORIFICS.sub("", text)
+        if stripped == text:
+            return text
+        text = stripped
+
+
+def _doc_id(normalised):
+    return f"pastor-{hashlib.sha256(normalised.encode()).hexdigest()[:16]}"
+
+
+def _container():
+    import admission
+    return admission._control_container()
+
+
+def _remember(normalised, entry):
+    if len(_cache) >= CACHE_MAX_ENTRIES:
+        _cache.clear()
+    ttl = POSITIVE_CACHE_SECONDS if entry.get("churchId") else NEGATIVE_CACHE_SECONDS
+    _cache[normalised] = (time.monotonic() + ttl, entry)
+
+
+def lookup(pastor):
+    """Indexed resolution for ``pastor``: {"churchId", "church"}, {"churchId": None} if known-unresolvable, or None."""
+    from azure.cosmos import exceptions
+    normalised = normalize_name(pastor)
+    if not normalised:
+        return None
+    cached = _cache.get(normalised)
+    if cached and cached[0] > time.monotonic():
+        return cached[1]
+
+    doc_id = _doc_id(normalised)
+    try:
+        doc = _container().read_item(doc_id, partition_key=doc_id)
+    except exceptions.CosmosResourceNotFoundError:
+        return None
+    entry = {"churchId": doc.get("churchId"), "church": doc.get("church")}
+    _remember(normalised, entry)
+    return entry
+
+
+def record(pastor, church_id, church_name=None):
+    """Index ``pastor`` → ``church_id``; ``church_id=None`` records a failed lookup (expires)."""
+    normalised = normalize_name(pastor)
+    if not normalised:
+        return
+    doc = {"id": _doc_id(normalised), "type": "pastor", "name": normalised, "churchId": church_id, "church": church_name}
+    if church_id is None:
+        doc["ttl"] = NEGATIVE_TTL_SECONDS
+    try:
+        _container().upsert_item(doc)
+    except Exception as e:
+        log.warning(f"[pastor_index] failed to index {pastor}: {e}")
+    _remember(normalised, {"churchId": church_id, "church": church_name})
+
+
+def forget_church(church_id):
+    """Drop every index entry pointing at ``church_id`` (church deleted or its pastors replaced)."""
+    from azure.cosmos import exceptions
+    container = _container()
+    rows = container.query_items(
+        "SELECT c.id, c.name FROM c WHERE c.type = 'pastor' AND c.churchId = @id",
+        parameters=[{"name": "@id", "value": church_id}],
+        enable_cross_partition_query=True,
+    )
+    for row in rows:
+        try:
+            container.delete_item(row["id"], partition_key=row["id"])
+        except exceptions.CosmosResourceNotFoundError:
+            pass
+        _cache.pop(row["name"], None)
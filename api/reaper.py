@@ -0,0 +1,190 @@
+"""Reconciler for sermons stuck in ``processing`` and for a drifted slot counter.
+
+A sermon stays ``processing`` forever when its orchestrator dies without
+writing a terminal status — a DOUBLE FAULT (pipeline failed, then the
+failure write failed too), a terminated instance, or a host that crashed
+between the dispatcher's status patch and ``start_new``. If the instance
+also never released its slot, the ``inflight`` counter stays high and the
+pipeline runs below MAX_CONCURRENT until it admits nothing at all.
+
+``reap`` runs on a timer (reaper_timer) and on demand (POST /api/admin/reap):
+
+1. Every ``processing`` sermon untouched for GRACE_SECONDS is checked
+   against its Durable instance. Running/Pending instances are left alone.
+   Dead ones (Completed/Failed/Terminated/Canceled, or no instance at all)
+   are put back once on the lane they ran in (from the instance input), when
+   the original input is available, and marked failed otherwise.
+2. The ``inflight`` counter is recomputed from the live admitted
+   instances. It is only rewritten when no slot has been taken or returned
+   for GRACE_SECONDS (so no dispatch is between acquire_slot and
+   start_new) and with an etag check.
+"""
+
+import json
+import os
+import time
+
+from log import log
+from store import patch_fields
+import admission
+import work_queue
+
+GRACE_SECONDS = 300
+MAX_RESUBMITS = 1
+REPORT_DOC_ID = "reaper"
+ADMITTED_ORCHESTRATORS = ("sermon_orchestrator", "text_sermon_orchestrator", "rss_sermon_orchestrator",
+                          "rescore_orchestrator", "bulk_import_orchestrator")
+_LIVE = ("Running", "Pending", "ContinuedAsNew", "Suspended")
+
+
+def _sermons_container():
+    from azure.cosmos import CosmosClient
+    cosmos = CosmosClient.from_connection_string(os.environ["COSMOS_CONNECTION_STRING"])
+    return cosmos.get_database_client("psr").get_container_client("sermons")
+
+
+def _runtime(status):
+    """Runtime status name, or None when the instance does not exist."""
+    if not status or status.runtime_status is None:
+        return None
+    return status.runtime_status.value
+
+
+def _input(status):
+    data = status.input_ if status else None
+    if isinstance(data, str):
+        try:
+            data = json.loads(data)
+        except ValueError:
+            return None
+    return data if isinstance(data, dict) else None
+
+
+def _resubmit(container, doc, status):
+    """Put a dead sermon back on the lane it originally ran in. False if it can't be resubmitted."""
+    from azure.cosmos import exceptions
+    client_input = _input(status)
+    if (doc.get("reaperResubmits") or 0) >= MAX_RESUBMITS or not client_input or status.name not in ADMITTED_ORCHESTRATORS:
+        return False
+    # The dispatcher records the lane in the instance input; RSS and import work must not
+    # come back in the interactive lane and take the slots reserved for uploads
+    lane = client_input.get("lane") if client_input.get("lane") in work_queue.LANES else "interactive"
+    client_input = {k: v for k, v in client_input.items() if k not in ("admitted", "lane")}
+    patch_fields(container, doc["id"], {"status": "queued"}, incr={"reaperResubmits": 1},
+                 filter_predicate="FROM c WHERE c.status = 'processing'")
+    try:
+        work_queue.enqueue(doc["id"], status.name, client_input, lane=lane)
+    except exceptions.CosmosResourceExistsError:
+        pass  # already queued
+    return True
+
+
+async def _reap_sermons(client, now):
+    from azure.cosmos import exceptions
+    from schema import fail_sermon_doc
+    container = _sermons_container()
+    stuck = container.query_items(
+        "SELECT c.id, c._ts, c.reaperResubmits FROM c WHERE c.status = 'processing' AND c._ts < @cutoff",
+        parameters=[{"name": "@cutoff", "value": int(now - GRACE_SECONDS)}],
+        enable_cross_partition_query=True,
+    )
+    resubmitted, failed = [], []
+    for doc in stuck:
+        sermon_id = doc["id"]
+        status = await client.get_status(sermon_id, show_input=True)
+        runtime = _runtime(status)
+        if runtime in _LIVE:
+            continue
+        try:
+            if _resubmit(container, doc, status):
+                resubmitted.append(sermon_id)
+                log.warning(f"[reaper] {sermon_id}: instance {runtime or 'missing'}, resubmitted")
+                continue
+            patch_fields(container, sermon_id,
+                         fail_sermon_doc(f"Processing stopped unexpectedly ({runtime or 'no instance'}) — please re-upload"),
+                         filter_predicate="FROM c WHERE c.status = 'processing'")
+            failed.append(sermon_id)
+            log.warning(f"[reaper] {sermon_id}: instance {runtime or 'missing'}, marked failed")
+        except exceptions.CosmosAccessConditionFailedError:
+            pass  # the orchestrator (or an admin) wrote a status in the meantime
+        except Exception as e:
+            log.error(f"[reaper] {sermon_id}: reclaim failed: {e}")
+    return resubmitted, failed
+
+
+async def _live_slots(client):
+    """Per-lane count of running orchestrations that hold a slot."""
+    from azure.durable_functions.models import OrchestrationRuntimeStatus
+    live = await client.get_status_by(runtime_status=[OrchestrationRuntimeStatus(s) for s in _LIVE])
+    counts = {"count": 0, **{lane: 0 for lane in admission.LANE_LIMITS}}
+    for instance in live:
+        # A bulk import hands its slot to its first child; the children's inputs carry the slots
+        if instance.name not in ADMITTED_ORCHESTRATORS or instance.name == "bulk_import_orchestrator":
+            continue
+        client_input = _input(await client.get_status(instance.instance_id, show_input=True))
+        if not client_input or not client_input.get("admitted"):
+            continue
+        counts["count"] += 1
+        lane = client_input.get("lane", "interactive")
+        counts[lane] = counts.get(lane, 0) + 1
+    return counts
+
+
+async def _reconcile_slots(client, now):
+    """Reset the inflight counter to the live instance counts. Returns the slots reclaimed (negative if added)."""
+    from azure.core import MatchConditions
+    from azure.cosmos import exceptions
+    container = admission._control_container()
+    try:
+        doc = container.read_item(admission.SLOT_DOC_ID, partition_key=admission.SLOT_DOC_ID)
+    except exceptions.CosmosResourceNotFoundError:
+        return 0
+    if doc.get("_ts", now) > now - GRACE_SECONDS:
+        return 0  # slots moving — a dispatch may be between acquire_slot and start_new
+
+    live = await _live_slots(client)
+    if all(doc.get(k, 0) == v for k, v in live.items()):
+        return 0
+    reclaimed = doc.get("count", 0) - live["count"]
+    updated = {k: v for k, v in doc.items() if not k.startswith("_")}
+    updated.update(live)
+    try:
+        container.replace_item(admission.SLOT_DOC_ID, updated, etag=doc["_etag"],
+                               match_condition=MatchConditions.IfNotModified)
+    except exceptions.CosmosAccessConditionFailedError:
+        return 0
+    log.warning(f"[reaper] inflight counter {doc.get('count', 0)} → {live['count']} ({live})")
+    return reclaimed
+
+
+async def reap(client, now=None):
+    """Reclaim stuck sermons and leaked slots. Returns a report (also stored on the control container)."""
+    now = time.time() if now is None else now
+    resubmitted, failed = await _reap_sermons(client, now)
+    slots = await _reconcile_slots(client, now)
+    report = {
+        "id": REPORT_DOC_ID,
+        "ranAt": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime(now)),
+        "reclaimed": len(resubmitted) + len(failed),
+        "resubmitted": resubmitted,
+        "failed": failed,
+        "slotsReclaimed": slots,
+    }
+    try:
+        admission._control_container().upsert_item(report)
+    except Exception as e:
+        log.warning(f"[reaper] failed to store report: {e}")
+    if report["reclaimed"] or slots:
+        log.warning(f"[reaper] reclaimed {report['reclaimed']} sermon(s) "
+                    f"({len(resubmitted)} resubmitted, {len(failed)} failed), {slots} slot(s)")
+    return report
+
+
+def last_report():
+    """The most recent reap report, or None."""
+    from azure.cosmos import exceptions
+    try:
+        doc = admission._control_container().read_item(REPORT_DOC_ID, partition_key=REPORT_DOC_ID)
+    except exceptions.CosmosResourceNotFoundError:
+        return None
+    return {k: v for k, v in doc.items() if not k.startswith("_") and k != "id"}
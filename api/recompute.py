@@ -0,0 +1,128 @@
+"""No-LLM score recompute.
+
+``categories``, ``compositePsr``, ``consistencyFlags`` and
+``normalizationApplied`` are pure functions (schema) of what a sermon doc
+already stores: ``rawScores`` (pre-normalization LLM scores), the
+classification, whether audio was available, and ``enrichment``. When
+only that code changes — weights, text-only caps, consistency checks, the
+gravity threshold — the derived fields can be rebuilt without any OpenAI
+call. Every scored doc records ``scoringCodeVersion`` (schema
+SCORING_CODE_VERSION), so docs scored by older code are easy to find, and
+``audioAvailable``, the audio flag its scores were normalized with.
+
+``recompute_sermon`` does one doc (the rescore ``recompute`` pass);
+``recompute_batch`` does one page of the bulk job (recompute_orchestrator):
+it streams complete sermons in id order and patches the changed ones
+concurrently. Writes are conditional on the compositePsr that was read, so
+a concurrent LLM rescore wins. Rescore history (previousScores) is not
+appended — ``scoringCodeVersion`` records what changed.
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+
+from log import log
+from schema import (CATEGORY_WEIGHTS, SCORING_CODE_VERSION, normalize_scores, consistency_check, compute_composite,
+                    scored_with_audio)
+from store import patch_fields
+import score_index
+
+RECOMPUTE_PAGE = 500
+RECOMPUTE_WORKERS = 8
+_FIELDS = ("c.id, c.rawScores, c.categories, c.sermonType, c.classificationConfidence, c.inputType,"
+           " c.audioMetrics, c.enrichment, c.compositePsr, c.consistencyFlags, c.normalizationApplied,"
+           " c.scoringCodeVersion, c.audioAvailable, c.previousScoresCount")
+
+
+def derive(doc):
+    """Derived score fields for ``doc`` under the current scoring code, or None without raw scores."""
+    raw = doc.get("rawScores") or {}
+    if any(raw.get(k) is None for k in CATEGORY_WEIGHTS):
+        return None
+    existing = doc.get("categories") or {}
+    raw_scores = {k: {"score": raw[k], "reasoning": (existing.get(k) or {}).get("reasoning", "")}
+                  for k in CATEGORY_WEIGHTS}
+    audio_available = scored_with_audio(doc.get("audioAvailable"), doc.get("inputType"),
+                                        doc.get("audioMetrics") is not None,
+                                        bool(doc.get("previousScoresCount") or doc.get("previousScores")))
+    categories, applied = normalize_scores(raw_scores, doc.get("sermonType") or "topical",
+                                           doc.get("classificationConfidence") or 50, audio_available=audio_available)
+    categories, flags = consistency_check(categories, doc.get("enrichment"))
+    return {
+        "categories": categories,
+        "compositePsr": compute_composite(categories),
+        "consistencyFlags": flags,
+        "normalizationApplied": applied,
+        "scoringCodeVersion": SCORING_CODE_VERSION,
+    }
+
+
+def _changed(doc, derived):
+    existing = doc.get("categories") or {}
+    return (
+        derived["compositePsr"] != doc.get("compositePsr")
+        or derived["consistencyFlags"] != (doc.get("consistencyFlags") or [])
+        or derived["normalizationApplied"] != doc.get("normalizationApplied")
+        or any((existing.get(k) or {}).get("score") != v["score"] or (existing.get(k) or {}).get("weight") != v["weight"]
+               for k, v in derived["categories"].items())
+    )
+
+
+def recompute_sermon(container, doc):
+    """Re-derive and patch one sermon's scores. Returns "updated", "unchanged", "skipped" or "conflict"."""
+    from azure.cosmos import exceptions
+
+    derived = derive(doc)
+    if derived is None:
+        return "skipped"
+    if not _changed(doc, derived):
+        if doc.get("scoringCodeVersion") == SCORING_CODE_VERSION:
+            return "unchanged"
+        fields, outcome = {"scoringCodeVersion": SCORING_CODE_VERSION}, "unchanged"
+    else:
+        fields, outcome = derived, "updated"
+
+    predicate = "FROM c WHERE c.status = 'complete'"
+    if doc.get("compositePsr") is not None:
+        predicate += f" AND c.compositePsr = {doc['compositePsr']}"
+    try:
+        patch_fields(container, doc["id"], fields, filter_predicate=predicate)
+    except exceptions.CosmosAccessConditionFailedError:
+        log.info(f"[recompute] {doc['id']}: changed since read, skipping")
+        return "conflict"
+    if outcome == "updated":
+        log.info(f"[recompute] {doc['id']}: PSR {doc.get('compositePsr')} -> {derived['compositePsr']}")
+        score_index.safe_sync(container, doc["id"], "recompute")
+    return outcome
+
+
+def recompute_batch(container, after=None, sermon_ids=None, stale_only=False, limit=RECOMPUTE_PAGE):
+    """Recompute up to ``limit`` complete sermons with id > ``after``. Returns counts and the cursor for the next page."""
+    conditions = ["c.status = 'complete'", "IS_DEFINED(c.rawScores)"]
+    parameters = [{"name": "@n", "value": limit}]
+    if after:
+        conditions.append("c.id > @after")
+        parameters.append({"name": "@after", "value": after})
+    if sermon_ids:
+        conditions.append("ARRAY_CONTAINS(@ids, c.id)")
+        parameters.append({"name": "@ids", "value": sermon_ids})
+    if stale_only:
+        conditions.append("(NOT IS_DEFINED(c.scoringCodeVersion) OR c.scoringCodeVersion != @v)")
+        parameters.append({"name": "@v", "value": SCORING_CODE_VERSION})
+    query = f"SELECT TOP @n {_FIELDS} FROM c WHERE {' AND '.join(conditions)} ORDER BY c.id"
+
+    counts = {"updated": 0, "unchanged": 0, "skipped": 0, "conflict": 0, "error": 0}
+    last_id, seen = after, 0
+    with ThreadPoolExecutor(max_workers=RECOMPUTE_WORKERS) as pool:
+        futures = []
+        # Patches start while later pages of the query are still streaming in
+        for doc in container.query_items(query, parameters=parameters, enable_cross_partition_query=True,
+                                         max_item_count=100):
+            futures.append((doc["id"], pool.submit(recompute_sermon, container, doc)))
+            last_id, seen = doc["id"], seen + 1
+        for sermon_id, future in futures:
+            try:
+                counts[future.result()] += 1
+            except Exception as e:
+                counts["error"] += 1
+                log.error(f"[recompute] {sermon_id} failed: {e}")
+    return {**counts, "processed": seen, "lastId": last_id, "done": seen < limit}
@@ -1,10 +1,13 @@
-"""Admin endpoints (rescore)."""
+"""Admin endpoints (rescore, scoring simulation, score index, bulk import, artifact migration, queue metrics, reaper)."""
 
 import azure.functions as func
 import azure.durable_functions as df
 
 from log import log
 from helpers import _json_response, _require_admin
+import work_queue
+import reaper
+import bulk_import
 
 bp = func.Blueprint()
 
@@ -13,7 +16,12 @@ bp = func.Blueprint()
 @bp.durable_client_input(client_name="starter")
 @bp.function_name("admin_rescore")
 async def admin_rescore(req: func.HttpRequest, starter: df.DurableOrchestrationClient) -> func.HttpResponse:
-    """POST /api/admin/rescore — Re-score sermons with current models. Requires admin key."""
+    """POST /api/admin/rescore — Re-score sermons with current models. Requires admin key.
+
+    ``passes: ["recompute"]`` re-derives scores from stored rawScores with the
+    current scoring code instead (no LLM; ``staleOnly`` limits it to sermons
+    with an older scoringCodeVersion, or none yet — those get it backfilled).
+    """
     import os
     from azure.cosmos import CosmosClient
 
@@ -27,12 +35,21 @@ async def admin_rescore(req: func.HttpRequest, starter: df.DurableOrchestrationC
     passes = body.get("passes")
     stale_only = body.get("staleOnly", False)
 
-    if stale_only:
-        passes = ["stale"]
-
     if not sermon_ids and not rescore_all:
         return _json_response({"error": "Provide sermonIds array or {\"all\": true}"}, 400)
 
+    if passes == ["recompute"]:
+        # Code-side scoring only: no LLM, no lane slot — one streaming bulk job
+        instance_id = await starter.start_new("recompute_orchestrator", client_input={
+            "sermonIds": None if rescore_all else sermon_ids, "staleOnly": stale_only,
+        })
+        log.info(f"[admin_rescore] Started recompute {instance_id} ({'all' if rescore_all else len(sermon_ids)} sermons)")
+        return _json_response({"instanceId": instance_id, "status": "processing", "passes": passes,
+                               "count": None if rescore_all else len(sermon_ids)}, 202)
+
+    if stale_only:
+        passes = ["stale"]
+
     cosmos = CosmosClient.from_connection_string(os.environ["COSMOS_CONNECTION_STRING"])
     container = cosmos.get_database_client("psr").get_container_client("sermons")
 
@@ -47,6 +64,198 @@ async def admin_rescore(req: func.HttpRequest, starter: df.DurableOrchestrationC
     if not sermon_ids:
         return _json_response({"message": "No sermons to rescore", "count": 0})
 
-    instance_id = await starter.start_new("rescore_orchestrator", client_input={"sermonIds": sermon_ids, "passes": passes})
-    log.info(f"[admin_rescore] Started rescore orchestrator {instance_id} for {len(sermon_ids)} sermons, passes={passes}")
-    return _json_response({"instanceId": instance_id, "count": len(sermon_ids), "sermonIds": sermon_ids, "passes": passes}, 202)
+    # Bulk rescore runs in the lowest-priority lane so it never delays uploads or RSS
+    entry = work_queue.enqueue(None, "rescore_orchestrator", {"sermonIds": sermon_ids, "passes": passes}, lane="rescore")
+    started = await work_queue.dispatch(starter)
+    instance_id = entry["id"]
+    status = "processing" if instance_id in started else "queued"
+    log.info(f"[admin_rescore] Queued rescore {instance_id} for {len(sermon_ids)} sermons, passes={passes} ({status})")
+    return _json_response({"instanceId": instance_id, "status": status, "count": len(sermon_ids),
+                           "sermonIds": sermon_ids, "passes": passes}, 202)
+
+
+@bp.route(route="scoring/simulate", methods=["POST"], auth_level=func.AuthLevel.ANONYMOUS)
+@bp.function_name("admin_simulate_scoring")
+async def admin_simulate_scoring(req: func.HttpRequest) -> func.HttpResponse:
+    """POST /api/admin/scoring/simulate — Score distribution and rank changes under a proposed config (see scoring_sim).
+
+    Body: ``{"config": {...}, "top": 20}``. No LLM calls. Requires admin key.
+    """
+    import asyncio
+    import os
+    from azure.cosmos import CosmosClient
+    import scoring_sim
+
+    auth_err = _require_admin(req)
+    if auth_err:
+        return auth_err
+    try:
+        body = req.get_json() if req.get_body() else {}
+    except ValueError:
+        return _json_response({"error": "Invalid JSON"}, 400)
+    try:
+        scoring_sim.resolve_config(body.get("config"))
+        top = min(int(body.get("top", scoring_sim.DEFAULT_TOP)), 200)
+    except (TypeError, ValueError) as e:
+        return _json_response({"error": str(e)}, 400)
+
+    cosmos = CosmosClient.from_connection_string(os.environ["COSMOS_CONNECTION_STRING"])
+    container = cosmos.get_database_client("psr").get_container_client("sermons")
+    corpus = await asyncio.to_thread(scoring_sim.load_corpus, container)
+    report = scoring_sim.compare(corpus, body.get("config"), top=top)
+    log.info(f"[admin_simulate_scoring] {report['sermons']} sermons, {report['changed']} changed")
+    return _json_response(report)
+
+
+@bp.route(route="score-index/rebuild", methods=["POST"], auth_level=func.AuthLevel.ANONYMOUS)
+@bp.function_name("admin_rebuild_score_index")
+async def admin_rebuild_score_index(req: func.HttpRequest) -> func.HttpResponse:
+    """POST /api/admin/score-index/rebuild — Recount the percentile histograms from all sermons (see score_index)."""
+    import asyncio
+    import os
+    from azure.cosmos import CosmosClient
+    import score_index
+
+    auth_err = _require_admin(req)
+    if auth_err:
+        return auth_err
+    cosmos = CosmosClient.from_connection_string(os.environ["COSMOS_CONNECTION_STRING"])
+    container = cosmos.get_database_client("psr").get_container_client("sermons")
+    scopes = await asyncio.to_thread(score_index.rebuild, container)
+    return _json_response({"scopes": scopes})
+
+
+@bp.route(route="import", methods=["POST"], auth_level=func.AuthLevel.ANONYMOUS)
+@bp.durable_client_input(client_name="starter")
+@bp.function_name("admin_bulk_import")
+async def admin_bulk_import(req: func.HttpRequest, starter: df.DurableOrchestrationClient) -> func.HttpResponse:
+    """POST /api/admin/import — Import archived manuscripts (zip or NDJSON). Requires admin key.
+
+    Multipart ``file`` field or a raw body. Optional ``pastor`` (default for
+    every sermon) and ``concurrency`` (pipelines run at once) as form fields
+    or query parameters.
+    """
+    import os
+    import uuid
+    from azure.cosmos import CosmosClient
+
+    auth_err = _require_admin(req)
+    if auth_err:
+        return auth_err
+
+    file = req.files.get("file")
+    if file:
+        body, filename, content_type = file.read(), file.filename or "", file.content_type or ""
+    else:
+        body, filename, content_type = req.get_body(), "", req.headers.get("Content-Type") or ""
+    if not body:
+        return _json_response({"error": "Upload a zip of manuscripts or NDJSON"}, 400)
+
+    def _option(name):
+        value = req.form.get(name) if file else None
+        return value or req.params.get(name)
+
+    try:
+        concurrency = int(_option("concurrency") or bulk_import.IMPORT_CONCURRENCY)
+    except ValueError:
+        return _json_response({"error": "concurrency must be a number"}, 400)
+    concurrency = max(1, min(concurrency, bulk_import.MAX_IMPORT_CONCURRENCY))
+
+    cosmos = CosmosClient.from_connection_string(os.environ["COSMOS_CONNECTION_STRING"])
+    container = cosmos.get_database_client("psr").get_container_client("sermons")
+
+    import_id = uuid.uuid4().hex[:12]
+    try:
+        documents = bulk_import.iter_documents(body, filename, content_type)
+        sermon_ids, skipped = bulk_import.create_sermons(container, import_id, documents, {"pastor": _option("pastor")})
+    except ValueError as e:
+        return _json_response({"error": str(e)}, 400)
+
+    if not sermon_ids:
+        return _json_response({"error": "No importable sermons", "skipped": skipped}, 400)
+
+    instance_id = f"import-{import_id}"
+    try:
+        work_queue.enqueue(None, "bulk_import_orchestrator", {
+            "importId": import_id, "sermonIds": sermon_ids, "concurrency": concurrency,
+        }, lane="bulk", instance_id=instance_id)
+    except Exception as e:
+        log.error(f"[admin_bulk_import] {instance_id}: enqueue failed: {e}")
+        bulk_import.fail_queued(container, sermon_ids, "Import failed to start")
+        return _json_response({"error": "Could not queue the import, try again"}, 503)
+    started = await work_queue.dispatch(starter)
+    status = "processing" if instance_id in started else "queued"
+    log.info(f"[admin_bulk_import] {instance_id}: {len(sermon_ids)} sermons ({len(skipped)} skipped), {status}")
+    return _json_response({"instanceId": instance_id, "importId": import_id, "status": status,
+                           "count": len(sermon_ids), "skipped": skipped}, 202)
+
+
+@bp.route(route="import/{instance_id}", methods=["GET"], auth_level=func.AuthLevel.ANONYMOUS)
+@bp.durable_client_input(client_name="starter")
+@bp.function_name("admin_bulk_import_status")
+async def admin_bulk_import_status(req: func.HttpRequest, starter: df.DurableOrchestrationClient) -> func.HttpResponse:
+    """GET /api/admin/import/{instance_id} — Bulk import progress. Requires admin key."""
+    auth_err = _require_admin(req)
+    if auth_err:
+        return auth_err
+    instance_id = req.route_params.get("instance_id")
+    status = await starter.get_status(instance_id)
+    if not status:
+        # Not started yet — still waiting in the rescore lane
+        return _json_response({"instanceId": instance_id, "status": "queued"})
+    return _json_response({"instanceId": instance_id, "status": status.runtime_status.value,
+                           "progress": status.custom_status})
+
+
+@bp.route(route="migrate-artifacts", methods=["POST"], auth_level=func.AuthLevel.ANONYMOUS)
+@bp.durable_client_input(client_name="starter")
+@bp.function_name("admin_migrate_artifacts")
+async def admin_migrate_artifacts(req: func.HttpRequest, starter: df.DurableOrchestrationClient) -> func.HttpResponse:
+    """POST /api/admin/migrate-artifacts — Move inline transcripts/translations/history to blob artifacts."""
+    import os
+    from azure.cosmos import CosmosClient
+
+    auth_err = _require_admin(req)
+    if auth_err:
+        return auth_err
+    body = req.get_json() if req.get_body() else {}
+    sermon_ids = body.get("sermonIds")
+
+    if not sermon_ids:
+        cosmos = CosmosClient.from_connection_string(os.environ["COSMOS_CONNECTION_STRING"])
+        container = cosmos.get_database_client("psr").get_container_client("sermons")
+        query = ("SELECT c.id FROM c WHERE IS_DEFINED(c.transcript.fullText)"
+                 " OR (IS_DEFINED(c.translations) AND NOT IS_NULL(c.translations))"
+                 " OR ARRAY_LENGTH(c.previousScores) > 0")
+        sermon_ids = [item["id"] for item in container.query_items(query, enable_cross_partition_query=True)]
+
+    if not sermon_ids:
+        return _json_response({"message": "No sermons to migrate", "count": 0})
+
+    instance_id = await starter.start_new("artifact_migration_orchestrator", client_input={"sermonIds": sermon_ids})
+    log.info(f"[admin_migrate_artifacts] Started migration {instance_id} for {len(sermon_ids)} sermons")
+    return _json_response({"instanceId": instance_id, "count": len(sermon_ids)}, 202)
+
+
+@bp.route(route="queue", methods=["GET"], auth_level=func.AuthLevel.ANONYMOUS)
+@bp.function_name("admin_queue")
+def admin_queue(req: func.HttpRequest) -> func.HttpResponse:
+    """GET /api/admin/queue — Per-lane queue depth, running slots and wait times. Requires admin key."""
+    auth_err = _require_admin(req)
+    if auth_err:
+        return auth_err
+    return _json_response({**work_queue.lane_metrics(), "reaper": reaper.last_report()})
+
+
+@bp.route(route="reap", methods=["POST"], auth_level=func.AuthLevel.ANONYMOUS)
+@bp.durable_client_input(client_name="starter")
+@bp.function_name("admin_reap")
+async def admin_reap(req: func.HttpRequest, starter: df.DurableOrchestrationClient) -> func.HttpResponse:
+    """POST /api/admin/reap — Reclaim stuck 'processing' sermons and leaked slots now. Requires admin key."""
+    auth_err = _require_admin(req)
+    if auth_err:
+        return auth_err
+    report = await reaper.reap(starter)
+    if report["reclaimed"] or report["slotsReclaimed"]:
+        await work_queue.dispatch(starter)
+    return _json_response({k: v for k, v in report.items() if k != "id"})
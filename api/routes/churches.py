@@ -3,9 +3,11 @@
 import os
 
 import azure.functions as func
+import azure.durable_functions as df
 
 from log import log
-from helpers import _json_response, _require_admin
+from helpers import _json_response, _require_admin, _strong_etag, _content_etag
+import pastor_index
 
 bp = func.Blueprint()
 
@@ -53,12 +55,14 @@ async def list_churches(req: func.HttpRequest) -> func.HttpResponse:
             p["sermonCount"] = stats["count"]
             p["avgScore"] = round(stats["total"] / stats["count"], 1) if stats["count"] else None
 
-    return _json_response(churches, headers={"Cache-Control": "public, max-age=300"})
+    return _json_response(churches, headers={"Cache-Control": "public, max-age=300"},
+                          req=req, etag=_content_etag(churches))
 
 
 @bp.route(route="churches", methods=["POST"])
+@bp.durable_client_input(client_name="starter")
 @bp.function_name("upsert_church")
-async def upsert_church(req: func.HttpRequest) -> func.HttpResponse:
+async def upsert_church(req: func.HttpRequest, starter: df.DurableOrchestrationClient) -> func.HttpResponse:
     """POST /api/churches — Create or update a church (admin only)."""
     from azure.cosmos import CosmosClient
 
@@ -91,6 +95,9 @@ async def upsert_church(req: func.HttpRequest) -> func.HttpResponse:
             log.warning(f"[upsert_church] beliefs scrape failed: {e}")
 
     church_container.upsert_item(body)
+    _reindex_pastors(body)
+    if body.get("beliefs"):
+        await _start_cbv_job(starter, body["id"])
     log.info(f"[upsert_church] {body['id']}: {body['name']}")
     return _json_response(body)
 
@@ -108,9 +115,10 @@ async def get_church(req: func.HttpRequest) -> func.HttpResponse:
     except exceptions.CosmosResourceNotFoundError:
         return _json_response({"error": "Church not found"}, 404)
 
+    etag = _strong_etag(doc["_etag"]) if doc.get("_etag") else None
     for key in ("_rid", "_self", "_etag", "_attachments", "_ts"):
         doc.pop(key, None)
-    return _json_response(doc)
+    return _json_response(doc, req=req, etag=etag)
 
 
 @bp.route(route="churches/{church_id}", methods=["DELETE"])
@@ -130,11 +138,39 @@ async def delete_church(req: func.HttpRequest) -> func.HttpResponse:
         container.delete_item(church_id, partition_key=church_id)
     except exceptions.CosmosResourceNotFoundError:
         return _json_response({"error": "Church not found"}, 404)
+    try:
+        pastor_index.forget_church(church_id)
+    except Exception as e:
+        log.warning(f"[delete_church] {church_id}: pastor index cleanup failed: {e}")
 
     log.info(f"[delete_church] {church_id}")
     return _json_response({"deleted": church_id})
 
 
+async def _start_cbv_job(starter, church_id):
+    """Recompute the church's stale CBV results in the background (one job per church at a time)."""
+    instance_id = f"cbv-{church_id}"
+    try:
+        status = await starter.get_status(instance_id)
+        if status and status.runtime_status and status.runtime_status.value in ("Running", "Pending"):
+            return  # the running job re-plans before it finishes and picks up the new beliefs
+        await starter.start_new("cbv_orchestrator", instance_id=instance_id, client_input={"churchId": church_id})
+        log.info(f"[upsert_church] {church_id}: started CBV job")
+    except Exception as e:
+        log.warning(f"[upsert_church] {church_id}: failed to start CBV job: {e}")
+
+
+def _reindex_pastors(church):
+    """Point the pastor index at ``church`` for its current pastor list (best effort)."""
+    try:
+        pastor_index.forget_church(church["id"])
+        for p in church.get("pastors") or []:
+            if p.get("name"):
+                pastor_index.record(p["name"], church["id"], church["name"])
+    except Exception as e:
+        log.warning(f"[upsert_church] {church['id']}: pastor index update failed: {e}")
+
+
 def _scrape_beliefs(url: str) -> list[dict]:
     """Fetch a beliefs/values page and use LLM to extract theological beliefs."""
     import re
@@ -1,6 +1,5 @@
 """RSS feed subscription endpoints."""
 
-import datetime
 import json
 import os
 import uuid
@@ -9,11 +8,13 @@ import azure.functions as func
 import azure.durable_functions as df
 
 from log import log
-from schema import new_sermon_doc, new_feed_doc
+from schema import new_feed_doc
 from helpers import _json_response, _require_admin, _feeds_container
 
 bp = func.Blueprint()
 
+SCHEDULED_POLL_INSTANCE = "feed-poll-scheduled"
+
 
 @bp.route(route="feeds", methods=["GET"])
 @bp.function_name("list_feeds")
@@ -37,9 +38,11 @@ async def list_feeds(req: func.HttpRequest) -> func.HttpResponse:
             counts = {r["status"]: r["cnt"] for r in rows}
             feed["episodeCount"] = counts.get("complete", 0)
             feed["processingCount"] = counts.get("processing", 0)
+            feed["queuedCount"] = counts.get("queued", 0)
         except Exception:
             feed["episodeCount"] = 0
             feed["processingCount"] = 0
+            feed["queuedCount"] = 0
 
     return _json_response(items)
 
@@ -61,9 +64,15 @@ async def create_feed(req: func.HttpRequest) -> func.HttpResponse:
     backfill = min(body.get("backfillCount", 0), 50)
     church_id = body.get("churchId") or None
 
-    import feedparser
-    parsed = feedparser.parse(feed_url)
-    if not parsed.entries:
+    import feed_cache
+    import feed_fetcher
+    try:
+        async with feed_fetcher.session() as http:
+            parsed, _ = await feed_cache.fetch_parsed(http, feed_url)
+    except Exception as e:
+        log.warning(f"[create_feed] could not fetch {feed_url}: {e}")
+        parsed = None
+    if parsed is None or not parsed.entries:
         return _json_response({"error": "No episodes found in feed. Check the URL."}, 400)
 
     title = body.get("title") or parsed.feed.get("title", feed_url)
@@ -112,6 +121,11 @@ async def delete_feed(req: func.HttpRequest) -> func.HttpResponse:
         container.delete_item(feed_id, partition_key=feed_id)
     except exceptions.CosmosResourceNotFoundError:
         return _json_response({"error": "Feed not found"}, 404)
+    try:
+        import feed_index
+        feed_index.forget(feed_id)
+    except Exception as e:
+        log.warning(f"[delete_feed] {feed_id}: failed to drop seen-GUID index: {e}")
 
     log.info(f"[delete_feed] {feed_id}")
     return _json_response({"deleted": feed_id})
@@ -121,7 +135,7 @@ async def delete_feed(req: func.HttpRequest) -> func.HttpResponse:
 @bp.durable_client_input(client_name="starter")
 @bp.function_name("poll_feeds_manual")
 async def poll_feeds_manual(req: func.HttpRequest, starter: df.DurableOrchestrationClient) -> func.HttpResponse:
-    """POST /api/feeds/poll — Manually trigger feed polling."""
+    """POST /api/feeds/poll — Start a feed poll (feed_poll_orchestrator); poll GET /api/feeds/poll/{instanceId}."""
     body = req.get_body()
     feed_ids = None
     if body:
@@ -129,8 +143,22 @@ async def poll_feeds_manual(req: func.HttpRequest, starter: df.DurableOrchestrat
             feed_ids = json.loads(body).get("feedIds")
         except Exception:
             pass
-    results = await _poll_all_feeds(starter, feed_ids=feed_ids)
-    return _json_response({"polled": len(results), "results": results})
+    instance_id = await starter.start_new("feed_poll_orchestrator", client_input={"feedIds": feed_ids, "dueOnly": False})
+    log.info(f"[poll_feeds_manual] started {instance_id} (feeds: {feed_ids or 'all active'})")
+    return _json_response({"instanceId": instance_id, "statusUrl": f"/api/feeds/poll/{instance_id}"}, 202)
+
+
+@bp.route(route="feeds/poll/{instance_id}", methods=["GET"])
+@bp.durable_client_input(client_name="starter")
+@bp.function_name("poll_feeds_status")
+async def poll_feeds_status(req: func.HttpRequest, starter: df.DurableOrchestrationClient) -> func.HttpResponse:
+    """GET /api/feeds/poll/{instance_id} — Progress, then summary, of a feed poll."""
+    instance_id = req.route_params.get("instance_id")
+    status = await starter.get_status(instance_id)
+    if not status:
+        return _json_response({"error": "Poll not found"}, 404)
+    return _json_response({"instanceId": instance_id, "status": status.runtime_status.value,
+                           "progress": status.custom_status, "output": status.output})
 
 
 @bp.route(route="feeds/preview", methods=["GET"])
@@ -143,195 +171,49 @@ async def preview_feeds(req: func.HttpRequest) -> func.HttpResponse:
 
 
 async def _preview_feeds():
-    """Count new episodes per active feed without submitting anything."""
-    import feedparser
+    """Count new episodes per active feed without submitting anything (feeds fetched concurrently)."""
+    import asyncio
+    import feed_cache
+    import feed_fetcher
+    import feed_index
+    import feed_poll
     from azure.cosmos import CosmosClient
 
     cosmos = CosmosClient.from_connection_string(os.environ["COSMOS_CONNECTION_STRING"])
-    db = cosmos.get_database_client("psr")
-    feed_container = _feeds_container()
-    sermon_container = db.get_container_client("sermons")
-
-    feeds = list(feed_container.query_items(
-        "SELECT * FROM c WHERE c.active = true", enable_cross_partition_query=True
-    ))
+    sermon_container = cosmos.get_database_client("psr").get_container_client("sermons")
+    feeds = feed_poll.active_feeds(_feeds_container())
 
-    results = []
-    for feed_doc in feeds:
+    async def _preview_one(http, feed_doc):
         feed_id = feed_doc["id"]
         try:
-            parsed = feedparser.parse(feed_doc["feedUrl"])
-            if not parsed.entries:
-                results.append({"feedId": feed_id, "title": feed_doc.get("title", ""), "newCount": 0})
-                continue
-
-            existing = list(sermon_container.query_items(
-                "SELECT c.feedGuid FROM c WHERE c.feedId = @fid",
-                parameters=[{"name": "@fid", "value": feed_id}],
-                enable_cross_partition_query=True,
-            ))
-            known_guids = {e["feedGuid"] for e in existing if e.get("feedGuid")}
-
-            entries = parsed.entries
-            if not feed_doc.get("lastPolledAt") and feed_doc.get("backfillCount", 0) > 0:
-                entries = entries[:feed_doc["backfillCount"]]
-            elif feed_doc.get("lastPolledAt"):
-                from email.utils import parsedate_to_datetime
-                sub_dt = datetime.datetime.fromisoformat(feed_doc["createdAt"].replace("Z", "+00:00"))
-                entries = [e for e in entries if e.get("published_parsed") and
-                    datetime.datetime(*e["published_parsed"][:6], tzinfo=datetime.timezone.utc) >= sub_dt]
-
-            new_count = 0
-            for entry in entries:
-                guid = entry.get("id") or entry.get("link", "")
-                if guid in known_guids:
-                    continue
-                has_audio = any(enc.get("type", "").startswith("audio/") for enc in entry.get("enclosures", []))
-                if not has_audio:
-                    has_audio = any(link.get("type", "").startswith("audio/") for link in entry.get("links", []))
-                if has_audio:
-                    new_count += 1
-
-            results.append({"feedId": feed_id, "title": feed_doc.get("title", ""), "newCount": new_count})
+            # httpCache is only stored after a poll submitted everything, so "unchanged" means nothing new
+            parsed, _ = await feed_cache.fetch_parsed(http, feed_doc["feedUrl"], feed_doc.get("httpCache"),
+                                                      **feed_poll.stop_conditions(feed_doc))
+            if parsed is None or not parsed.entries:
+                return {"feedId": feed_id, "title": feed_doc.get("title", ""), "newCount": 0}
+            known_guids = await asyncio.to_thread(feed_index.seen, feed_id, sermon_container)
+            new_count = sum(1 for entry in feed_poll.select_entries(feed_doc, parsed.entries)
+                            if feed_poll.entry_guid(entry) not in known_guids and feed_poll.episode_audio_url(entry))
+            return {"feedId": feed_id, "title": feed_doc.get("title", ""), "newCount": new_count}
         except Exception as e:
             log.error(f"[preview_feed] {feed_id} failed: {e}", exc_info=True)
-            results.append({"feedId": feed_id, "title": feed_doc.get("title", ""), "newCount": 0, "error": str(e)})
+            return {"feedId": feed_id, "title": feed_doc.get("title", ""), "newCount": 0, "error": str(e)}
 
-    return results
+    async with feed_fetcher.session() as http:
+        outcomes = await feed_fetcher.gather_bounded([_preview_one(http, f) for f in feeds])
+    return [r if isinstance(r, dict) else {"feedId": f["id"], "title": f.get("title", ""), "newCount": 0, "error": str(r)}
+            for f, r in zip(feeds, outcomes)]
 
 
-@bp.timer_trigger(schedule="0 0 */12 * * *", arg_name="timer", run_on_startup=False)
+@bp.timer_trigger(schedule="0 5 * * * *", arg_name="timer", run_on_startup=False)
 @bp.durable_client_input(client_name="starter")
 @bp.function_name("poll_feeds_timer")
 async def poll_feeds_timer(timer: func.TimerRequest, starter: df.DurableOrchestrationClient):
-    """Timer: poll RSS feeds every 12 hours."""
+    """Timer: hourly, poll the RSS feeds that are due (per-feed nextPollAt, see feed_schedule)."""
     if timer.past_due:
         log.info("[poll_feeds_timer] Timer is past due, running anyway")
-    results = await _poll_all_feeds(starter)
-    log.info(f"[poll_feeds_timer] Polled feeds, submitted {sum(r.get('new', 0) for r in results)} new episodes")
-
-
-async def _poll_all_feeds(starter: df.DurableOrchestrationClient, feed_ids=None):
-    """Poll active feeds, submit new episodes for scoring. Optionally filter by feed_ids."""
-    import feedparser
-    from azure.cosmos import CosmosClient
-
-    cosmos = CosmosClient.from_connection_string(os.environ["COSMOS_CONNECTION_STRING"])
-    db = cosmos.get_database_client("psr")
-    feed_container = _feeds_container()
-    sermon_container = db.get_container_client("sermons")
-
-    feeds = list(feed_container.query_items(
-        "SELECT * FROM c WHERE c.active = true", enable_cross_partition_query=True
-    ))
-    if feed_ids:
-        feed_ids_set = set(feed_ids)
-        feeds = [f for f in feeds if f["id"] in feed_ids_set]
-
-    log.info(f"[poll_feeds] polling {len(feeds)} active feed(s)")
-    results = []
-    for feed_doc in feeds:
-        feed_id = feed_doc["id"]
-        try:
-            parsed = feedparser.parse(feed_doc["feedUrl"])
-            if not parsed.entries:
-                log.warning(f"[poll_feed] {feed_id}: no entries in feed")
-                results.append({"feedId": feed_id, "new": 0, "error": "No entries"})
-                continue
-
-            existing = list(sermon_container.query_items(
-                "SELECT c.feedGuid FROM c WHERE c.feedId = @fid",
-                parameters=[{"name": "@fid", "value": feed_id}],
-                enable_cross_partition_query=True,
-            ))
-            known_guids = {e["feedGuid"] for e in existing if e.get("feedGuid")}
-
-            entries = parsed.entries
-            if not feed_doc.get("lastPolledAt") and feed_doc.get("backfillCount", 0) > 0:
-                entries = entries[:feed_doc["backfillCount"]]
-            elif feed_doc.get("lastPolledAt"):
-                from email.utils import parsedate_to_datetime
-                sub_dt = datetime.datetime.fromisoformat(feed_doc["createdAt"].replace("Z", "+00:00"))
-                filtered = []
-                for e in entries:
-                    pub = e.get("published_parsed")
-                    if pub:
-                        pub_dt = datetime.datetime(*pub[:6], tzinfo=datetime.timezone.utc)
-                        if pub_dt >= sub_dt:
-                            filtered.append(e)
-                entries = filtered
-
-            new_count = 0
-            for entry in entries:
-                guid = entry.get("id") or entry.get("link", "")
-                if guid in known_guids:
-                    continue
-
-                audio_url = None
-                for enc in entry.get("enclosures", []):
-                    if enc.get("type", "").startswith("audio/"):
-                        audio_url = enc.get("href") or enc.get("url")
-                        break
-                if not audio_url:
-                    for link in entry.get("links", []):
-                        if link.get("type", "").startswith("audio/"):
-                            audio_url = link.get("href")
-                            break
-                if not audio_url:
-                    continue
-
-                sermon_id = str(uuid.uuid4())
-                title = entry.get("title", "Untitled Episode")
-                pastor = entry.get("author") or None
-                pub = entry.get("published_parsed")
-                date = f"{pub.tm_year}-{pub.tm_mon:02d}-{pub.tm_mday:02d}" if pub else None
-                doc = new_sermon_doc(sermon_id, f"rss-{feed_id}", title, pastor=pastor)
-                if date:
-                    doc["date"] = date
-                doc["feedId"] = feed_id
-                doc["feedGuid"] = guid
-                doc["inputType"] = "rss"
-                doc["uploadedAt"] = datetime.datetime.utcnow().isoformat() + "Z"
-                doc["rssAudioUrl"] = audio_url
-                if feed_doc.get("churchId"):
-                    doc["churchId"] = feed_doc["churchId"]
-                doc["rssMeta"] = {
-                    "subtitle": entry.get("subtitle") or None,
-                    "summary": entry.get("summary") or None,
-                    "link": entry.get("link") or None,
-                    "image": (entry.get("image") or {}).get("href") or None,
-                }
-                sermon_container.create_item(doc)
-
-                await starter.start_new("rss_sermon_orchestrator", client_input={
-                    "sermonId": sermon_id,
-                    "audioUrl": audio_url,
-                    "userTitle": title,
-                    "userPastor": pastor,
-                    "churchId": feed_doc.get("churchId"),
-                })
-                new_count += 1
-                known_guids.add(guid)
-                log.info(f"[poll_feed] {feed_id}: submitted '{title}' ({sermon_id})")
-
-            feed_doc["lastPolledAt"] = datetime.datetime.utcnow().isoformat() + "Z"
-            feed_doc["lastPollResult"] = {"new": new_count, "errors": 0, "timestamp": feed_doc["lastPolledAt"]}
-            if entries:
-                feed_doc["lastSeenGuid"] = entries[0].get("id") or entries[0].get("link", "")
-            feed_container.upsert_item(feed_doc)
-            log.info(f"[poll_feed] {feed_id}: {new_count} new episode(s)")
-            results.append({"feedId": feed_id, "new": new_count})
-
-        except Exception as e:
-            log.error(f"[poll_feed] {feed_id} failed: {e}", exc_info=True)
-            feed_doc["lastPollResult"] = {"new": 0, "errors": 1, "timestamp": datetime.datetime.utcnow().isoformat() + "Z"}
-            try:
-                feed_container.upsert_item(feed_doc)
-            except Exception:
-                pass
-            results.append({"feedId": feed_id, "new": 0, "error": str(e)})
-
-    total_new = sum(r.get("new", 0) for r in results)
-    total_err = sum(1 for r in results if "error" in r)
-    log.info(f"[poll_feeds] done — {total_new} new episode(s), {total_err} error(s)")
-    return results
+    status = await starter.get_status(SCHEDULED_POLL_INSTANCE)
+    if status and status.runtime_status.value in ("Running", "Pending"):
+        log.info("[poll_feeds_timer] previous scheduled poll still running, skipping")
+        return
+    await starter.start_new("feed_poll_orchestrator", SCHEDULED_POLL_INSTANCE, {"feedIds": None, "dueOnly": True})
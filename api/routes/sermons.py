@@ -1,101 +1,148 @@
 """Sermon CRUD + upload endpoints."""
 
+import json
 import os
 import uuid
 
 import azure.functions as func
 import azure.durable_functions as df
 
+import admission
+import score_index
+import work_queue
+import cbv as cbv_helpers
+import translation
 from log import log
-from schema import new_sermon_doc, fail_sermon_doc
+from schema import new_sermon_doc, fail_sermon_doc, UNASSIGNED_CHURCH_ID
 from helpers import (
     ALLOWED_TYPES, MAX_SIZE, ALLOWED_TEXT_TYPES, ALLOWED_TEXT_EXTENSIONS, MAX_TEXT_SIZE,
     _json_response, _require_admin, _extract_text, _extract_video_id, _parse_timestamp,
+    _strong_etag, _content_etag, _etag_matches, _if_none_match,
+)
+from store import (
+    load_transcript, load_translation, load_translations, delete_artifacts, patch_fields,
 )
 
 bp = func.Blueprint()
 
 
+def _current_etag(container, sermon_id):
+    """Cheap freshness check — project only the Cosmos _etag (single-partition query)."""
+    rows = list(container.query_items(
+        "SELECT VALUE c._etag FROM c WHERE c.id = @id",
+        parameters=[{"name": "@id", "value": sermon_id}],
+        partition_key=sermon_id,
+    ))
+    return rows[0] if rows else None
+
+
+def _client_ip(req):
+    client_ip = req.headers.get("X-Forwarded-For", req.headers.get("REMOTE_ADDR", "unknown"))
+    if "," in client_ip:
+        client_ip = client_ip.split(",")[0].strip()
+    return client_ip
+
+
+def _admit_upload(client_ip, tag):
+    """Per-IP upload rate check (see admission.py). Returns an error response, or None if admitted."""
+    try:
+        allowed = admission.take_upload_token(client_ip)
+    except Exception as e:
+        log.error(f"[{tag}] Admission check failed ({e}), rejecting upload")
+        return _json_response({"error": "Uploads are temporarily unavailable. Please try again shortly."}, 503)
+    if not allowed:
+        log.warning(f"[{tag}] Rate limited IP {client_ip}")
+        return _json_response({"error": "Upload limit reached. Try again in an hour."}, 429)
+    return None
+
+
+def _refund_upload(client_ip, tag):
+    """Hand back the rate token of an upload that failed before it was queued."""
+    try:
+        admission.refund_upload_token(client_ip)
+    except Exception as e:
+        log.warning(f"[{tag}] Failed to refund upload token: {e}")
+
+
+async def _submit_upload(starter, container, sermon_id, client_ip, tag, orchestrator, client_input):
+    """Queue an accepted upload and run the dispatcher. Returns the 202 (or 500) response."""
+    try:
+        work_queue.enqueue(sermon_id, orchestrator, client_input, lane="interactive")
+    except Exception as e:
+        log.error(f"[{tag}] Enqueue failed for {sermon_id}: {e}", exc_info=True)
+        _refund_upload(client_ip, tag)
+        try:
+            patch_fields(container, sermon_id, fail_sermon_doc("Processing failed to start — please re-upload"))
+        except Exception:
+            pass
+        return _json_response({"error": "Processing failed to start. Please retry."}, 500)
+
+    try:
+        started = await work_queue.dispatch(starter)
+    except Exception as e:
+        log.warning(f"[{tag}] Dispatch failed ({e}); {sermon_id} stays queued")
+        started = []
+    status = "processing" if sermon_id in started else "queued"
+    log.info(f"[{tag}] {sermon_id}: {status}")
+    return _json_response({"id": sermon_id, "status": status}, 202)
+
+
 @bp.route(route="sermons/{sermon_id}/cbv", methods=["GET"])
 @bp.function_name("get_cbv_score")
 async def get_cbv_score(req: func.HttpRequest) -> func.HttpResponse:
     """GET /api/sermons/{id}/cbv — Check which church beliefs are referenced in the sermon."""
-    from azure.cosmos import CosmosClient, exceptions
+    from azure.cosmos import CosmosClient
 
     sermon_id = req.route_params.get("sermon_id")
     cosmos = CosmosClient.from_connection_string(os.environ["COSMOS_CONNECTION_STRING"])
     db = cosmos.get_database_client("psr")
 
-    # Get sermon
-    try:
-        sermon = db.get_container_client("sermons").read_item(sermon_id, partition_key=sermon_id)
-    except exceptions.CosmosResourceNotFoundError:
+    # Only the fields this needs — the transcript is read separately, and only on a cache miss
+    container = db.get_container_client("sermons")
+    sermon = _project_sermon(container, sermon_id, ["id", "cbv", "pastor", "churchId"])
+    if sermon is None:
         return _json_response({"error": "Sermon not found"}, 404)
 
     # Return cached result if available
     if sermon.get("cbv"):
-        return _json_response(sermon["cbv"], headers={"Cache-Control": "public, max-age=3600"})
-
-    transcript = (sermon.get("transcript") or {}).get("fullText", "")
+        return _json_response(sermon["cbv"], headers={"Cache-Control": "public, max-age=3600"},
+                              req=req, etag=_content_etag(sermon["cbv"]))
+
+    stored = list(container.query_items(
+        "SELECT VALUE c.transcript FROM c WHERE c.id = @id",
+        parameters=[{"name": "@id", "value": sermon_id}],
+        partition_key=sermon_id,
+    ))
+    transcript = load_transcript({"transcript": stored[0] if stored else None})["fullText"]
     if not transcript:
         return _json_response({"error": "No transcript available"}, 400)
 
-    # Find matching church via pastor
-    pastor = sermon.get("pastor")
-    if not pastor:
+    # Find the church: churchId / pastor index, then just its beliefs
+    if not sermon.get("pastor") and sermon.get("churchId") in (None, UNASSIGNED_CHURCH_ID):
         return _json_response({"error": "No pastor linked"}, 400)
 
     try:
-        churches = list(db.get_container_client("churches").query_items(
-            "SELECT * FROM c", enable_cross_partition_query=True
-        ))
+        church_id = cbv_helpers.resolve_church_id(db, sermon)
+        beliefs = cbv_helpers.church_beliefs(db, church_id) if church_id else []
     except Exception:
-        churches = []
-
-    church = next((c for c in churches if any(p["name"] == pastor for p in c.get("pastors", []))), None)
-    if not church or not church.get("beliefs"):
+        beliefs = []
+    if not beliefs:
         return _json_response({"error": "No church beliefs found"}, 400)
 
-    beliefs = church["beliefs"]
-    # Build belief list for the prompt
-    belief_lines = "\n".join(f"- {b['title']}: {b.get('description', '')}" for b in beliefs if isinstance(b, dict))
-    if not belief_lines:
-        # Legacy format (list of strings)
-        belief_lines = "\n".join(f"- {b}" for b in beliefs if isinstance(b, str))
-
-    # Truncate transcript to ~4000 words to stay within token limits
-    words = transcript.split()
-    truncated = " ".join(words[:4000])
-
     from activities.helpers import _openai_client
-    client = _openai_client()
-
-    resp = client.chat.completions.create(
-        model="gpt-5-nano",
-        response_format={"type": "json_object"},
-        messages=[
-            {"role": "system", "content": "You check whether a sermon references specific church beliefs/values. "
-             "For each belief, determine if the sermon meaningfully touches on that theme — "
-             "it doesn't need to quote it verbatim, just clearly relate to the concept. "
-             "Return JSON: {\"results\": [{\"title\": \"...\", \"referenced\": true/false}]}"},
-            {"role": "user", "content": f"Church beliefs:\n{belief_lines}\n\nSermon transcript:\n{truncated}"},
-        ],
-    )
-
-    import json
     try:
-        cbv = json.loads(resp.choices[0].message.content)
-    except Exception:
+        cbv = cbv_helpers.check_sermons(_openai_client(), beliefs, [(sermon_id, transcript)])[sermon_id]
+    except ValueError:
         return _json_response({"error": "AI response parse error"}, 500)
 
-    # Cache on sermon doc
+    # Cache on sermon doc (the background CBV job refreshes it when the beliefs change)
     try:
-        sermon["cbv"] = cbv
-        db.get_container_client("sermons").upsert_item(sermon)
+        patch_fields(container, sermon_id,
+                     {"cbv": cbv, "cbvBeliefsHash": cbv_helpers.beliefs_hash(beliefs)})
     except Exception:
         pass  # non-fatal
 
-    return _json_response(cbv, headers={"Cache-Control": "public, max-age=3600"})
+    return _json_response(cbv, headers={"Cache-Control": "public, max-age=3600"}, req=req, etag=_content_etag(cbv))
 
 
 @bp.route(route="sermons", methods=["POST"])
@@ -111,38 +158,6 @@ async def upload_sermon(req: func.HttpRequest, starter: df.DurableOrchestrationC
     if content_length and int(content_length) > MAX_SIZE:
         return _json_response({"error": "File too large. Max 100MB."}, 413)
 
-    cosmos = CosmosClient.from_connection_string(os.environ["COSMOS_CONNECTION_STRING"])
-    container = cosmos.get_database_client("psr").get_container_client("sermons")
-
-    MAX_CONCURRENT = 3
-    try:
-        processing = list(container.query_items(
-            "SELECT VALUE COUNT(1) FROM c WHERE c.status = 'processing'",
-            enable_cross_partition_query=True,
-        ))
-        if processing and processing[0] >= MAX_CONCURRENT:
-            log.warning(f"[upload] Rejected — {processing[0]} sermons already processing")
-            return _json_response({"error": "Server is busy processing other sermons. Please try again in a few minutes."}, 429)
-    except Exception as e:
-        log.warning(f"[upload] Concurrency check failed ({e}), allowing upload")
-
-    MAX_UPLOADS_PER_HOUR = 5
-    client_ip = req.headers.get("X-Forwarded-For", req.headers.get("REMOTE_ADDR", "unknown"))
-    if "," in client_ip:
-        client_ip = client_ip.split(",")[0].strip()
-    try:
-        one_hour_ago = (datetime.datetime.utcnow() - datetime.timedelta(hours=1)).isoformat() + "Z"
-        recent = list(container.query_items(
-            "SELECT VALUE COUNT(1) FROM c WHERE c.uploaderIp = @ip AND c.uploadedAt > @since",
-            parameters=[{"name": "@ip", "value": client_ip}, {"name": "@since", "value": one_hour_ago}],
-            enable_cross_partition_query=True,
-        ))
-        if recent and recent[0] >= MAX_UPLOADS_PER_HOUR:
-            log.warning(f"[upload] Rate limited IP {client_ip} ({recent[0]} uploads in last hour)")
-            return _json_response({"error": "Upload limit reached. Try again in an hour."}, 429)
-    except Exception as e:
-        log.warning(f"[upload] Rate limit check failed ({e}), allowing upload")
-
     file = req.files.get("file")
     if not file:
         return _json_response({"error": "No file uploaded"}, 400)
@@ -155,6 +170,11 @@ async def upload_sermon(req: func.HttpRequest, starter: df.DurableOrchestrationC
     if len(audio_bytes) > MAX_SIZE:
         return _json_response({"error": "File too large. Max 100MB."}, 400)
 
+    client_ip = _client_ip(req)
+    rejected = _admit_upload(client_ip, "upload")
+    if rejected:
+        return rejected
+
     title = req.form.get("title") or None
     pastor = req.form.get("pastor") or None
     sermon_id = str(uuid.uuid4())
@@ -168,9 +188,13 @@ async def upload_sermon(req: func.HttpRequest, starter: df.DurableOrchestrationC
         blob.upload_blob(audio_bytes, content_type=content_type)
     except Exception as e:
         log.error(f"[upload] Blob upload failed for {sermon_id}: {e}", exc_info=True)
+        _refund_upload(client_ip, "upload")
         return _json_response({"error": "Failed to store audio file. Please retry."}, 500)
 
-    doc = new_sermon_doc(sermon_id, filename, title, pastor)
+    cosmos = CosmosClient.from_connection_string(os.environ["COSMOS_CONNECTION_STRING"])
+    container = cosmos.get_database_client("psr").get_container_client("sermons")
+
+    doc = new_sermon_doc(sermon_id, filename, title, pastor, status="queued")
     doc["blobUrl"] = blob_name
     doc["uploaderIp"] = client_ip
     doc["uploadedAt"] = datetime.datetime.utcnow().isoformat() + "Z"
@@ -178,25 +202,15 @@ async def upload_sermon(req: func.HttpRequest, starter: df.DurableOrchestrationC
         container.create_item(doc)
     except Exception as e:
         log.error(f"[upload] Cosmos create failed for {sermon_id}: {e}", exc_info=True)
+        _refund_upload(client_ip, "upload")
         return _json_response({"error": "Failed to create sermon record. Please retry."}, 500)
 
-    try:
-        instance_id = await starter.start_new("sermon_orchestrator", client_input={
-            "sermonId": sermon_id,
-            "blobUrl": blob_name,
-            "userTitle": title,
-            "userPastor": pastor,
-        })
-        log.info(f"[upload] Started orchestrator {instance_id} for sermon {sermon_id}")
-    except Exception as e:
-        log.error(f"[upload] Orchestrator start failed for {sermon_id}: {e}", exc_info=True)
-        try:
-            container.upsert_item({**doc, **fail_sermon_doc("Orchestrator failed to start — please re-upload")})
-        except Exception:
-            pass
-        return _json_response({"error": "Processing failed to start. Please retry."}, 500)
-
-    return _json_response({"id": sermon_id, "status": "processing"}, 202)
+    return await _submit_upload(starter, container, sermon_id, client_ip, "upload", "sermon_orchestrator", {
+        "sermonId": sermon_id,
+        "blobUrl": blob_name,
+        "userTitle": title,
+        "userPastor": pastor,
+    })
 
 
 @bp.route(route="sermons/text", methods=["POST"])
@@ -207,36 +221,6 @@ async def upload_text_sermon(req: func.HttpRequest, starter: df.DurableOrchestra
     import datetime
     from azure.cosmos import CosmosClient
 
-    cosmos = CosmosClient.from_connection_string(os.environ["COSMOS_CONNECTION_STRING"])
-    container = cosmos.get_database_client("psr").get_container_client("sermons")
-
-    MAX_CONCURRENT = 3
-    try:
-        processing = list(container.query_items(
-            "SELECT VALUE COUNT(1) FROM c WHERE c.status = 'processing'",
-            enable_cross_partition_query=True,
-        ))
-        if processing and processing[0] >= MAX_CONCURRENT:
-            return _json_response({"error": "Server is busy processing other sermons. Please try again in a few minutes."}, 429)
-    except Exception:
-        pass
-
-    MAX_UPLOADS_PER_HOUR = 5
-    client_ip = req.headers.get("X-Forwarded-For", req.headers.get("REMOTE_ADDR", "unknown"))
-    if "," in client_ip:
-        client_ip = client_ip.split(",")[0].strip()
-    try:
-        one_hour_ago = (datetime.datetime.utcnow() - datetime.timedelta(hours=1)).isoformat() + "Z"
-        recent = list(container.query_items(
-            "SELECT VALUE COUNT(1) FROM c WHERE c.uploaderIp = @ip AND c.uploadedAt > @since",
-            parameters=[{"name": "@ip", "value": client_ip}, {"name": "@since", "value": one_hour_ago}],
-            enable_cross_partition_query=True,
-        ))
-        if recent and recent[0] >= MAX_UPLOADS_PER_HOUR:
-            return _json_response({"error": "Upload limit reached. Try again in an hour."}, 429)
-    except Exception:
-        pass
-
     file = req.files.get("file")
     if not file:
         return _json_response({"error": "No file uploaded"}, 400)
@@ -261,11 +245,19 @@ async def upload_text_sermon(req: func.HttpRequest, starter: df.DurableOrchestra
     if word_count < 50:
         return _json_response({"error": "Transcript too short (under 50 words). Upload a complete sermon."}, 400)
 
+    client_ip = _client_ip(req)
+    rejected = _admit_upload(client_ip, "upload_text")
+    if rejected:
+        return rejected
+
+    cosmos = CosmosClient.from_connection_string(os.environ["COSMOS_CONNECTION_STRING"])
+    container = cosmos.get_database_client("psr").get_container_client("sermons")
+
     title = req.form.get("title") or None
     pastor = req.form.get("pastor") or None
     sermon_id = str(uuid.uuid4())
 
-    doc = new_sermon_doc(sermon_id, filename, title, pastor)
+    doc = new_sermon_doc(sermon_id, filename, title, pastor, status="queued")
     doc["uploaderIp"] = client_ip
     doc["uploadedAt"] = datetime.datetime.utcnow().isoformat() + "Z"
     doc["inputType"] = "text"
@@ -273,26 +265,16 @@ async def upload_text_sermon(req: func.HttpRequest, starter: df.DurableOrchestra
         container.create_item(doc)
     except Exception as e:
         log.error(f"[upload_text] Cosmos create failed for {sermon_id}: {e}", exc_info=True)
+        _refund_upload(client_ip, "upload_text")
         return _json_response({"error": "Failed to create sermon record. Please retry."}, 500)
 
-    try:
-        instance_id = await starter.start_new("text_sermon_orchestrator", client_input={
-            "sermonId": sermon_id,
-            "transcript": transcript_text,
-            "wordCount": word_count,
-            "userTitle": title,
-            "userPastor": pastor,
-        })
-        log.info(f"[upload_text] Started text orchestrator {instance_id} for sermon {sermon_id}")
-    except Exception as e:
-        log.error(f"[upload_text] Orchestrator start failed for {sermon_id}: {e}", exc_info=True)
-        try:
-            container.upsert_item({**doc, **fail_sermon_doc("Orchestrator failed to start — please re-upload")})
-        except Exception:
-            pass
-        return _json_response({"error": "Processing failed to start. Please retry."}, 500)
-
-    return _json_response({"id": sermon_id, "status": "processing"}, 202)
+    return await _submit_upload(starter, container, sermon_id, client_ip, "upload_text", "text_sermon_orchestrator", {
+        "sermonId": sermon_id,
+        "transcript": transcript_text,
+        "wordCount": word_count,
+        "userTitle": title,
+        "userPastor": pastor,
+    })
 
 
 @bp.route(route="sermons/youtube", methods=["POST"])
@@ -320,35 +302,6 @@ async def upload_youtube_sermon(req: func.HttpRequest, starter: df.DurableOrches
     if end_sec <= start_sec:
         return _json_response({"error": "End time must be after start time"}, 400)
 
-    cosmos = CosmosClient.from_connection_string(os.environ["COSMOS_CONNECTION_STRING"])
-    container = cosmos.get_database_client("psr").get_container_client("sermons")
-
-    MAX_CONCURRENT = 3
-    try:
-        processing = list(container.query_items(
-            "SELECT VALUE COUNT(1) FROM c WHERE c.status = 'processing'",
-            enable_cross_partition_query=True,
-        ))
-        if processing and processing[0] >= MAX_CONCURRENT:
-            return _json_response({"error": "Server is busy processing other sermons. Please try again in a few minutes."}, 429)
-    except Exception:
-        pass
-
-    client_ip = req.headers.get("X-Forwarded-For", req.headers.get("REMOTE_ADDR", "unknown"))
-    if "," in client_ip:
-        client_ip = client_ip.split(",")[0].strip()
-    try:
-        one_hour_ago = (datetime.datetime.utcnow() - datetime.timedelta(hours=1)).isoformat() + "Z"
-        recent = list(container.query_items(
-            "SELECT VALUE COUNT(1) FROM c WHERE c.uploaderIp = @ip AND c.uploadedAt > @since",
-            parameters=[{"name": "@ip", "value": client_ip}, {"name": "@since", "value": one_hour_ago}],
-            enable_cross_partition_query=True,
-        ))
-        if recent and recent[0] >= 5:
-            return _json_response({"error": "Upload limit reached. Try again in an hour."}, 429)
-    except Exception:
-        pass
-
     try:
         from youtube_transcript_api import YouTubeTranscriptApi
         from youtube_transcript_api.proxies import WebshareProxyConfig
@@ -397,11 +350,19 @@ async def upload_youtube_sermon(req: func.HttpRequest, starter: df.DurableOrches
     if word_count < 50:
         return _json_response({"error": "Transcript too short (under 50 words). Try a different video."}, 400)
 
+    client_ip = _client_ip(req)
+    rejected = _admit_upload(client_ip, "upload_youtube")
+    if rejected:
+        return rejected
+
+    cosmos = CosmosClient.from_connection_string(os.environ["COSMOS_CONNECTION_STRING"])
+    container = cosmos.get_database_client("psr").get_container_client("sermons")
+
     title = body.get("title") or None
     pastor = body.get("pastor") or None
     sermon_id = str(uuid.uuid4())
 
-    doc = new_sermon_doc(sermon_id, f"youtube-{video_id}", title, pastor)
+    doc = new_sermon_doc(sermon_id, f"youtube-{video_id}", title, pastor, status="queued")
     doc["uploaderIp"] = client_ip
     doc["uploadedAt"] = datetime.datetime.utcnow().isoformat() + "Z"
     doc["inputType"] = "youtube"
@@ -413,26 +374,23 @@ async def upload_youtube_sermon(req: func.HttpRequest, starter: df.DurableOrches
         container.create_item(doc)
     except Exception as e:
         log.error(f"[upload_youtube] Cosmos create failed for {sermon_id}: {e}", exc_info=True)
+        _refund_upload(client_ip, "upload_youtube")
         return _json_response({"error": "Failed to create sermon record. Please retry."}, 500)
 
-    try:
-        instance_id = await starter.start_new("text_sermon_orchestrator", client_input={
-            "sermonId": sermon_id,
-            "transcript": transcript_text,
-            "wordCount": word_count,
-            "userTitle": title,
-            "userPastor": pastor,
-        })
-        log.info(f"[upload_youtube] Started orchestrator {instance_id} for sermon {sermon_id} (video {video_id}, {word_count} words)")
-    except Exception as e:
-        log.error(f"[upload_youtube] Orchestrator start failed for {sermon_id}: {e}", exc_info=True)
-        try:
-            container.upsert_item({**doc, **fail_sermon_doc("Orchestrator failed to start — please re-upload")})
-        except Exception:
-            pass
-        return _json_response({"error": "Processing failed to start. Please retry."}, 500)
+    return await _submit_upload(starter, container, sermon_id, client_ip, "upload_youtube", "text_sermon_orchestrator", {
+        "sermonId": sermon_id,
+        "transcript": transcript_text,
+        "wordCount": word_count,
+        "userTitle": title,
+        "userPastor": pastor,
+    })
+
 
-    return _json_response({"id": sermon_id, "status": "processing"}, 202)
+def _add_percentiles(items):
+    """Set ``percentile`` (rank among all complete sermons, score_index) on each scored list item."""
+    for item in items:
+        if item.get("status") == "complete":
+            item["percentile"] = score_index.percentile(item.get("compositePsr"))
 
 
 @bp.route(route="sermons", methods=["GET"])
@@ -451,8 +409,9 @@ async def list_sermons(req: func.HttpRequest) -> func.HttpResponse:
     else:
         query = "SELECT c.id, c.title, c.pastor, c.date, c.duration, c.status, c.sermonType, c.compositePsr, c.inputType, c.bonus, c.totalScore FROM c ORDER BY c.date DESC"
         items = list(container.query_items(query, enable_cross_partition_query=True))
+    _add_percentiles(items)
 
-    return _json_response(items, headers={"Cache-Control": "public, max-age=30"})
+    return _json_response(items, headers={"Cache-Control": "public, max-age=30"}, req=req, compact=True)
 
 
 @bp.route(route="sermons/dashboard", methods=["GET"])
@@ -473,39 +432,123 @@ async def dashboard_sermons(req: func.HttpRequest) -> func.HttpResponse:
     else:
         query = f"SELECT {fields} FROM c WHERE c.status = 'complete' ORDER BY c.date DESC"
         items = list(container.query_items(query, enable_cross_partition_query=True))
-
-    return _json_response(items, headers={"Cache-Control": "public, max-age=30"})
+    _add_percentiles(items)
+
+    return _json_response(items, headers={"Cache-Control": "public, max-age=30"}, req=req, compact=True)
+
+
+# Never projectable via ?fields= (private, or large enough to defeat the point of projecting)
+_UNPROJECTABLE_FIELDS = {
+    "translations", "translationArtifacts", "previousScores", "previousScoresArtifact", "uploaderIp", "uploadedAt",
+    "scoreIndex",
+}
+_MAX_PROJECTED_FIELDS = 40
+
+
+def _parse_fields(raw):
+    """Parse ?fields=a,b,c into a validated list (always including id). None if absent.
+
+    Raises ValueError for names that are not plain top-level properties.
+    """
+    import re
+    if not isinstance(raw, str) or not raw.strip():
+        return None
+    fields = ["id"]
+    for name in (f.strip() for f in raw.split(",")):
+        if not name or name in fields:
+            continue
+        if not re.fullmatch(r"[A-Za-z][A-Za-z0-9]*", name) or name in _UNPROJECTABLE_FIELDS:
+            raise ValueError(f"Field not selectable: {name}")
+        fields.append(name)
+    if len(fields) > _MAX_PROJECTED_FIELDS:
+        raise ValueError(f"Too many fields (max {_MAX_PROJECTED_FIELDS})")
+    return fields
+
+
+def _project_sermon(container, sermon_id, fields):
+    """Single-partition query returning only ``fields`` (+ _etag). None if not found.
+
+    ``transcript`` projects to its stored wordCount only, matching the default detail shape.
+    """
+    select = []
+    for f in fields:
+        if f == "transcript":
+            select.append('{"wordCount": c.transcript.wordCount} AS transcript')
+        else:
+            select.append(f'c["{f}"]')  # bracket form: names like value/order are SQL keywords
+    rows = list(container.query_items(
+        f"SELECT {', '.join(select)}, c._etag FROM c WHERE c.id = @id",
+        parameters=[{"name": "@id", "value": sermon_id}],
+        partition_key=sermon_id,
+    ))
+    return rows[0] if rows else None
 
 
 @bp.route(route="sermons/{sermon_id}", methods=["GET"])
 @bp.function_name("get_sermon")
 async def get_sermon(req: func.HttpRequest) -> func.HttpResponse:
-    """GET /api/sermons/{id} — Sermon detail. Excludes transcript by default for performance."""
+    """GET /api/sermons/{id} — Sermon detail. Excludes transcript by default for performance.
+
+    ``?fields=title,compositePsr,...`` returns only those properties via a projection query.
+    Full detail adds ``percentile`` / ``typePercentile`` / ``churchPercentile`` (score_index);
+    the index version is part of its ETag.
+    """
     from azure.cosmos import CosmosClient, exceptions
 
     sermon_id = req.route_params.get("sermon_id")
     include_transcript = req.params.get("include") == "transcript"
+    try:
+        fields = _parse_fields(req.params.get("fields"))
+    except ValueError as e:
+        return _json_response({"error": str(e)}, 400)
+    if fields:
+        variant = "fields:" + ",".join(fields)
+    else:
+        # Full bodies carry percentiles, which move with other sermons' scores
+        variant = ("transcript" if include_transcript else "detail") + ":" + score_index.version()
     cosmos = CosmosClient.from_connection_string(os.environ["COSMOS_CONNECTION_STRING"])
     container = cosmos.get_database_client("psr").get_container_client("sermons")
 
-    try:
-        doc = container.read_item(sermon_id, partition_key=sermon_id)
-    except exceptions.CosmosResourceNotFoundError:
-        return _json_response({"error": "Sermon not found"}, 404)
+    if _if_none_match(req):
+        current = _current_etag(container, sermon_id)
+        if current and _etag_matches(req, _strong_etag(current, variant)):
+            return _json_response(None, req=req, etag=_strong_etag(current, variant))
+
+    if fields:
+        doc = _project_sermon(container, sermon_id, fields)
+        if doc is None:
+            return _json_response({"error": "Sermon not found"}, 404)
+    else:
+        try:
+            doc = container.read_item(sermon_id, partition_key=sermon_id)
+        except exceptions.CosmosResourceNotFoundError:
+            return _json_response({"error": "Sermon not found"}, 404)
 
+    etag = _strong_etag(doc["_etag"], variant) if doc.get("_etag") else None
     for key in ("_rid", "_self", "_etag", "_attachments", "_ts", "uploaderIp", "uploadedAt"):
         doc.pop(key, None)
 
-    if not include_transcript:
+    if include_transcript:
+        if doc.get("transcript"):
+            doc["transcript"] = load_transcript(doc)
+        if doc.get("translationArtifacts"):
+            doc["translations"] = load_translations(doc)
+    elif not fields:
         transcript = doc.get("transcript")
         if transcript:
-            doc["transcript"] = {
-                "wordCount": len((transcript.get("fullText") or "").split()),
-            }
+            word_count = transcript.get("wordCount")
+            if word_count is None:  # docs written before wordCount was stored
+                word_count = len((transcript.get("fullText") or "").split())
+            doc["transcript"] = {"wordCount": word_count}
         doc.pop("translations", None)
+    doc.pop("translationArtifacts", None)
+    doc.pop("previousScoresArtifact", None)
+    doc.pop("scoreIndex", None)
+    if not fields:
+        doc.update(score_index.percentiles(doc))
 
     cache = {"Cache-Control": "public, max-age=300"} if doc.get("status") == "complete" else {}
-    return _json_response(doc, headers=cache)
+    return _json_response(doc, headers=cache, req=req, etag=etag, compact=True)
 
 
 @bp.route(route="sermons/{sermon_id}/transcript", methods=["GET"])
@@ -518,26 +561,37 @@ async def get_sermon_transcript(req: func.HttpRequest) -> func.HttpResponse:
     cosmos = CosmosClient.from_connection_string(os.environ["COSMOS_CONNECTION_STRING"])
     container = cosmos.get_database_client("psr").get_container_client("sermons")
 
+    if _if_none_match(req):
+        current = _current_etag(container, sermon_id)
+        if current and _etag_matches(req, _strong_etag(current, "transcript-body")):
+            return _json_response(None, headers={"Cache-Control": "public, max-age=3600"},
+                                  req=req, etag=_strong_etag(current, "transcript-body"))
+
     try:
         doc = container.read_item(sermon_id, partition_key=sermon_id)
     except exceptions.CosmosResourceNotFoundError:
         return _json_response({"error": "Sermon not found"}, 404)
 
-    transcript = doc.get("transcript", {})
-    translations = doc.get("translations", {})
+    transcript = load_transcript(doc)
+    etag = _strong_etag(doc["_etag"], "transcript-body") if doc.get("_etag") else None
 
     return _json_response({
-        "fullText": transcript.get("fullText", ""),
-        "segments": transcript.get("segments"),
-        "translations": translations,
-    }, headers={"Cache-Control": "public, max-age=3600"})
+        "fullText": transcript["fullText"],
+        "segments": transcript["segments"],
+        "translations": load_translations(doc),
+    }, headers={"Cache-Control": "public, max-age=3600"}, req=req, etag=etag, compact=True)
 
 
 @bp.route(route="sermons/{sermon_id}/translate", methods=["POST"])
+@bp.durable_client_input(client_name="starter")
 @bp.function_name("translate_sermon")
-async def translate_sermon(req: func.HttpRequest) -> func.HttpResponse:
-    """POST /api/sermons/{id}/translate — Translate transcript via Azure Translator."""
-    import requests as http_requests
+async def translate_sermon(req: func.HttpRequest, starter: df.DurableOrchestrationClient) -> func.HttpResponse:
+    """POST /api/sermons/{id}/translate — Translate transcript via Azure Translator.
+
+    Short transcripts are translated in the request; longer ones start
+    translation_orchestrator and return 202 — poll GET .../translate/{language}.
+    """
+    import asyncio
     from azure.cosmos import CosmosClient, exceptions
 
     sermon_id = req.route_params.get("sermon_id")
@@ -556,50 +610,64 @@ async def translate_sermon(req: func.HttpRequest) -> func.HttpResponse:
     except exceptions.CosmosResourceNotFoundError:
         return _json_response({"error": "Sermon not found"}, 404)
 
-    cached = doc.get("translations", {}).get(target_lang)
+    cached = load_translation(doc, target_lang)
     if cached:
         return _json_response({"language": target_lang, "text": cached})
 
-    text = doc.get("transcript", {}).get("fullText", "")
+    text = load_transcript(doc)["fullText"]
     if not text:
         return _json_response({"error": "No transcript available"}, 400)
 
-    key = os.environ.get("TRANSLATOR_KEY", "")
-    region = os.environ.get("TRANSLATOR_REGION", "eastus2")
-    if not key:
+    if not translation.is_configured():
         return _json_response({"error": "Translation service not configured"}, 500)
 
-    chunks = [text[i:i+5000] for i in range(0, len(text), 5000)]
-    translated_parts = []
-    for chunk in chunks:
-        for attempt in range(3):
-            resp = http_requests.post(
-                "https://api.cognitive.microsofttranslator.com/translate",
-                params={"api-version": "3.0", "to": target_lang},
-                headers={"Ocp-Apim-Subscription-Key": key, "Ocp-Apim-Subscription-Region": region, "Content-Type": "application/json"},
-                json=[{"Text": chunk}],
-                timeout=30,
-            )
-            if resp.status_code == 200:
-                translated_parts.append(resp.json()[0]["translations"][0]["text"])
-                break
-            elif resp.status_code == 429:
-                import time
-                time.sleep(2 * (attempt + 1))
-            else:
-                log.error(f"[translate] Azure Translator error: {resp.status_code} {resp.text}")
-                return _json_response({"error": "Translation failed"}, 500)
-        else:
+    if len(text) > translation.INLINE_MAX_CHARS:
+        instance_id = translation.job_instance_id(sermon_id, target_lang)
+        status = await starter.get_status(instance_id)
+        if not status or status.runtime_status.value not in ("Running", "Pending"):
+            await starter.start_new("translation_orchestrator", instance_id,
+                                    {"sermonId": sermon_id, "language": target_lang})
+            log.info(f"[translate] {sermon_id} → {target_lang}: started {instance_id} ({len(text)} chars)")
+        return _json_response({"language": target_lang, "status": "running", "instanceId": instance_id}, 202)
+
+    try:
+        translated, stats = await asyncio.to_thread(translation.translate_and_store, container, doc, target_lang, text)
+    except translation.TranslationError as e:
+        if e.status_code == 429:
             return _json_response({"error": "Translation rate limited. Try again in a moment."}, 429)
+        return _json_response({"error": "Translation failed"}, 500)
 
-    translated = "".join(translated_parts)
+    return _json_response({"language": target_lang, "text": translated, "stats": stats})
 
-    translations = doc.get("translations", {})
-    translations[target_lang] = translated
-    doc["translations"] = translations
-    container.upsert_item(doc)
 
-    return _json_response({"language": target_lang, "text": translated})
+@bp.route(route="sermons/{sermon_id}/translate/{language}", methods=["GET"])
+@bp.durable_client_input(client_name="starter")
+@bp.function_name("translation_status")
+async def translation_status(req: func.HttpRequest, starter: df.DurableOrchestrationClient) -> func.HttpResponse:
+    """GET /api/sermons/{id}/translate/{language} — Result of a background translation."""
+    from azure.cosmos import CosmosClient, exceptions
+
+    sermon_id = req.route_params.get("sermon_id")
+    target_lang = req.route_params.get("language")
+
+    cosmos = CosmosClient.from_connection_string(os.environ["COSMOS_CONNECTION_STRING"])
+    container = cosmos.get_database_client("psr").get_container_client("sermons")
+    try:
+        doc = container.read_item(sermon_id, partition_key=sermon_id)
+    except exceptions.CosmosResourceNotFoundError:
+        return _json_response({"error": "Sermon not found"}, 404)
+
+    cached = load_translation(doc, target_lang)
+    if cached:
+        return _json_response({"language": target_lang, "status": "complete", "text": cached})
+
+    status = await starter.get_status(translation.job_instance_id(sermon_id, target_lang))
+    if not status:
+        return _json_response({"error": "No translation in progress"}, 404)
+    if status.runtime_status.value in ("Running", "Pending"):
+        return _json_response({"language": target_lang, "status": "running"}, 202)
+    log.warning(f"[translate] {sermon_id} → {target_lang}: job ended {status.runtime_status.value} without a translation")
+    return _json_response({"language": target_lang, "status": "failed", "error": "Translation failed"}, 500)
 
 
 @bp.route(route="sermons/{sermon_id}/bonus", methods=["PATCH"])
@@ -625,10 +693,14 @@ async def apply_bonus(req: func.HttpRequest) -> func.HttpResponse:
     cosmos = CosmosClient.from_connection_string(os.environ["COSMOS_CONNECTION_STRING"])
     container = cosmos.get_database_client("psr").get_container_client("sermons")
 
-    try:
-        doc = container.read_item(sermon_id, partition_key=sermon_id)
-    except exceptions.CosmosResourceNotFoundError:
+    rows = list(container.query_items(
+        "SELECT c.status, c.compositePsr FROM c WHERE c.id = @id",
+        parameters=[{"name": "@id", "value": sermon_id}],
+        partition_key=sermon_id,
+    ))
+    if not rows:
         return _json_response({"error": "Sermon not found"}, 404)
+    doc = rows[0]
 
     if doc.get("status") != "complete":
         return _json_response({"error": "Sermon not yet scored"}, 400)
@@ -637,11 +709,16 @@ async def apply_bonus(req: func.HttpRequest) -> func.HttpResponse:
     psr = doc["compositePsr"]
     total = round(min(100, max(0, psr + bonus)), 1)
 
-    doc["bonus"] = bonus
-    doc["bonusReason"] = body.get("reason", "")
-    doc["bonusRows"] = body.get("bonusRows")
-    doc["totalScore"] = total
-    container.upsert_item(doc)
+    try:
+        # Only apply if the score we based the total on is still current (no rescore in between)
+        patch_fields(container, sermon_id, {
+            "bonus": bonus,
+            "bonusReason": body.get("reason", ""),
+            "bonusRows": body.get("bonusRows"),
+            "totalScore": total,
+        }, filter_predicate=f"FROM c WHERE c.status = 'complete' AND c.compositePsr = {json.dumps(psr)}")
+    except exceptions.CosmosAccessConditionFailedError:
+        return _json_response({"error": "Sermon changed while applying bonus, try again"}, 409)
 
     log.info(f"[apply_bonus] {sermon_id}: PSR={psr}, bonus={bonus}, total={total}")
     return _json_response({"id": sermon_id, "compositePsr": psr, "bonus": bonus, "totalScore": total})
@@ -676,8 +753,16 @@ async def delete_sermon(req: func.HttpRequest) -> func.HttpResponse:
             blob_container.delete_blob(blob.name)
     except Exception as e:
         log.warning(f"[delete_sermon] Blob cleanup failed for {sermon_id}: {e}")
+    try:
+        delete_artifacts(sermon_id)
+    except Exception as e:
+        log.warning(f"[delete_sermon] Artifact cleanup failed for {sermon_id}: {e}")
 
     container.delete_item(sermon_id, partition_key=sermon_id)
+    try:
+        score_index.remove(doc)
+    except Exception as e:
+        log.warning(f"[delete_sermon] Score index update failed for {sermon_id}: {e}")
     log.info(f"[delete_sermon] Deleted {sermon_id}: {doc.get('title')}")
     return _json_response({"deleted": sermon_id})
 
@@ -707,13 +792,11 @@ async def edit_sermon(req: func.HttpRequest) -> func.HttpResponse:
     container = cosmos.get_database_client("psr").get_container_client("sermons")
 
     try:
-        doc = container.read_item(sermon_id, partition_key=sermon_id)
+        patch_fields(container, sermon_id, updates)
     except exceptions.CosmosResourceNotFoundError:
         return _json_response({"error": "Sermon not found"}, 404)
-
-    for k, v in updates.items():
-        doc[k] = v
-    container.upsert_item(doc)
+    if score_index.TRACKED_FIELDS & updates.keys():
+        score_index.safe_sync(container, sermon_id, "edit_sermon")
 
     log.info(f"[edit_sermon] {sermon_id}: updated {list(updates.keys())}")
-    return _json_response({k: doc.get(k) for k in ["id", "title", "pastor", "date", "sermonType"]})
+    return _json_response({"id": sermon_id, **{k: updates[k] for k in ["title", "pastor", "date", "sermonType"] if k in updates}})
@@ -41,9 +41,19 @@ PASS_CATEGORIES = {
 }
 
 def detect_stale_passes(sermon_doc):
-    """Compare stored pass hashes vs current. Returns list of stale pass names."""
+    """Compare stored pass hashes vs current. Returns list of stale pass names.
+
+    ``"recompute"`` is included when the scores came from older scoring code
+    (SCORING_CODE_VERSION) — re-derivable without LLM calls. Docs scored
+    before the version was recorded aren't stale on that account; the bulk
+    recompute (``staleOnly``) backfills their version.
+    """
     stored = sermon_doc.get("passVersions", {})
-    return [name for name, current in PASS_HASHES.items() if stored.get(name) != current]
+    stale = [name for name, current in PASS_HASHES.items() if stored.get(name) != current]
+    version = sermon_doc.get("scoringCodeVersion")
+    if version is not None and version != SCORING_CODE_VERSION:
+        stale.append("recompute")
+    return stale
 
 CATEGORY_WEIGHTS = {
     "biblicalAccuracy": 25,
@@ -75,6 +85,45 @@ NORM_ADJUSTMENTS = {
     "survey": {"biblicalAccuracy": 3, "timeInTheWord": 5, "passageFocus": 12},
 }
 
+# Confidence tiers for sermon-type normalization: (min confidence, multiplier, label); below all → "none"
+NORM_CONFIDENCE_TIERS = [(90, 1.0, "full"), (80, 0.5, "half")]
+
+# Text-only caps: no audio evidence for delivery / emotional range
+TEXT_ONLY_CAPS = {"delivery": 75, "emotionalRange": 80}
+
+# Biblical gravity: composite capped at biblical avg + margin when that avg is below threshold
+BIBLICAL_KEYS = ["biblicalAccuracy", "timeInTheWord", "passageFocus"]
+BIBLICAL_GRAVITY = {"threshold": 40, "margin": 5}
+
+# consistency_check thresholds and adjustments (DTS-3)
+CONSISTENCY_RULES = {
+    "highScore": 80,            # checks 1, 2, 4 apply at or above this score
+    "moderateTwFloor": 50,      # check 3: timeInTheWord in [floor, highScore)
+    "minLanguageRefs": 3,       # check 3: biblical language refs needed for the bonus
+    "maxIllustrations": 1,      # check 4: at most this many illustrations (and no personal stories)
+    "twPenalty": 3,
+    "engagementPenalty": 4,
+    "twBonus": 3,
+    "applicationPenalty": 3,
+}
+
+# Scoring code version — which code-side scoring (normalize_scores → consistency_check →
+# compute_composite and the constants above) produced a sermon's categories/compositePsr.
+# The constants are hashed in; bump SCORING_LOGIC_REVISION when those functions change.
+SCORING_LOGIC_REVISION = "2026-10-19"
+
+
+def scoring_code_version():
+    import json
+    fingerprint = json.dumps([
+        SCORING_LOGIC_REVISION, CATEGORY_WEIGHTS, NORM_ADJUSTMENTS, NORM_CONFIDENCE_TIERS,
+        TEXT_ONLY_CAPS, BIBLICAL_KEYS, BIBLICAL_GRAVITY, CONSISTENCY_RULES,
+    ], sort_keys=True)
+    return _hashlib.sha256(fingerprint.encode()).hexdigest()[:12]
+
+
+SCORING_CODE_VERSION = scoring_code_version()
+
 UNASSIGNED_CHURCH_ID = "church-unassigned"
 
 
@@ -91,16 +140,21 @@ def new_feed_doc(feed_id, feed_url, title, backfill=0, church_id=None):
         "lastPolledAt": None,
         "lastPollResult": None,
         "lastSeenGuid": None,
+        "httpCache": None,
+        "sortedByDate": None,
+        "publishHistory": [],
+        "emptyPolls": 0,
+        "nextPollAt": None,
         "createdAt": datetime.datetime.utcnow().isoformat() + "Z",
     }
 
 
-def new_sermon_doc(sermon_id, filename, title=None, pastor=None):
-    """Create initial Cosmos document when upload starts."""
+def new_sermon_doc(sermon_id, filename, title=None, pastor=None, status="processing"):
+    """Create initial Cosmos document when upload starts (``status="queued"`` when it waits for a slot)."""
     import datetime
     return {
         "id": sermon_id,
-        "status": "processing",
+        "status": status,
         "title": title or filename,
         "pastor": pastor,
         "date": datetime.datetime.utcnow().strftime("%Y-%m-%d"),
@@ -139,14 +193,13 @@ def compute_composite(categories):
         ),
         1,
     )
-    biblical_keys = ["biblicalAccuracy", "timeInTheWord", "passageFocus"]
-    biblical_total_weight = sum(CATEGORY_WEIGHTS[k] for k in biblical_keys)
+    biblical_total_weight = sum(CATEGORY_WEIGHTS[k] for k in BIBLICAL_KEYS)
     biblical_avg = sum(
-        categories[k]["score"] * CATEGORY_WEIGHTS[k] for k in biblical_keys
+        categories[k]["score"] * CATEGORY_WEIGHTS[k] for k in BIBLICAL_KEYS
     ) / biblical_total_weight
 
-    if biblical_avg < 40:
-        return round(min(raw, biblical_avg + 5), 1)
+    if biblical_avg < BIBLICAL_GRAVITY["threshold"]:
+        return round(min(raw, biblical_avg + BIBLICAL_GRAVITY["margin"]), 1)
     return raw
 
 
@@ -158,6 +211,7 @@ def consistency_check(categories, enrichment):
     if not enrichment:
         return categories, []
 
+    rules = CONSISTENCY_RULES
     flags = []
     adjusted = {}
     for k, v in categories.items():
@@ -175,28 +229,43 @@ def consistency_check(categories, enrichment):
     app = categories.get("application", {}).get("score", 0)
 
     # Check 1: High TW but zero depth signals from enrichment
-    if tw >= 80 and bl_count == 0 and ch_count == 0:
-        adjusted["timeInTheWord"]["score"] = max(0, tw - 3)
-        flags.append("timeInTheWord -3: high score but no biblical language or church history refs in enrichment")
+    if tw >= rules["highScore"] and bl_count == 0 and ch_count == 0:
+        adjusted["timeInTheWord"]["score"] = max(0, tw - rules["twPenalty"])
+        flags.append(f"timeInTheWord -{rules['twPenalty']}: high score but no biblical language or church history refs in enrichment")
 
     # Check 2: High Engagement but zero illustrations
-    if eng >= 80 and ill_total == 0:
-        adjusted["engagement"]["score"] = max(0, eng - 4)
-        flags.append("engagement -4: high score but no illustrations detected in enrichment")
+    if eng >= rules["highScore"] and ill_total == 0:
+        adjusted["engagement"]["score"] = max(0, eng - rules["engagementPenalty"])
+        flags.append(f"engagement -{rules['engagementPenalty']}: high score but no illustrations detected in enrichment")
 
     # Check 3: Moderate TW with strong depth signals
-    if 50 <= tw < 80 and bl_count >= 3:
-        adjusted["timeInTheWord"]["score"] = min(100, tw + 3)
-        flags.append(f"timeInTheWord +3: moderate score but {bl_count} biblical language refs in enrichment")
+    if rules["moderateTwFloor"] <= tw < rules["highScore"] and bl_count >= rules["minLanguageRefs"]:
+        adjusted["timeInTheWord"]["score"] = min(100, tw + rules["twBonus"])
+        flags.append(f"timeInTheWord +{rules['twBonus']}: moderate score but {bl_count} biblical language refs in enrichment")
 
     # Check 4: High Application but no grounding illustrations
-    if app >= 80 and personal_count == 0 and ill_total <= 1:
-        adjusted["application"]["score"] = max(0, app - 3)
-        flags.append("application -3: high score but no personal stories or illustrations to ground application")
+    if app >= rules["highScore"] and personal_count == 0 and ill_total <= rules["maxIllustrations"]:
+        adjusted["application"]["score"] = max(0, app - rules["applicationPenalty"])
+        flags.append(f"application -{rules['applicationPenalty']}: high score but no personal stories or illustrations to ground application")
 
     return adjusted, flags
 
 
+def scored_with_audio(audio_available, input_type, has_audio_metrics, llm_rescored):
+    """Whether a sermon's stored scores were normalized with ``audio_available`` (no TEXT_ONLY_CAPS).
+
+    Scorers record ``audioAvailable``; docs scored before that follow whoever
+    scored them last: the LLM rescore used "has audioMetrics", the audio
+    pipelines always scored with audio (even when analysis failed), text
+    uploads never.
+    """
+    if audio_available is not None:
+        return bool(audio_available)
+    if llm_rescored:
+        return bool(has_audio_metrics)
+    return input_type != "text"
+
+
 def normalize_scores(raw_scores, sermon_type, confidence, audio_available=True):
     """Apply sermon-type normalization with tiered confidence (POC #10).
 
@@ -206,18 +275,14 @@ def normalize_scores(raw_scores, sermon_type, confidence, audio_available=True):
     Returns (categories dict, normalization_applied str).
     """
     # Determine normalization level based on confidence
-    if confidence >= 90:
-        multiplier = 1.0
-        applied = "full"
-    elif confidence >= 80:
-        multiplier = 0.5
-        applied = "half"
-    else:
-        multiplier = 0.0
-        applied = "none"
+    multiplier, applied = 0.0, "none"
+    for min_confidence, tier_multiplier, label in NORM_CONFIDENCE_TIERS:
+        if confidence >= min_confidence:
+            multiplier, applied = tier_multiplier, label
+            break
 
     # Text-only caps (Issue 4: prevent inflated delivery/ER without audio)
-    TEXT_ONLY_CAPS = {"delivery": 75, "emotionalRange": 80} if not audio_available else {}
+    caps = TEXT_ONLY_CAPS if not audio_available else {}
 
     adjustments = NORM_ADJUSTMENTS.get(sermon_type, {})
     categories = {}
@@ -225,8 +290,8 @@ def normalize_scores(raw_scores, sermon_type, confidence, audio_available=True):
         score = raw_scores[key]["score"]
         adj = adjustments.get(key, 0) * multiplier
         final = min(100, round(score + adj))
-        if key in TEXT_ONLY_CAPS:
-            final = min(final, TEXT_ONLY_CAPS[key])
+        if key in caps:
+            final = min(final, caps[key])
         categories[key] = {
             "score": final,
             "weight": CATEGORY_WEIGHTS[key],
@@ -0,0 +1,238 @@
+"""Percentile ranks for composite PSR scores.
+
+"How does this compare?" used to mean pulling every sermon's compositePsr.
+Instead the ``control`` container keeps fixed-bin histograms of complete
+sermons' scores — one bin per 0.1 PSR (BINS), so a percentile is exact —
+for every scope a sermon is compared in:
+
+    {"id": "scorehist-all", "type": "score-histogram", "scope": "all", "counts": [0, 0, …], "total": 1234}
+
+Scopes: ``all``, ``type:<sermonType>`` and ``church:<churchId>``. The
+histograms are maintained incrementally: ``sync`` runs whenever a sermon's
+compositePsr, sermonType or churchId is written (update_sermon,
+ensure_church, edit_sermon, recompute) and ``remove`` on delete. Each
+sermon records what it is counted as in ``scoreIndex``
+({"psr", "sermonType", "churchId"}), claimed with a conditional patch
+before the histogram ``incr`` ops, so concurrent writers never count a
+sermon twice. ``rebuild`` recounts everything (admin; first deploy or
+after drift).
+
+Reads use a small in-process cache (CACHE_SECONDS) of cumulative counts,
+so ``percentiles`` is a lookup per scope; ``version`` identifies the
+generation of counts they came from (for ETags).
+"""
+
+import hashlib
+import json
+import re
+import time
+
+from log import log
+from schema import UNASSIGNED_CHURCH_ID
+
+BINS = 1001  # PSR 0.0 … 100.0 in 0.1 steps
+TRACKED_FIELDS = {"compositePsr", "sermonType", "churchId"}  # writes to these call sync
+CACHE_SECONDS = 60
+MAX_SYNC_ATTEMPTS = 3
+_cache = {}  # scope → (expires_at, cumulative counts or None, histogram _etag or None)
+
+
+def _bin(psr):
+    return min(BINS - 1, max(0, int(round(psr * 10))))
+
+
+def scopes(entry):
+    """Histogram scopes a sermon with ``sermonType`` / ``churchId`` is counted in."""
+    result = ["all"]
+    if entry.get("sermonType"):
+        result.append(f"type:{entry['sermonType']}")
+    if entry.get("churchId") and entry["churchId"] != UNASSIGNED_CHURCH_ID:
+        result.append(f"church:{entry['churchId']}")
+    return result
+
+
+def _doc_id(scope):
+    kind, _, value = scope.partition(":")
+    if not value:
+        return f"scorehist-{kind}"
+    if not re.fullmatch(r"[\w.-]+", value):
+        value = hashlib.sha256(value.encode()).hexdigest()[:16]
+    return f"scorehist-{kind}-{value}"
+
+
+def _container():
+    import admission
+    return admission._control_container()
+
+
+def _entry(doc):
+    """What a sermon doc should be counted as, or None if it isn't scored."""
+    if doc.get("status") != "complete" or doc.get("compositePsr") is None:
+        return None
+    return {"psr": doc["compositePsr"], "sermonType": doc.get("sermonType"), "churchId": doc.get("churchId")}
+
+
+def _apply(entry, delta):
+    """Add ``delta`` (+1/-1) for ``entry`` to each of its scope histograms."""
+    from azure.cosmos import exceptions
+    container = _container()
+    b = _bin(entry["psr"])
+    for scope in scopes(entry):
+        doc_id = _doc_id(scope)
+        ops = [{"op": "incr", "path": f"/counts/{b}", "value": delta}, {"op": "incr", "path": "/total", "value": delta}]
+        try:
+            container.patch_item(doc_id, partition_key=doc_id, patch_operations=ops, no_response=True)
+        except exceptions.CosmosResourceNotFoundError:
+            if delta < 0:
+                continue
+            counts = [0] * BINS
+            counts[b] = 1
+            try:
+                container.create_item({"id": doc_id, "type": "score-histogram", "scope": scope, "counts": counts, "total": 1})
+            except exceptions.CosmosResourceExistsError:
+                container.patch_item(doc_id, partition_key=doc_id, patch_operations=ops, no_response=True)
+
+
+def sync(sermon_container, sermon_id):
+    """Bring the histograms in line with one sermon's current score, type and church."""
+    from azure.cosmos import exceptions
+    from store import patch_fields
+
+    for _ in range(MAX_SYNC_ATTEMPTS):
+        rows = list(sermon_container.query_items(
+            "SELECT c.status, c.compositePsr, c.sermonType, c.churchId, c.scoreIndex FROM c WHERE c.id = @id",
+            parameters=[{"name": "@id", "value": sermon_id}],
+            partition_key=sermon_id,
+        ))
+        if not rows:
+            return
+        current, wanted = rows[0].get("scoreIndex"), _entry(rows[0])
+        if current == wanted:
+            return
+        # Claim the change first: only the writer that saw this scoreIndex gets to move the counts
+        if current is None:
+            predicate = "FROM c WHERE NOT IS_DEFINED(c.scoreIndex) OR IS_NULL(c.scoreIndex)"
+        else:
+            predicate = "FROM c WHERE " + " AND ".join(f"c.scoreIndex.{k} = {json.dumps(v)}" for k, v in sorted(current.items()))
+        try:
+            patch_fields(sermon_container, sermon_id, {"scoreIndex": wanted}, filter_predicate=predicate)
+        except exceptions.CosmosAccessConditionFailedError:
+            continue
+        if current:
+            _apply(current, -1)
+        if wanted:
+            _apply(wanted, +1)
+        return
+    log.warning(f"[score_index] {sermon_id}: scoreIndex kept changing, histograms not updated")
+
+
+def remove(sermon_doc):
+    """Uncount a deleted sermon (its stored ``scoreIndex``)."""
+    if sermon_doc.get("scoreIndex"):
+        _apply(sermon_doc["scoreIndex"], -1)
+
+
+def safe_sync(sermon_container, sermon_id, source):
+    """``sync`` that logs instead of raising — the score write it follows already succeeded."""
+    try:
+        sync(sermon_container, sermon_id)
+    except Exception as e:
+        log.warning(f"[{source}] {sermon_id}: score index update failed: {e}")
+
+
+def _load(scope):
+    """(cumulative counts, histogram _etag) for ``scope``, cached; counts None if empty or unreadable.
+
+    cum[i] = sermons in bins < i. Every update touches the ``all`` histogram,
+    so when its _etag moves the other scopes' cached counts are dropped too —
+    everything served under one ``version`` comes from the same generation.
+    """
+    from azure.cosmos import exceptions
+    cached = _cache.get(scope)
+    if cached and cached[0] > time.monotonic():
+        return cached[1], cached[2]
+    doc_id = _doc_id(scope)
+    cum, etag = None, None
+    try:
+        doc = _container().read_item(doc_id, partition_key=doc_id)
+        etag = doc.get("_etag")
+        if doc.get("total", 0) > 0:
+            cum = [0] * (BINS + 1)
+            for i, n in enumerate(doc["counts"]):
+                cum[i + 1] = cum[i] + max(0, n)
+    except exceptions.CosmosResourceNotFoundError:
+        pass
+    except Exception as e:
+        # Percentiles decorate responses; an unreadable index never fails one
+        log.warning(f"[score_index] read failed for {scope}: {e}")
+        return None, None
+    if scope == "all" and cached and cached[2] != etag:
+        _cache.clear()
+    _cache[scope] = (time.monotonic() + CACHE_SECONDS, cum, etag)
+    return cum, etag
+
+
+def _cumulative(scope):
+    return _load(scope)[0]
+
+
+def version():
+    """Version of the whole index (the ``all`` histogram's _etag), "" if there is none.
+
+    Responses carrying percentiles fold this into their ETag, so a moved
+    distribution invalidates them even when the sermon itself didn't change.
+    """
+    return _load("all")[1] or ""
+
+
+def percentile(psr, scope="all"):
+    """Share of ``scope``'s sermons scoring below ``psr`` (ties count half), 0-100; None if unknown."""
+    if psr is None:
+        return None
+    cum = _cumulative(scope)
+    if not cum or not cum[BINS]:
+        return None
+    b = _bin(psr)
+    below, equal = cum[b], cum[b + 1] - cum[b]
+    return round(100 * (below + equal / 2) / cum[BINS])
+
+
+def percentiles(doc):
+    """{"percentile", "typePercentile", "churchPercentile"} for a sermon doc (values may be None)."""
+    psr = doc.get("compositePsr") if doc.get("status") == "complete" else None
+    return {
+        "percentile": percentile(psr),
+        "typePercentile": percentile(psr, f"type:{doc['sermonType']}") if doc.get("sermonType") else None,
+        "churchPercentile": (percentile(psr, f"church:{doc['churchId']}")
+                             if doc.get("churchId") and doc["churchId"] != UNASSIGNED_CHURCH_ID else None),
+    }
+
+
+def rebuild(sermon_container):
+    """Recount every histogram from the sermons and reset their ``scoreIndex``. Returns the number of scopes."""
+    from store import patch_fields
+    histograms = {}
+    rows = sermon_container.query_items(
+        "SELECT c.id, c.status, c.compositePsr, c.sermonType, c.churchId, c.scoreIndex FROM c"
+        " WHERE c.status = 'complete' OR IS_DEFINED(c.scoreIndex)",
+        enable_cross_partition_query=True,
+    )
+    for row in rows:
+        wanted = _entry(row)
+        if wanted:
+            for scope in scopes(wanted):
+                histograms.setdefault(scope, [0] * BINS)[_bin(wanted["psr"])] += 1
+        if row.get("scoreIndex") != wanted:
+            patch_fields(sermon_container, row["id"], {"scoreIndex": wanted})
+
+    container = _container()
+    existing = {d["id"] for d in container.query_items(
+        "SELECT c.id FROM c WHERE c.type = 'score-histogram'", enable_cross_partition_query=True)}
+    for scope, counts in histograms.items():
+        container.upsert_item({"id": _doc_id(scope), "type": "score-histogram", "scope": scope,
+                               "counts": counts, "total": sum(counts)})
+    for stale in existing - {_doc_id(s) for s in histograms}:
+        container.delete_item(stale, partition_key=stale)
+    _cache.clear()
+    log.info(f"[score_index] rebuilt {len(histograms)} histogram(s)")
+    return len(histograms)
@@ -0,0 +1,324 @@
+"""Corpus-wide scoring "what-if" simulator.
+
+Re-runs the scoring tail — ``normalize_scores`` → ``consistency_check`` →
+``compute_composite`` (schema) — over every complete sermon's stored
+``rawScores``, classification and enrichment counts, under a proposed
+config, with no LLM calls. The corpus is loaded once into numpy arrays
+and each stage is a handful of array operations, so 100k sermons
+simulate in milliseconds.
+
+A config is a partial override of the live constants:
+
+    {"weights": {"biblicalAccuracy": 30, "delivery": 5},      # CATEGORY_WEIGHTS (must sum to 100)
+     "normAdjustments": {"topical": {"passageFocus": 6}},     # NORM_ADJUSTMENTS, per type
+     "confidenceTiers": [[90, 1.0], [75, 0.5]],               # NORM_CONFIDENCE_TIERS
+     "textOnlyCaps": {"delivery": 70},                        # TEXT_ONLY_CAPS
+     "gravity": {"threshold": 45, "margin": 5},               # BIBLICAL_GRAVITY
+     "consistency": {"highScore": 85}}                        # CONSISTENCY_RULES
+
+``simulate`` under the default config reproduces the scalar functions
+(covered by tests). Used by POST /api/admin/scoring/simulate and, offline:
+
+    python scoring_sim.py proposal.json --corpus sermons.ndjson
+    python scoring_sim.py proposal.json --synthetic 100000
+"""
+
+import copy
+import json
+
+import numpy as np
+
+from schema import (
+    CATEGORY_WEIGHTS, NORM_ADJUSTMENTS, NORM_CONFIDENCE_TIERS, TEXT_ONLY_CAPS,
+    BIBLICAL_KEYS, BIBLICAL_GRAVITY, CONSISTENCY_RULES, scored_with_audio,
+)
+
+CATEGORIES = list(CATEGORY_WEIGHTS)
+_COL = {k: i for i, k in enumerate(CATEGORIES)}
+CONFIG_KEYS = {"weights", "normAdjustments", "confidenceTiers", "textOnlyCaps", "gravity", "consistency"}
+HISTOGRAM_BINS = list(range(0, 101, 10))
+DEFAULT_TOP = 20
+
+CORPUS_QUERY = (
+    "SELECT c.id, c.title, c.rawScores, c.sermonType, c.classificationConfidence, c.inputType,"
+    " c.audioAvailable, c.audioMetrics != null AS hasAudio, (c.previousScoresCount ?? 0) > 0 AS rescored,"
+    " c.compositePsr,"
+    " c.enrichment.biblicalLanguages.count AS languageRefs, c.enrichment.churchHistory.count AS historyRefs,"
+    " c.enrichment.illustrations.total AS illustrations,"
+    " ARRAY_LENGTH(c.enrichment.illustrations.byType.personalStory) AS personalStories,"
+    " IS_DEFINED(c.enrichment) AND NOT IS_NULL(c.enrichment) AS hasEnrichment"
+    " FROM c WHERE c.status = 'complete' AND IS_DEFINED(c.rawScores)"
+)
+
+
+def default_config():
+    return {
+        "weights": dict(CATEGORY_WEIGHTS),
+        "normAdjustments": copy.deepcopy(NORM_ADJUSTMENTS),
+        "confidenceTiers": [[t[0], t[1]] for t in NORM_CONFIDENCE_TIERS],
+        "textOnlyCaps": dict(TEXT_ONLY_CAPS),
+        "gravity": dict(BIBLICAL_GRAVITY),
+        "consistency": dict(CONSISTENCY_RULES),
+    }
+
+
+def resolve_config(proposal=None):
+    """Live config with ``proposal`` merged over it. Raises ValueError on unknown keys or bad weights."""
+    config = default_config()
+    proposal = proposal or {}
+    unknown = set(proposal) - CONFIG_KEYS
+    if unknown:
+        raise ValueError(f"Unknown config keys: {', '.join(sorted(unknown))}")
+    for section in ("weights", "textOnlyCaps", "gravity", "consistency"):
+        override = proposal.get(section) or {}
+        allowed = CATEGORIES if section in ("weights", "textOnlyCaps") else config[section]
+        bad = set(override) - set(allowed)
+        if bad:
+            raise ValueError(f"Unknown {section} keys: {', '.join(sorted(bad))}")
+        config[section].update(override)
+    for sermon_type, adjustments in (proposal.get("normAdjustments") or {}).items():
+        bad = set(adjustments) - set(CATEGORIES)
+        if bad:
+            raise ValueError(f"Unknown normAdjustments keys: {', '.join(sorted(bad))}")
+        config["normAdjustments"].setdefault(sermon_type, {}).update(adjustments)
+    if "confidenceTiers" in proposal:
+        config["confidenceTiers"] = sorted(([float(t[0]), float(t[1])] for t in proposal["confidenceTiers"]),
+                                           reverse=True)
+    if sum(config["weights"].values()) != 100:
+        raise ValueError(f"weights must sum to 100 (got {sum(config['weights'].values())})")
+    return config
+
+
+class Corpus:
+    """Column arrays for the scoring inputs of N sermons."""
+
+    def __init__(self, rows):
+        n = len(rows)
+        self.ids = [r["id"] for r in rows]
+        self.titles = [r.get("title") for r in rows]
+        self.raw = np.zeros((n, len(CATEGORIES)))
+        for i, r in enumerate(rows):
+            scores = r.get("rawScores") or {}
+            self.raw[i] = [scores.get(k) or 0 for k in CATEGORIES]
+        self.type_names, self.types = np.unique([r.get("sermonType") or "" for r in rows], return_inverse=True)
+        self.confidence = np.array([r.get("classificationConfidence") or 0 for r in rows], dtype=float)
+        self.audio = np.array([scored_with_audio(r.get("audioAvailable"), r.get("inputType"), r.get("hasAudio"),
+                                                 r.get("rescored")) for r in rows], dtype=bool)
+        self.has_enrichment = np.array([bool(r.get("hasEnrichment")) for r in rows], dtype=bool)
+        self.language_refs = np.array([r.get("languageRefs") or 0 for r in rows], dtype=float)
+        self.history_refs = np.array([r.get("historyRefs") or 0 for r in rows], dtype=float)
+        self.illustrations = np.array([r.get("illustrations") or 0 for r in rows], dtype=float)
+        self.personal_stories = np.array([r.get("personalStories") or 0 for r in rows], dtype=float)
+        self.stored = np.array([r["compositePsr"] if r.get("compositePsr") is not None else np.nan for r in rows])
+
+    def __len__(self):
+        return len(self.ids)
+
+
+def load_corpus(container):
+    """Every complete sermon with raw scores, as a Corpus (one cross-partition query)."""
+    return Corpus(list(container.query_items(CORPUS_QUERY, enable_cross_partition_query=True)))
+
+
+def _normalize(corpus, config):
+    multiplier = np.zeros(len(corpus))
+    assigned = np.zeros(len(corpus), dtype=bool)
+    for min_confidence, tier_multiplier in config["confidenceTiers"]:
+        hit = ~assigned & (corpus.confidence >= min_confidence)
+        multiplier[hit] = tier_multiplier
+        assigned |= hit
+
+    # One adjustment row per sermon type in the corpus, gathered by type code
+    by_type = np.array([[config["normAdjustments"].get(t, {}).get(k, 0) for k in CATEGORIES]
+                        for t in corpus.type_names], dtype=float).reshape(-1, len(CATEGORIES))
+    scores = np.minimum(100, np.round(corpus.raw + by_type[corpus.types] * multiplier[:, None]))
+
+    text_only = ~corpus.audio
+    for key, cap in config["textOnlyCaps"].items():
+        col = _COL[key]
+        scores[text_only, col] = np.minimum(scores[text_only, col], cap)
+    return scores
+
+
+def _consistency(scores, corpus, config):
+    rules = config["consistency"]
+    adjusted = scores.copy()
+    tw, eng, app = (scores[:, _COL[k]] for k in ("timeInTheWord", "engagement", "application"))
+    on = corpus.has_enrichment
+    high = rules["highScore"]
+
+    shallow = on & (tw >= high) & (corpus.language_refs == 0) & (corpus.history_refs == 0)
+    adjusted[shallow, _COL["timeInTheWord"]] = np.maximum(0, tw[shallow] - rules["twPenalty"])
+    flat = on & (eng >= high) & (corpus.illustrations == 0)
+    adjusted[flat, _COL["engagement"]] = np.maximum(0, eng[flat] - rules["engagementPenalty"])
+    deep = on & (tw >= rules["moderateTwFloor"]) & (tw < high) & (corpus.language_refs >= rules["minLanguageRefs"])
+    adjusted[deep, _COL["timeInTheWord"]] = np.minimum(100, tw[deep] + rules["twBonus"])
+    ungrounded = on & (app >= high) & (corpus.personal_stories == 0) & (corpus.illustrations <= rules["maxIllustrations"])
+    adjusted[ungrounded, _COL["application"]] = np.maximum(0, app[ungrounded] - rules["applicationPenalty"])
+    return adjusted
+
+
+def _round1(values):
+    """``round(v, 1)`` elementwise. np.round scales by 10 first, which can turn x.x4999… into a tie and
+    round it the other way, so values near a tie go through Python's correctly rounded ``round``."""
+    scaled = values * 10
+    rounded = np.round(scaled) / 10
+    near_tie = np.abs(scaled - np.floor(scaled) - 0.5) < 1e-6
+    if near_tie.any():
+        # Scores are integers, so the ties repeat: round each distinct value once
+        distinct, index = np.unique(values[near_tie], return_inverse=True)
+        rounded[near_tie] = np.array([round(v, 1) for v in distinct.tolist()])[index]
+    return rounded
+
+
+def _composite(scores, config):
+    # Summed column by column, in schema order, so the floats (and their rounding) match compute_composite
+    weights = config["weights"]
+    raw = np.zeros(len(scores))
+    for key in CATEGORIES:
+        raw = raw + scores[:, _COL[key]] * weights[key] / 100
+    raw = _round1(raw)
+    biblical_sum = np.zeros(len(scores))
+    for key in BIBLICAL_KEYS:
+        biblical_sum = biblical_sum + scores[:, _COL[key]] * weights[key]
+    biblical_avg = biblical_sum / sum(weights[k] for k in BIBLICAL_KEYS)
+    gravity = config["gravity"]
+    capped = _round1(np.minimum(raw, biblical_avg + gravity["margin"]))
+    return np.where(biblical_avg < gravity["threshold"], capped, raw)
+
+
+def simulate(corpus, config):
+    """Composite PSR of every sermon under ``config`` (a resolved config)."""
+    if not len(corpus):
+        return np.zeros(0)
+    scores = _normalize(corpus, config)
+    scores = _consistency(scores, corpus, config)
+    return _composite(scores, config)
+
+
+def _ranks(composites):
+    """1 = highest composite; ties keep corpus order."""
+    order = np.argsort(-composites, kind="stable")
+    ranks = np.empty(len(composites), dtype=int)
+    ranks[order] = np.arange(1, len(composites) + 1)
+    return ranks
+
+
+def _distribution(composites):
+    if not len(composites):
+        return {"count": 0}
+    p10, p25, p50, p75, p90 = np.percentile(composites, [10, 25, 50, 75, 90])
+    counts, _ = np.histogram(composites, bins=HISTOGRAM_BINS)
+    return {
+        "count": int(len(composites)),
+        "mean": round(float(composites.mean()), 2),
+        "std": round(float(composites.std()), 2),
+        "min": float(composites.min()), "max": float(composites.max()),
+        "p10": round(float(p10), 1), "p25": round(float(p25), 1), "median": round(float(p50), 1),
+        "p75": round(float(p75), 1), "p90": round(float(p90), 1),
+        "histogram": [{"from": lo, "to": hi, "count": int(c)}
+                      for lo, hi, c in zip(HISTOGRAM_BINS, HISTOGRAM_BINS[1:], counts)],
+    }
+
+
+def compare(corpus, proposal=None, top=DEFAULT_TOP):
+    """Current vs proposed scoring over ``corpus``: distributions, rank changes and the biggest movers."""
+    current = simulate(corpus, resolve_config())
+    proposed = simulate(corpus, resolve_config(proposal))
+    delta = proposed - current
+    rank_before, rank_after = _ranks(current), _ranks(proposed)
+    rank_shift = rank_before - rank_after  # positive = moved up
+
+    movers = np.argsort(-np.abs(delta), kind="stable")[:top]
+    movers = movers[delta[movers] != 0]
+    stale = ~np.isnan(corpus.stored) & (np.abs(corpus.stored - current) > 0.05)
+    return {
+        "sermons": len(corpus),
+        "current": _distribution(current),
+        "proposed": _distribution(proposed),
+        "changed": int(np.count_nonzero(delta)),
+        "meanDelta": round(float(delta.mean()), 2) if len(corpus) else 0.0,
+        "rankChanges": {
+            "moved": int(np.count_nonzero(rank_shift)),
+            "meanAbsShift": round(float(np.abs(rank_shift).mean()), 1) if len(corpus) else 0.0,
+            "maxShift": int(np.abs(rank_shift).max()) if len(corpus) else 0,
+        },
+        "topMovers": [{
+            "id": corpus.ids[i], "title": corpus.titles[i],
+            "current": float(current[i]), "proposed": float(proposed[i]), "delta": round(float(delta[i]), 1),
+            "rankBefore": int(rank_before[i]), "rankAfter": int(rank_after[i]),
+        } for i in movers],
+        # Sermons whose stored compositePsr doesn't match the live config (scored by an older pipeline)
+        "storedMismatch": int(np.count_nonzero(stale)),
+    }
+
+
+def synthetic_corpus(n, seed=0):
+    """Random corpus of ``n`` sermons (offline benchmarking)."""
+    rng = np.random.default_rng(seed)
+    types = ["expository", "topical", "survey"]
+    raw = rng.integers(20, 100, size=(n, len(CATEGORIES)))
+    rows = [{
+        "id": f"s{i}", "title": f"Sermon {i}",
+        "rawScores": dict(zip(CATEGORIES, raw[i].tolist())),
+        "sermonType": types[i % 3], "classificationConfidence": int(rng.integers(60, 100)),
+        "hasAudio": bool(i % 4), "hasEnrichment": bool(i % 5),
+        "languageRefs": int(rng.integers(0, 5)), "historyRefs": int(rng.integers(0, 3)),
+        "illustrations": int(rng.integers(0, 6)), "personalStories": int(rng.integers(0, 3)),
+    } for i in range(n)]
+    return Corpus(rows)
+
+
+def main(argv=None):
+    import argparse
+    import time
+
+    parser = argparse.ArgumentParser(description="Simulate a scoring config over the sermon corpus (no LLM calls).")
+    parser.add_argument("config", nargs="?", help="JSON file with the proposed config (default: live config)")
+    source = parser.add_mutually_exclusive_group()
+    source.add_argument("--corpus", help="NDJSON export of sermon docs (default: query Cosmos)")
+    source.add_argument("--synthetic", type=int, help="Use N random sermons instead")
+    parser.add_argument("--top", type=int, default=DEFAULT_TOP)
+    args = parser.parse_args(argv)
+
+    proposal = None
+    if args.config:
+        with open(args.config) as f:
+            proposal = json.load(f)
+    if args.synthetic:
+        corpus = synthetic_corpus(args.synthetic)
+    elif args.corpus:
+        with open(args.corpus) as f:
+            corpus = Corpus([_export_row(json.loads(line)) for line in f if line.strip()])
+    else:
+        import os
+        from azure.cosmos import CosmosClient
+        cosmos = CosmosClient.from_connection_string(os.environ["COSMOS_CONNECTION_STRING"])
+        corpus = load_corpus(cosmos.get_database_client("psr").get_container_client("sermons"))
+
+    started = time.perf_counter()
+    report = compare(corpus, proposal, top=args.top)
+    report["elapsedMs"] = round((time.perf_counter() - started) * 1000, 1)
+    print(json.dumps(report, indent=2))
+
+
+def _export_row(doc):
+    """CORPUS_QUERY's projection of a full sermon doc."""
+    enrichment = doc.get("enrichment") or {}
+    illustrations = enrichment.get("illustrations") or {}
+    return {
+        "id": doc["id"], "title": doc.get("title"), "rawScores": doc.get("rawScores"),
+        "sermonType": doc.get("sermonType"), "classificationConfidence": doc.get("classificationConfidence"),
+        "inputType": doc.get("inputType"), "audioAvailable": doc.get("audioAvailable"),
+        "hasAudio": doc.get("audioMetrics") is not None,
+        "rescored": bool(doc.get("previousScoresCount") or doc.get("previousScores")),
+        "compositePsr": doc.get("compositePsr"), "hasEnrichment": bool(doc.get("enrichment")),
+        "languageRefs": (enrichment.get("biblicalLanguages") or {}).get("count"),
+        "historyRefs": (enrichment.get("churchHistory") or {}).get("count"),
+        "illustrations": illustrations.get("total"),
+        "personalStories": len((illustrations.get("byType") or {}).get("personalStory") or []),
+    }
+
+
+if __name__ == "__main__":
+    main()
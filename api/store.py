@@ -0,0 +1,233 @@
+"""Sermon storage helpers — large text artifacts live in Blob Storage, not the Cosmos doc.
+
+Transcript text + segments, cached translations and the rescore history
+grow without bound and every read-modify-write of the sermon document
+pays RU for them (and they push long sermons toward Cosmos' 2 MB item
+limit). They are stored as gzip JSON blobs in the ``sermon-artifacts``
+container and referenced from the document:
+
+    transcript:             {"wordCount": N, "segmentCount": K, "artifact": "<id>/transcript.json.gz"}
+    translationArtifacts:   {"es": "<id>/translations/es.json.gz", ...}
+    previousScoresArtifact: "<id>/previous-scores.json.gz"
+
+Readers go through the ``load_*`` helpers, which fall back to the legacy
+inline fields so documents not yet migrated keep working.
+
+Metadata writes use ``patch_fields`` — Cosmos partial-document patch, so
+an update sends only the changed fields and needs no prior read.
+"""
+
+import gzip
+import json
+import os
+
+from log import log
+
+ARTIFACT_CONTAINER = "sermon-artifacts"
+PATCH_MAX_OPS = 10  # Cosmos limit per patch request
+
+
+def _artifact_blob(name):
+    from azure.storage.blob import BlobClient
+    return BlobClient.from_connection_string(os.environ["STORAGE_CONNECTION_STRING"], ARTIFACT_CONTAINER, name)
+
+
+def put_artifact(name, data):
+    """Write ``data`` as a gzip JSON blob (overwriting). Returns the blob name."""
+    from azure.storage.blob import ContentSettings
+    payload = gzip.compress(json.dumps(data, separators=(",", ":")).encode(), compresslevel=6)
+    _artifact_blob(name).upload_blob(
+        payload, overwrite=True,
+        content_settings=ContentSettings(content_type="application/json", content_encoding="gzip"),
+    )
+    return name
+
+
+def get_artifact(name):
+    """Read a gzip JSON artifact blob."""
+    # The blob carries Content-Encoding: gzip; keep the SDK from decoding it before we do
+    return json.loads(gzip.decompress(_artifact_blob(name).download_blob(decompress=False).readall()))
+
+
+def delete_artifacts(sermon_id):
+    """Remove every artifact blob for a sermon (best effort)."""
+    from azure.storage.blob import ContainerClient
+    container = ContainerClient.from_connection_string(os.environ["STORAGE_CONNECTION_STRING"], ARTIFACT_CONTAINER)
+    for blob in container.list_blobs(name_starts_with=f"{sermon_id}/"):
+        container.delete_blob(blob.name)
+
+
+# ── Readers (artifact first, legacy inline fallback) ──
+
+def load_transcript(doc):
+    """Return {"fullText", "segments", "wordCount"} for a sermon doc, wherever it is stored."""
+    transcript = doc.get("transcript") or {}
+    if "fullText" in transcript:
+        full_text = transcript.get("fullText") or ""
+        return {
+            "fullText": full_text,
+            "segments": transcript.get("segments"),
+            "wordCount": transcript.get("wordCount", len(full_text.split())),
+        }
+    if transcript.get("artifact"):
+        data = get_artifact(transcript["artifact"])
+        return {
+            "fullText": data.get("fullText") or "",
+            "segments": data.get("segments"),
+            "wordCount": transcript.get("wordCount", len((data.get("fullText") or "").split())),
+        }
+    return {"fullText": "", "segments": None, "wordCount": 0}
+
+
+def load_translation(doc, language):
+    """Cached translation text for ``language``, or None."""
+    inline = (doc.get("translations") or {}).get(language)
+    if inline:
+        return inline
+    name = (doc.get("translationArtifacts") or {}).get(language)
+    if name:
+        return get_artifact(name).get("text")
+    return None
+
+
+def load_translations(doc):
+    """All cached translations as {language: text}."""
+    result = dict(doc.get("translations") or {})
+    for language, name in (doc.get("translationArtifacts") or {}).items():
+        if language not in result:
+            try:
+                result[language] = get_artifact(name).get("text")
+            except Exception as e:
+                log.warning(f"[store] {doc.get('id')}: translation artifact {name} unreadable: {e}")
+    return result
+
+
+def load_previous_scores(doc):
+    """Rescore history list (oldest first)."""
+    if doc.get("previousScores"):
+        return list(doc["previousScores"])
+    if doc.get("previousScoresArtifact"):
+        return get_artifact(doc["previousScoresArtifact"])
+    return []
+
+
+# ── Writers ──
+
+def save_translation(sermon_id, language, text):
+    """Store a translation artifact. Returns the blob name to record in translationArtifacts."""
+    return put_artifact(f"{sermon_id}/translations/{language}.json.gz", {"language": language, "text": text})
+
+
+def offload_updates(sermon_id, updates):
+    """Move large fields in a sermon ``updates`` dict to artifacts; return the slimmed updates.
+
+    Inline ``transcript`` becomes a stub with its artifact name and counts,
+    ``previousScores`` becomes ``previousScoresArtifact`` (the inline field is
+    cleared), and an inline ``translations`` map becomes ``translationArtifacts``.
+    That map only holds the languages in ``updates`` (plus any
+    ``translationArtifacts`` passed in) — write it with
+    ``set_translation_artifacts`` unless replacing the whole doc.
+    """
+    updates = dict(updates)
+
+    transcript = updates.get("transcript")
+    if transcript and "fullText" in transcript:
+        full_text = transcript.get("fullText") or ""
+        segments = transcript.get("segments") or []
+        name = put_artifact(f"{sermon_id}/transcript.json.gz", {"fullText": full_text, "segments": segments})
+        updates["transcript"] = {
+            "wordCount": transcript.get("wordCount", len(full_text.split())),
+            "segmentCount": len(segments),
+            "artifact": name,
+        }
+
+    if updates.get("previousScores"):
+        history = updates["previousScores"]
+        updates["previousScoresArtifact"] = put_artifact(f"{sermon_id}/previous-scores.json.gz", history)
+        updates["previousScoresCount"] = len(history)
+        updates["previousScores"] = None
+
+    if updates.get("translations"):
+        artifacts = dict(updates.get("translationArtifacts") or {})
+        for language, text in updates["translations"].items():
+            artifacts[language] = save_translation(sermon_id, language, text)
+        updates["translationArtifacts"] = artifacts
+        updates["translations"] = None
+
+    return updates
+
+
+def set_translation_artifacts(container, sermon_id, artifacts):
+    """Record ``{language: artifact name}`` on a sermon doc, keeping its other languages.
+
+    Each language is patched at its own path, so two translations of one
+    sermon finishing together can't overwrite each other. A doc without the
+    map yet gets it created — conditionally, in case another writer just did.
+    """
+    from azure.cosmos import exceptions
+    ops = [{"op": "set", "path": f"/translationArtifacts{_patch_path(language)}", "value": name}
+           for language, name in artifacts.items()]
+    if not ops:
+        return
+    try:
+        container.patch_item(sermon_id, partition_key=sermon_id, patch_operations=ops, no_response=True)
+        return
+    except exceptions.CosmosHttpResponseError as e:
+        if e.status_code != 400:  # 400: no translationArtifacts map to set a language in
+            raise
+    try:
+        patch_fields(container, sermon_id, {"translationArtifacts": dict(artifacts)},
+                     filter_predicate="FROM c WHERE NOT IS_DEFINED(c.translationArtifacts) OR IS_NULL(c.translationArtifacts)")
+    except exceptions.CosmosAccessConditionFailedError:
+        container.patch_item(sermon_id, partition_key=sermon_id, patch_operations=ops, no_response=True)
+
+
+def needs_migration(doc):
+    """True if the doc still carries large fields inline."""
+    return bool(
+        "fullText" in (doc.get("transcript") or {})
+        or doc.get("translations")
+        or doc.get("previousScores")
+    )
+
+
+# ── Cosmos partial updates ──
+
+def _patch_path(field):
+    return "/" + field.replace("~", "~0").replace("/", "~1")
+
+
+def patch_fields(container, item_id, fields=None, incr=None, filter_predicate=None):
+    """Patch top-level ``fields`` (set) and ``incr`` counters on a doc partitioned by /id.
+
+    No read, no full-document replace. ``filter_predicate`` (e.g.
+    ``"FROM c WHERE c.status = 'complete'"``) makes the write conditional;
+    a miss raises CosmosAccessConditionFailedError (412), a missing doc
+    CosmosResourceNotFoundError. Fields to clear are set to None — a patch
+    ``remove`` on an absent path fails. More than PATCH_MAX_OPS operations
+    go out as one transactional batch so the update stays atomic.
+    """
+    ops = [{"op": "set", "path": _patch_path(k), "value": v} for k, v in (fields or {}).items()]
+    ops += [{"op": "incr", "path": _patch_path(k), "value": v} for k, v in (incr or {}).items()]
+    if not ops:
+        return
+    cond = {"filter_predicate": filter_predicate} if filter_predicate else {}
+
+    if len(ops) <= PATCH_MAX_OPS:
+        container.patch_item(item_id, partition_key=item_id, patch_operations=ops, no_response=True, **cond)
+        return
+
+    from azure.cosmos import exceptions
+    batch = []
+    for i in range(0, len(ops), PATCH_MAX_OPS):
+        # The predicate guards the first chunk only — later chunks may change the fields it tests
+        batch.append(("patch", (item_id, ops[i:i + PATCH_MAX_OPS]), cond if i == 0 else {}))
+    try:
+        container.execute_item_batch(batch, partition_key=item_id)
+    except exceptions.CosmosBatchOperationError as e:
+        status = (e.operation_responses[e.error_index] or {}).get("statusCode")
+        if status == 404:
+            raise exceptions.CosmosResourceNotFoundError(status_code=404, message=f"{item_id} not found") from e
+        if status == 412:
+            raise exceptions.CosmosAccessConditionFailedError(status_code=412, message=f"{item_id}: filter not met") from e
+        raise
@@ -332,10 +332,220 @@ class TestUpdateSermon:
         mock_fn.return_value = container
         result = activities.update_sermon({"sermonId": "s1", "updates": {"status": "complete", "compositePsr": 85.0}})
         assert result == {"ok": True}
-        container.read_item.assert_called_once_with("s1", partition_key="s1")
-        upserted = container.upsert_item.call_args[0][0]
-        assert upserted["status"] == "complete"
-        assert upserted["compositePsr"] == 85.0
+        container.read_item.assert_not_called()
+        container.upsert_item.assert_not_called()
+        kwargs = container.patch_item.call_args[1]
+        assert kwargs["partition_key"] == "s1"
+        assert kwargs["patch_operations"] == [
+            {"op": "set", "path": "/status", "value": "complete"},
+            {"op": "set", "path": "/compositePsr", "value": 85.0},
+        ]
+
+    @patch("activities.misc._cosmos_client")
+    def test_not_found(self, mock_fn):
+        from azure.cosmos import exceptions
+        container = MagicMock()
+        container.patch_item.side_effect = exceptions.CosmosResourceNotFoundError(status_code=404, message="gone")
+        mock_fn.return_value = container
+        result = activities.update_sermon({"sermonId": "s1", "updates": {"status": "failed"}})
+        assert result == {"ok": False, "error": "not_found"}
+
+    @patch("activities.misc._cosmos_client")
+    def test_large_update_is_one_batch(self, mock_fn):
+        container = MagicMock()
+        mock_fn.return_value = container
+        updates = {f"field{i}": i for i in range(23)}
+        activities.update_sermon({"sermonId": "s1", "updates": updates})
+        container.patch_item.assert_not_called()
+        batch = container.execute_item_batch.call_args[0][0]
+        assert [len(op[1][1]) for op in batch] == [10, 10, 3]
+        assert all(op[0] == "patch" and op[1][0] == "s1" for op in batch)
+
+    @patch("store.put_artifact", side_effect=lambda name, data: name)
+    @patch("activities.misc._cosmos_client")
+    def test_offloads_transcript(self, mock_fn, mock_put):
+        container = MagicMock()
+        mock_fn.return_value = container
+        transcript = {"fullText": "in the beginning", "segments": [{"text": "in the beginning"}], "wordCount": 3}
+        activities.update_sermon({"sermonId": "s1", "updates": {"transcript": transcript}})
+        mock_put.assert_called_once_with("s1/transcript.json.gz", {"fullText": "in the beginning",
+                                                                    "segments": [{"text": "in the beginning"}]})
+        ops = container.patch_item.call_args[1]["patch_operations"]
+        assert ops == [{"op": "set", "path": "/transcript",
+                        "value": {"wordCount": 3, "segmentCount": 1, "artifact": "s1/transcript.json.gz"}}]
+
+    @patch("store.put_artifact", side_effect=lambda name, data: name)
+    @patch("activities.misc._cosmos_client")
+    def test_translations_keep_other_languages(self, mock_fn, mock_put):
+        container = MagicMock()
+        mock_fn.return_value = container
+        activities.update_sermon({"sermonId": "s1", "updates": {"translations": {"es": "hola"}}})
+        ops = [op for c in container.patch_item.call_args_list for op in c[1]["patch_operations"]]
+        assert {"op": "set", "path": "/translationArtifacts/es", "value": "s1/translations/es.json.gz"} in ops
+        assert not any(op["path"] == "/translationArtifacts" for op in ops)
+
+
+# ── ensure_church / pastor index ──
+
+class TestEnsureChurch:
+    def _run(self, pastor, index_doc=None, llm=None):
+        import pastor_index
+        from azure.cosmos import CosmosClient, exceptions
+        pastor_index._cache.clear()
+        control, db = MagicMock(), MagicMock()
+        if index_doc is None:
+            control.read_item.side_effect = exceptions.CosmosResourceNotFoundError(status_code=404, message="x")
+        else:
+            control.read_item.return_value = index_doc
+        churches = db.create_container_if_not_exists.return_value
+        churches.query_items.return_value = []
+        cosmos = MagicMock()
+        cosmos.get_database_client.return_value = db
+        client = _mock_openai_client(llm or {"name": None, "confidence": "low"})
+        with patch("admission._control_container", return_value=control), \
+             patch.object(CosmosClient, "from_connection_string", return_value=cosmos), \
+             patch("activities.church._openai_client", return_value=client):
+            result = activities.ensure_church({"pastor": pastor, "sermonId": "s1"})
+        return result, control, churches, client
+
+    def test_indexed_pastor_is_one_point_read(self):
+        result, control, churches, client = self._run("Pastor John Smith", {"churchId": "grace", "church": "Grace"})
+        assert result == {"ok": True, "church": "Grace", "created": False, "churchId": "grace"}
+        assert control.read_item.call_count == 1
+        churches.query_items.assert_not_called()
+        client.chat.completions.create.assert_not_called()
+
+    def test_negative_entry_skips_llm(self):
+        result, _, churches, client = self._run("Unknown Preacher", {"churchId": None})
+        assert result["church"] is None
+        churches.query_items.assert_not_called()
+        client.chat.completions.create.assert_not_called()
+
+    def test_low_confidence_lookup_is_negatively_cached(self):
+        import pastor_index
+        result, control, _, client = self._run("Unknown Preacher")
+        assert result["church"] is None
+        client.chat.completions.create.assert_called_once()
+        indexed = control.upsert_item.call_args[0][0]
+        assert indexed["churchId"] is None and indexed["ttl"] == pastor_index.NEGATIVE_TTL_SECONDS
+        assert pastor_index.lookup("unknown  preacher") == {"churchId": None, "church": None}
+
+    def test_created_church_is_indexed(self):
+        result, control, churches, _ = self._run("Jane Doe", llm={"name": "Hope Church", "confidence": "high"})
+        assert result == {"ok": True, "church": "Hope Church", "created": True, "churchId": "hope-church"}
+        indexed = control.upsert_item.call_args[0][0]
+        assert indexed["churchId"] == "hope-church" and "ttl" not in indexed
+
+    def test_normalize_name(self):
+        from pastor_index import normalize_name
+        assert normalize_name("Rev. Dr.  José  O'Neil") == normalize_name("jose o neil") == "jose o neil"
+
+
+# ── sermon artifacts (store) ──
+
+class TestStore:
+    def _blob(self):
+        """BlobClient stand-in that keeps uploaded bytes in memory.
+
+        Like the SDK, downloads undo a gzip Content-Encoding unless called with decompress=False.
+        """
+        import gzip
+        blobs, encodings = {}, {}
+
+        def _upload(name, data, content_settings=None, **kw):
+            blobs[name] = data
+            encodings[name] = getattr(content_settings, "content_encoding", None)
+
+        def _download(name, decompress=True, **kw):
+            data = blobs[name]
+            downloader = MagicMock()
+            downloader.readall.return_value = (gzip.decompress(data) if decompress and encodings[name] == "gzip"
+                                               else data)
+            return downloader
+
+        def factory(conn, container, name):
+            client = MagicMock()
+            client.upload_blob.side_effect = lambda data, **kw: _upload(name, data, **kw)
+            client.download_blob.side_effect = lambda **kw: _download(name, **kw)
+            return client
+        return blobs, factory
+
+    def test_round_trip(self):
+        import store
+        blobs, factory = self._blob()
+        with patch("azure.storage.blob.BlobClient.from_connection_string", side_effect=factory):
+            store.put_artifact("s1/transcript.json.gz", {"fullText": "hello world"})
+            assert store.get_artifact("s1/transcript.json.gz") == {"fullText": "hello world"}
+        assert blobs["s1/transcript.json.gz"][:2] == b"\x1f\x8b"  # gzip magic
+
+    def test_offload_updates(self):
+        import store
+        blobs, factory = self._blob()
+        updates = {
+            "status": "complete",
+            "transcript": {"fullText": "a b c", "segments": [], "wordCount": 3},
+            "previousScores": [{"compositePsr": 70}],
+            "translations": {"es": "hola"},
+        }
+        with patch("azure.storage.blob.BlobClient.from_connection_string", side_effect=factory):
+            slim = store.offload_updates("s1", updates)
+            doc = {"id": "s1", **slim}
+            assert store.load_transcript(doc) == {"fullText": "a b c", "segments": [], "wordCount": 3}
+            assert store.load_previous_scores(doc) == [{"compositePsr": 70}]
+            assert store.load_translation(doc, "es") == "hola"
+        assert slim["status"] == "complete"
+        assert slim["previousScores"] is None and slim["previousScoresCount"] == 1
+        assert slim["translations"] is None
+        assert slim["translationArtifacts"] == {"es": "s1/translations/es.json.gz"}
+        assert set(blobs) == {"s1/transcript.json.gz", "s1/previous-scores.json.gz", "s1/translations/es.json.gz"}
+
+    def test_translation_artifact_patched_per_language(self):
+        import store
+        container = MagicMock()
+        store.set_translation_artifacts(container, "s1", {"es": "s1/translations/es.json.gz"})
+        assert container.patch_item.call_args[1]["patch_operations"] == [
+            {"op": "set", "path": "/translationArtifacts/es", "value": "s1/translations/es.json.gz"}]
+
+    def test_translation_artifacts_map_created_once(self):
+        import store
+        from azure.cosmos import exceptions
+        container = MagicMock()
+        container.patch_item.side_effect = [exceptions.CosmosHttpResponseError(status_code=400, message="no parent"),
+                                            exceptions.CosmosAccessConditionFailedError(status_code=412, message="x"),
+                                            None]
+        store.set_translation_artifacts(container, "s1", {"fr": "s1/translations/fr.json.gz"})
+        create = container.patch_item.call_args_list[1][1]
+        assert create["patch_operations"] == [{"op": "set", "path": "/translationArtifacts",
+                                               "value": {"fr": "s1/translations/fr.json.gz"}}]
+        assert "NOT IS_DEFINED(c.translationArtifacts)" in create["filter_predicate"]
+        # another writer created the map first — the language is set inside it
+        assert container.patch_item.call_args[1]["patch_operations"][0]["path"] == "/translationArtifacts/fr"
+
+    def test_legacy_inline_docs_still_read(self):
+        import store
+        doc = {"id": "s1", "transcript": {"fullText": "one two"}, "translations": {"es": "uno dos"},
+               "previousScores": [{"compositePsr": 60}]}
+        with patch("store.get_artifact") as mock_get:
+            assert store.load_transcript(doc)["wordCount"] == 2
+            assert store.load_translations(doc) == {"es": "uno dos"}
+            assert store.load_previous_scores(doc) == [{"compositePsr": 60}]
+            mock_get.assert_not_called()
+        assert store.needs_migration(doc)
+        assert not store.needs_migration({"id": "s2", "transcript": {"wordCount": 2, "artifact": "s2/t"}})
+
+    @patch("store.put_artifact", side_effect=lambda name, data: name)
+    @patch("activities.misc._cosmos_client")
+    def test_migrate_sermon_artifacts(self, mock_fn, mock_put):
+        container = MagicMock()
+        container.read_item.return_value = {"id": "s1", "_etag": "e1", "transcript": {"fullText": "x " * 500, "segments": []},
+                                            "translations": {"es": "y " * 500}}
+        mock_fn.return_value = container
+        result = activities.migrate_sermon_artifacts({"sermonId": "s1"})
+        assert result["migrated"] and result["bytesAfter"] < result["bytesBefore"]
+        replaced = container.replace_item.call_args[0][1]
+        assert "fullText" not in replaced["transcript"]
+        assert replaced["translations"] is None
+        assert container.replace_item.call_args[1]["etag"] == "e1"
 
 
 # ── Shared helpers ──
@@ -362,3 +572,212 @@ class TestSharedHelpers:
             mock_bc.assert_called_once_with(
                 os.environ["STORAGE_CONNECTION_STRING"], "sermon-audio", "test/sermon.mp3"
             )
+
+
+# ── no-LLM recompute ──
+
+class TestRecompute:
+    RAW = {"biblicalAccuracy": 85, "timeInTheWord": 82, "passageFocus": 60, "clarity": 75,
+           "engagement": 84, "application": 70, "delivery": 90, "emotionalRange": 88}
+
+    def _doc(self, **overrides):
+        from schema import normalize_scores, consistency_check, compute_composite
+        raw = {k: {"score": v, "reasoning": f"{k} why"} for k, v in self.RAW.items()}
+        enrichment = {"biblicalLanguages": {"count": 0}, "churchHistory": {"count": 0},
+                      "illustrations": {"total": 2, "byType": {"personalStory": ["a"]}}}
+        cats, applied = normalize_scores(raw, "topical", 95, audio_available=False)
+        cats, flags = consistency_check(cats, enrichment)
+        doc = {"id": "s1", "status": "complete", "rawScores": dict(self.RAW), "categories": cats,
+               "sermonType": "topical", "classificationConfidence": 95, "inputType": "text",
+               "audioMetrics": {"wpm": 130}, "enrichment": enrichment, "compositePsr": compute_composite(cats),
+               "consistencyFlags": flags, "normalizationApplied": applied}
+        doc.update(overrides)
+        return doc
+
+    def test_derive_reproduces_pipeline_scores(self):
+        import recompute
+        doc = self._doc()
+        derived = recompute.derive(doc)
+        assert derived["compositePsr"] == doc["compositePsr"]
+        assert derived["categories"] == doc["categories"]  # text upload: delivery/ER caps applied, reasoning kept
+        assert derived["consistencyFlags"] == doc["consistencyFlags"]
+        assert recompute.derive(self._doc(rawScores={"clarity": 50})) is None
+
+    def test_derive_uses_the_audio_flag_scores_were_made_with(self):
+        import recompute
+        from schema import TEXT_ONLY_CAPS
+        # an audio upload whose analysis failed was scored with audio — no text-only caps
+        doc = self._doc(inputType="audio", audioMetrics=None)
+        assert recompute.derive(doc)["categories"]["delivery"]["score"] > TEXT_ONLY_CAPS["delivery"]
+        assert recompute.derive({**doc, "audioAvailable": False})["categories"]["delivery"]["score"] == TEXT_ONLY_CAPS["delivery"]
+
+    def test_code_change_patches_derived_fields_conditionally(self):
+        import recompute
+        from schema import SCORING_CODE_VERSION
+        doc = self._doc()
+        container = MagicMock()
+        with patch.dict("schema.CONSISTENCY_RULES", {"twPenalty": 5}):
+            assert recompute.recompute_sermon(container, doc) == "updated"
+        kwargs = container.patch_item.call_args[1]
+        assert kwargs["filter_predicate"] == f"FROM c WHERE c.status = 'complete' AND c.compositePsr = {doc['compositePsr']}"
+        ops = {op["path"]: op["value"] for op in kwargs["patch_operations"]}
+        assert ops["/categories"]["timeInTheWord"]["score"] == doc["categories"]["timeInTheWord"]["score"] - 2
+        assert ops["/scoringCodeVersion"] == SCORING_CODE_VERSION
+
+    def test_unchanged_scores_only_stamp_version(self):
+        import recompute
+        from schema import SCORING_CODE_VERSION
+        container = MagicMock()
+        assert recompute.recompute_sermon(container, self._doc()) == "unchanged"
+        ops = container.patch_item.call_args[1]["patch_operations"]
+        assert ops == [{"op": "set", "path": "/scoringCodeVersion", "value": SCORING_CODE_VERSION}]
+        container.reset_mock()
+        assert recompute.recompute_sermon(container, self._doc(scoringCodeVersion=SCORING_CODE_VERSION)) == "unchanged"
+        container.patch_item.assert_not_called()
+
+    def test_batch_streams_page_and_returns_cursor(self):
+        import recompute
+        from azure.cosmos import exceptions
+        container = MagicMock()
+        container.query_items.return_value = iter([
+            self._doc(id="a", compositePsr=1.0), self._doc(id="b", rawScores=None), self._doc(id="c", compositePsr=2.0),
+        ])
+
+        def _patch(item_id, **kwargs):
+            if item_id == "c":
+                raise exceptions.CosmosAccessConditionFailedError(status_code=412, message="x")
+        container.patch_item.side_effect = _patch
+        with patch("score_index.safe_sync") as mock_sync:
+            result = recompute.recompute_batch(container, after="0", stale_only=True, limit=3)
+        mock_sync.assert_called_once_with(container, "a", "recompute")
+
+        assert result == {"updated": 1, "unchanged": 0, "skipped": 1, "conflict": 1, "error": 0,
+                          "processed": 3, "lastId": "c", "done": False}
+        query, kwargs = container.query_items.call_args[0][0], container.query_items.call_args[1]
+        assert query.startswith("SELECT TOP @n") and query.endswith("ORDER BY c.id") and "c.scoringCodeVersion != @v" in query
+        assert {"name": "@after", "value": "0"} in kwargs["parameters"]
+
+    def test_rescore_recompute_pass_makes_no_llm_calls(self):
+        container = MagicMock()
+        container.read_item.return_value = self._doc()
+        with patch("activities.rescore._cosmos_client", return_value=container), \
+             patch("activities.rescore.load_transcript") as mock_transcript, \
+             patch("activities.helpers._openai_client") as mock_llm:
+            result = activities.rescore_sermon({"sermonId": "s1", "passes": ["recompute"]})
+        assert result["passesRun"] == ["recompute"] and result["recompute"] == "unchanged"
+        mock_transcript.assert_not_called()
+        mock_llm.assert_not_called()
+
+
+# ── score index ──
+
+class TestScoreIndex:
+    @pytest.fixture(autouse=True)
+    def _clear_cache(self):
+        import score_index
+        score_index._cache.clear()
+        yield
+        score_index._cache.clear()
+
+    def _sermons(self, row):
+        container = MagicMock()
+        container.query_items.return_value = [row]
+        return container
+
+    def _incrs(self, control):
+        return sorted((c[0][0], c[1]["patch_operations"][0]["path"], c[1]["patch_operations"][0]["value"])
+                      for c in control.patch_item.call_args_list)
+
+    def test_sync_claims_marker_then_counts_each_scope(self):
+        import score_index
+        sermons = self._sermons({"status": "complete", "compositePsr": 80.0, "sermonType": "expository",
+                                 "churchId": "c1"})
+        control = MagicMock()
+        with patch("score_index._container", return_value=control):
+            score_index.sync(sermons, "s1")
+
+        kwargs = sermons.patch_item.call_args[1]
+        assert kwargs["filter_predicate"] == "FROM c WHERE NOT IS_DEFINED(c.scoreIndex) OR IS_NULL(c.scoreIndex)"
+        assert kwargs["patch_operations"][0]["value"] == {"psr": 80.0, "sermonType": "expository", "churchId": "c1"}
+        assert self._incrs(control) == [("scorehist-all", "/counts/800", 1), ("scorehist-church-c1", "/counts/800", 1),
+                                        ("scorehist-type-expository", "/counts/800", 1)]
+
+    def test_sync_moves_changed_score_and_skips_unchanged(self):
+        import score_index
+        old = {"psr": 70.0, "sermonType": "topical", "churchId": None}
+        sermons = self._sermons({"status": "complete", "compositePsr": 75.5, "sermonType": "topical", "scoreIndex": old})
+        control = MagicMock()
+        with patch("score_index._container", return_value=control):
+            score_index.sync(sermons, "s1")
+        assert "c.scoreIndex.psr = 70.0" in sermons.patch_item.call_args[1]["filter_predicate"]
+        assert self._incrs(control) == [("scorehist-all", "/counts/700", -1), ("scorehist-all", "/counts/755", 1),
+                                        ("scorehist-type-topical", "/counts/700", -1),
+                                        ("scorehist-type-topical", "/counts/755", 1)]
+
+        counted = {"status": "complete", "compositePsr": 70.0, "sermonType": "topical", "scoreIndex": old}
+        sermons, control = self._sermons(counted), MagicMock()
+        with patch("score_index._container", return_value=control):
+            score_index.sync(sermons, "s1")
+        sermons.patch_item.assert_not_called()
+        control.patch_item.assert_not_called()
+
+    def test_sync_lost_claim_retries_without_counting(self):
+        import score_index
+        from azure.cosmos import exceptions
+        sermons = self._sermons({"status": "complete", "compositePsr": 80.0})
+        sermons.patch_item.side_effect = exceptions.CosmosAccessConditionFailedError(status_code=412, message="x")
+        control = MagicMock()
+        with patch("score_index._container", return_value=control):
+            score_index.sync(sermons, "s1")
+        assert sermons.patch_item.call_count == score_index.MAX_SYNC_ATTEMPTS
+        control.patch_item.assert_not_called()
+
+    def test_percentile_counts_ties_half(self):
+        import score_index
+        counts = [0] * score_index.BINS
+        counts[500], counts[700], counts[900] = 2, 1, 1
+        control = MagicMock()
+        control.read_item.return_value = {"id": "scorehist-all", "counts": counts, "total": 4}
+        with patch("score_index._container", return_value=control):
+            assert score_index.percentile(70.0) == 62  # 2 below + half of 1 tie, of 4
+            assert score_index.percentile(100.0) == 100
+            assert score_index.percentile(10.0) == 0
+            assert score_index.percentile(None) is None
+        control.read_item.assert_called_once()  # cumulative counts cached
+
+    def test_version_change_drops_cached_scopes(self):
+        import score_index
+        counts = [0] * score_index.BINS
+        counts[500] = 1
+        etags = iter(['"h1"', '"h1"', '"h2"', '"h2"'])
+        control = MagicMock()
+        control.read_item.side_effect = lambda doc_id, partition_key: {"id": doc_id, "counts": counts, "total": 1,
+                                                                       "_etag": next(etags)}
+        with patch("score_index._container", return_value=control):
+            assert score_index.version() == '"h1"'
+            score_index.percentile(50.0, "type:topical")
+            score_index._cache["all"] = (0, None, '"h1"')  # expire "all" only
+            assert score_index.version() == '"h2"'
+            assert "type:topical" not in score_index._cache  # re-read under the new version
+            score_index.percentile(50.0, "type:topical")
+        assert control.read_item.call_count == 4
+
+    def test_rebuild_recounts_and_resets_markers(self):
+        import score_index
+        sermons = MagicMock()
+        sermons.query_items.return_value = [
+            {"id": "a", "status": "complete", "compositePsr": 80.0, "sermonType": "topical"},
+            {"id": "b", "status": "complete", "compositePsr": 60.0, "sermonType": "topical",
+             "scoreIndex": {"psr": 60.0, "sermonType": "topical", "churchId": None}},
+            {"id": "c", "status": "failed", "scoreIndex": {"psr": 50.0, "sermonType": None, "churchId": None}},
+        ]
+        control = MagicMock()
+        control.query_items.return_value = [{"id": "scorehist-all"}, {"id": "scorehist-church-gone"}]
+        with patch("score_index._container", return_value=control):
+            assert score_index.rebuild(sermons) == 2
+
+        assert sorted(c[0][0] for c in sermons.patch_item.call_args_list) == ["a", "c"]
+        upserts = {c[0][0]["id"]: c[0][0] for c in control.upsert_item.call_args_list}
+        assert upserts["scorehist-all"]["total"] == 2 and upserts["scorehist-all"]["counts"][800] == 1
+        assert upserts["scorehist-type-topical"]["counts"][600] == 1
+        control.delete_item.assert_called_once_with("scorehist-church-gone", partition_key="scorehist-church-gone")
@@ -28,7 +28,13 @@ _mock_feedparser = types.ModuleType("feedparser")
 _mock_feedparser.parse = MagicMock()
 sys.modules.setdefault("feedparser", _mock_feedparser)
 
-from routes.feeds import _preview_feeds, _poll_all_feeds, preview_feeds, poll_feeds_manual
+from routes.feeds import _preview_feeds, preview_feeds, poll_feeds_manual
+
+
+async def _poll_all_feeds(starter=None, feed_ids=None, due_only=False):
+    """What feed_poll_orchestrator runs, in-process: list the feeds, then one poll_feed per feed."""
+    import feed_poll
+    return [await feed_poll.poll_feed_by_id(fid) for fid in feed_poll.feeds_to_poll(feed_ids, due_only=due_only)]
 
 MOCK_STARTER_JSON = json.dumps({
     "taskHubName": "TestHub",
@@ -71,9 +77,11 @@ def _mock_entry(guid="ep-1", has_audio=True):
 
 
 def _patch_cosmos(feeds, existing_guids=None):
-    existing = [{"feedGuid": g} for g in (existing_guids or [])]
+    existing = list(existing_guids or [])  # SELECT VALUE c.feedGuid — the seen-GUID index rebuild
     mock_feed_container = MagicMock()
     mock_feed_container.query_items.return_value = feeds
+    by_id = {f["id"]: f for f in feeds}
+    mock_feed_container.read_item.side_effect = lambda item, partition_key=None: by_id[item]
     mock_sermon_container = MagicMock()
     mock_sermon_container.query_items.return_value = existing
     mock_cosmos = MagicMock()
@@ -91,13 +99,22 @@ def _admin_req(method="GET", body=None):
 
 
 def _feed_patches(mock_cosmos, mock_feed_ctr, parsed=None, parse_side_effect=None):
-    """Return stacked context managers for Cosmos + feedparser."""
-    from azure.cosmos import CosmosClient
+    """Return stacked context managers for the feed download, Cosmos + feedparser.
+
+    The seen-GUID index is absent, so known GUIDs come from the sermons fallback query.
+    """
+    from azure.cosmos import CosmosClient, exceptions
     import feedparser
+    mock_index = MagicMock()
+    mock_index.read_item.side_effect = exceptions.CosmosResourceNotFoundError(status_code=404, message="x")
     patches = [
+        patch("feed_index._container", return_value=mock_index),
+        patch("feed_cache._container", return_value=mock_index),
+        patch("feed_fetcher.fetch", new_callable=AsyncMock, return_value=(b"<rss/>", {})),
         patch.object(CosmosClient, "from_connection_string", return_value=mock_cosmos),
         patch("helpers._feeds_container", return_value=mock_feed_ctr),
         patch("routes.feeds._feeds_container", return_value=mock_feed_ctr),
+        patch("feed_poll._feeds_container", return_value=mock_feed_ctr),
     ]
     if parse_side_effect:
         patches.append(patch.object(feedparser, "parse", side_effect=parse_side_effect))
@@ -231,29 +248,37 @@ class TestPollFeedIds:
 # ── poll_feeds_manual with feedIds body ──
 
 class TestPollManualEndpoint:
-    @pytest.mark.asyncio
-    async def test_passes_feed_ids(self):
+    async def _post(self, body=None):
         import azure.durable_functions as df
         with patch.object(df.DurableOrchestrationClient, "__init__", return_value=None), \
-             patch("routes.feeds._poll_all_feeds", new_callable=AsyncMock, return_value=[{"feedId": "f1", "new": 0}]) as mock_poll:
-            req = _admin_req("POST", body={"feedIds": ["f1"]})
-            resp = await poll_feeds_manual(req, starter=MOCK_STARTER_JSON)
+             patch.object(df.DurableOrchestrationClient, "start_new", new_callable=AsyncMock, return_value="poll-1") as mock_start:
+            resp = await poll_feeds_manual(_admin_req("POST", body=body), starter=MOCK_STARTER_JSON)
+        return resp, mock_start
 
-        mock_poll.assert_called_once()
-        assert mock_poll.call_args[1]["feed_ids"] == ["f1"]
+    @pytest.mark.asyncio
+    async def test_passes_feed_ids(self):
+        resp, mock_start = await self._post({"feedIds": ["f1"]})
+        assert resp.status_code == 202
+        assert mock_start.call_args[0][0] == "feed_poll_orchestrator"
+        assert mock_start.call_args[1]["client_input"] == {"feedIds": ["f1"], "dueOnly": False}
         body = json.loads(resp.get_body())
-        assert body["polled"] == 1
+        assert body == {"instanceId": "poll-1", "statusUrl": "/api/feeds/poll/poll-1"}
 
     @pytest.mark.asyncio
     async def test_no_body_polls_all(self):
+        resp, mock_start = await self._post()
+        assert mock_start.call_args[1]["client_input"]["feedIds"] is None
+
+    @pytest.mark.asyncio
+    async def test_status_unknown_instance_404(self):
         import azure.durable_functions as df
+        from routes.feeds import poll_feeds_status
+        req = _admin_req("GET")
+        req.route_params = {"instance_id": "nope"}
         with patch.object(df.DurableOrchestrationClient, "__init__", return_value=None), \
-             patch("routes.feeds._poll_all_feeds", new_callable=AsyncMock, return_value=[]) as mock_poll:
-            req = _admin_req("POST")
-            resp = await poll_feeds_manual(req, starter=MOCK_STARTER_JSON)
-
-        mock_poll.assert_called_once()
-        assert mock_poll.call_args[1]["feed_ids"] is None
+             patch.object(df.DurableOrchestrationClient, "get_status", new_callable=AsyncMock, return_value=None):
+            resp = await poll_feeds_status(req, starter=MOCK_STARTER_JSON)
+        assert resp.status_code == 404
 
 
 # ── list_feeds: episodeCount + processingCount (sermon-38g) ──
@@ -371,6 +396,494 @@ class TestPollLastResult:
         assert results[0]["error"] == "boom"
 
 
+# ── _poll_all_feeds: episodes go through the work queue ──
+
+class TestPollEnqueues:
+    @pytest.mark.asyncio
+    async def test_new_episode_is_queued_not_started(self):
+        feed = _mock_feed(backfill=5)
+        mock_cosmos, mock_feed_ctr = _patch_cosmos([feed])
+        parsed = MagicMock()
+        import time
+        entry = _mock_entry("ep-new")
+        entry["published_parsed"] = time.struct_time((2026, 3, 1, 0, 0, 0, 6, 60, 0))
+        parsed.entries = [entry]
+        p = _feed_patches(mock_cosmos, mock_feed_ctr, parsed=parsed)
+
+        starter = AsyncMock()
+        with contextlib.ExitStack() as stack:
+            for ctx in p:
+                stack.enter_context(ctx)
+            mock_enqueue = stack.enter_context(patch("work_queue.enqueue"))
+            mock_dispatch = stack.enter_context(patch("work_queue.dispatch", new_callable=AsyncMock, return_value=[]))
+            results = await _poll_all_feeds(starter)
+
+        assert results[0]["new"] == 1
+        starter.start_new.assert_not_called()
+        sermon_id, orchestrator, client_input = mock_enqueue.call_args[0]
+        assert orchestrator == "rss_sermon_orchestrator"
+        assert client_input["audioUrl"] == "https://example.com/ep.mp3"
+        assert mock_enqueue.call_args[1]["lane"] == "rss"
+        created = mock_cosmos.get_database_client.return_value.get_container_client.return_value.create_item.call_args[0][0]
+        assert created["status"] == "queued"
+
+
+# ── concurrent fetch ──
+
+class TestConcurrentPolling:
+    @pytest.mark.asyncio
+    async def test_gather_bounded_caps_concurrency_and_keeps_order(self):
+        import asyncio
+        import feed_fetcher
+        running, peak = 0, 0
+
+        async def job(i):
+            nonlocal running, peak
+            running += 1
+            peak = max(peak, running)
+            await asyncio.sleep(0.01)
+            running -= 1
+            return i
+
+        assert await feed_fetcher.gather_bounded([job(i) for i in range(10)], limit=3) == list(range(10))
+        assert peak == 3
+
+    @pytest.mark.asyncio
+    async def test_one_failing_feed_does_not_affect_others(self):
+        import feed_fetcher
+        feeds = [_mock_feed("feed-1"), _mock_feed("feed-2", backfill=5)]
+        mock_cosmos, mock_feed_ctr = _patch_cosmos(feeds)
+        parsed = MagicMock()
+        import time
+        entry = _mock_entry("ep-1")
+        entry["published_parsed"] = time.struct_time((2026, 3, 1, 0, 0, 0, 6, 60, 0))
+        parsed.entries = [entry]
+
+        async def fetch(http, url, cache=None):
+            if url.endswith("bad.xml"):
+                raise feed_fetcher.FeedFetchError("Timed out after 30s")
+            return b"<rss/>", {}
+
+        feeds[0]["feedUrl"] = "https://example.com/bad.xml"
+        with contextlib.ExitStack() as stack:
+            for ctx in _feed_patches(mock_cosmos, mock_feed_ctr, parsed=parsed):
+                stack.enter_context(ctx)
+            stack.enter_context(patch("feed_fetcher.fetch", side_effect=fetch))
+            stack.enter_context(patch("work_queue.enqueue"))
+            stack.enter_context(patch("work_queue.dispatch", new_callable=AsyncMock, return_value=[]))
+            results = await _poll_all_feeds(AsyncMock())
+
+        assert results[0] == {"feedId": "feed-1", "new": 0, "error": "Timed out after 30s"}
+        assert results[1] == {"feedId": "feed-2", "new": 1}
+        recorded = {c[0][0]["id"]: c[0][0]["lastPollResult"]["errors"] for c in mock_feed_ctr.upsert_item.call_args_list}
+        assert recorded == {"feed-1": 1, "feed-2": 0}
+
+
+# ── conditional fetch (ETag / Last-Modified / body hash) ──
+
+class TestConditionalFetch:
+    def _poll_patches(self, stack, mock_cosmos, mock_feed_ctr, fetch_result):
+        import feedparser
+        for ctx in _feed_patches(mock_cosmos, mock_feed_ctr):
+            stack.enter_context(ctx)
+        stack.enter_context(patch("feed_fetcher.fetch", new_callable=AsyncMock, return_value=fetch_result))
+        return stack.enter_context(patch.object(feedparser, "parse"))
+
+    @pytest.mark.asyncio
+    async def test_not_modified_skips_parse_and_queries(self):
+        feed = {**_mock_feed(last_polled="2026-03-01T00:00:00Z"), "httpCache": {"etag": '"v1"', "bodyHash": "h"}}
+        mock_cosmos, mock_feed_ctr = _patch_cosmos([feed])
+        with contextlib.ExitStack() as stack:
+            mock_parse = self._poll_patches(stack, mock_cosmos, mock_feed_ctr, (None, {"ETag": '"v1"'}))
+            results = await _poll_all_feeds(AsyncMock())
+
+        assert results == [{"feedId": "feed-1", "new": 0, "unchanged": True}]
+        mock_parse.assert_not_called()
+        mock_cosmos.get_database_client.return_value.get_container_client.return_value.query_items.assert_not_called()
+        mock_feed_ctr.upsert_item.assert_not_called()
+        ops = {op["path"]: op["value"] for op in mock_feed_ctr.patch_item.call_args[1]["patch_operations"]}
+        assert ops["/lastPollResult"]["unchanged"] is True
+        assert ops["/httpCache"] == {"etag": '"v1"', "lastModified": None, "bodyHash": "h"}
+
+    @pytest.mark.asyncio
+    async def test_identical_body_counts_as_unchanged(self):
+        import hashlib
+        body = b"<rss>same</rss>"
+        feed = {**_mock_feed(last_polled="2026-03-01T00:00:00Z"), "httpCache": {"bodyHash": hashlib.sha256(body).hexdigest()}}
+        mock_cosmos, mock_feed_ctr = _patch_cosmos([feed])
+        with contextlib.ExitStack() as stack:
+            mock_parse = self._poll_patches(stack, mock_cosmos, mock_feed_ctr, (body, {}))
+            results = await _poll_all_feeds(AsyncMock())
+
+        assert results[0]["unchanged"] is True
+        mock_parse.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_changed_feed_stores_validators(self):
+        import hashlib
+        feed = _mock_feed(last_polled="2026-03-01T00:00:00Z")
+        mock_cosmos, mock_feed_ctr = _patch_cosmos([feed], existing_guids=["ep-1"])
+        parsed = MagicMock()
+        parsed.entries = [_mock_entry("ep-1")]
+        with contextlib.ExitStack() as stack:
+            mock_parse = self._poll_patches(stack, mock_cosmos, mock_feed_ctr,
+                                            (b"<rss/>", {"ETag": '"v2"', "Last-Modified": "Sun, 01 Mar 2026 00:00:00 GMT"}))
+            mock_parse.return_value = parsed
+            await _poll_all_feeds(AsyncMock())
+
+        cache = mock_feed_ctr.upsert_item.call_args[0][0]["httpCache"]
+        assert cache == {"etag": '"v2"', "lastModified": "Sun, 01 Mar 2026 00:00:00 GMT",
+                         "bodyHash": hashlib.sha256(b"<rss/>").hexdigest()}
+
+    @pytest.mark.asyncio
+    async def test_fetch_sends_validators_and_maps_304(self):
+        import feed_fetcher
+        resp = MagicMock()
+        resp.status = 304
+        resp.headers = {"ETag": '"v1"'}
+        ctx = MagicMock()
+        ctx.__aenter__ = AsyncMock(return_value=resp)
+        ctx.__aexit__ = AsyncMock(return_value=False)
+        http = MagicMock()
+        http.get.return_value = ctx
+        body, headers = await feed_fetcher.fetch(http, "https://example.com/feed.xml",
+                                                 {"etag": '"v1"', "lastModified": "Sun, 01 Mar 2026 00:00:00 GMT"})
+        assert body is None
+        assert http.get.call_args[1]["headers"] == {"If-None-Match": '"v1"', "If-Modified-Since": "Sun, 01 Mar 2026 00:00:00 GMT"}
+
+
+# ── seen-GUID index ──
+
+class TestSeenGuidIndex:
+    def _index(self, guids):
+        import feed_index
+        index = MagicMock()
+        index.read_item.return_value = {"id": "feedguids-feed-1", "_etag": "e1",
+                                        "guids": sorted(feed_index.guid_key(g) for g in guids)}
+        return index
+
+    @pytest.mark.asyncio
+    async def test_poll_dedups_with_one_point_read_and_records_new_guids(self):
+        import feed_index
+        import time
+        feed = _mock_feed(backfill=5)
+        mock_cosmos, mock_feed_ctr = _patch_cosmos([feed])
+        entries = [_mock_entry("ep-1"), _mock_entry("ep-2")]
+        for e in entries:
+            e["published_parsed"] = time.struct_time((2026, 3, 1, 0, 0, 0, 6, 60, 0))
+        parsed = MagicMock()
+        parsed.entries = entries
+        index = self._index(["ep-1"])
+        with contextlib.ExitStack() as stack:
+            for ctx in _feed_patches(mock_cosmos, mock_feed_ctr, parsed=parsed):
+                stack.enter_context(ctx)
+            stack.enter_context(patch("feed_index._container", return_value=index))
+            stack.enter_context(patch("work_queue.enqueue"))
+            stack.enter_context(patch("work_queue.dispatch", new_callable=AsyncMock, return_value=[]))
+            results = await _poll_all_feeds(AsyncMock())
+
+        assert results[0]["new"] == 1
+        mock_cosmos.get_database_client.return_value.get_container_client.return_value.query_items.assert_not_called()
+        stored = index.replace_item.call_args[0][1]["guids"]
+        assert stored == sorted(feed_index.guid_key(g) for g in ["ep-1", "ep-2"])
+        assert index.replace_item.call_args[1]["etag"] == "e1"
+
+    def test_missing_index_is_rebuilt_from_sermons(self):
+        import feed_index
+        from azure.cosmos import exceptions
+        index = MagicMock()
+        index.read_item.side_effect = exceptions.CosmosResourceNotFoundError(status_code=404, message="x")
+        sermons = MagicMock()
+        sermons.query_items.return_value = ["ep-2", "ep-1", None]
+        with patch("feed_index._container", return_value=index):
+            seen = feed_index.seen("feed-1", sermons)
+        assert "ep-1" in seen and "ep-2" in seen and "ep-3" not in seen
+        assert index.upsert_item.call_args[0][0]["guids"] == sorted(feed_index.guid_key(g) for g in ["ep-1", "ep-2"])
+
+    def test_record_retries_on_concurrent_write(self):
+        import feed_index
+        from azure.cosmos import exceptions
+        index = self._index(["ep-1"])
+        index.replace_item.side_effect = [exceptions.CosmosAccessConditionFailedError(status_code=412, message="x"), None]
+        with patch("feed_index._container", return_value=index):
+            feed_index.record("feed-1", ["ep-9"])
+        assert index.replace_item.call_count == 2
+
+    def test_failed_record_drops_index_without_masking_submit_error(self):
+        import time
+        import feed_index
+        import feed_poll
+        from azure.cosmos import exceptions
+        index = self._index(["ep-1"])
+        index.replace_item.side_effect = exceptions.CosmosAccessConditionFailedError(status_code=412, message="x")
+        sermons = MagicMock()
+        sermons.create_item.side_effect = [None, RuntimeError("cosmos down")]
+        entries = [_mock_entry("ep-2"), _mock_entry("ep-3")]
+        for e in entries:
+            e["published_parsed"] = time.struct_time((2026, 3, 1, 0, 0, 0, 6, 60, 0))
+        with patch("feed_index._container", return_value=index), patch("work_queue.enqueue"):
+            with pytest.raises(RuntimeError, match="cosmos down"):
+                feed_poll.submit_episodes(_mock_feed(), entries, sermons)
+        assert index.replace_item.call_count == feed_index.MAX_WRITE_ATTEMPTS
+        index.delete_item.assert_called_once_with("feedguids-feed-1", partition_key="feedguids-feed-1")
+
+    def _submit_with_enqueue_failure(self, sermons):
+        import time
+        import feed_poll
+        entry = _mock_entry("ep-2")
+        entry["published_parsed"] = time.struct_time((2026, 3, 1, 0, 0, 0, 6, 60, 0))
+        with patch("feed_index.seen", return_value=set()), \
+             patch("feed_index.record_or_forget") as mock_record, \
+             patch("work_queue.enqueue", side_effect=RuntimeError("queue down")):
+            with pytest.raises(RuntimeError, match="queue down"):
+                feed_poll.submit_episodes(_mock_feed(), [entry], sermons)
+        return sermons.create_item.call_args[0][0]["id"], mock_record
+
+    def test_enqueue_failure_removes_the_queued_doc(self):
+        sermons = MagicMock()
+        sermon_id, mock_record = self._submit_with_enqueue_failure(sermons)
+        sermons.delete_item.assert_called_once_with(sermon_id, partition_key=sermon_id)
+        mock_record.assert_not_called()  # the next poll picks the episode up again
+
+    def test_enqueue_failure_fails_doc_and_records_guid_when_delete_fails(self):
+        sermons = MagicMock()
+        sermons.delete_item.side_effect = RuntimeError("cosmos down")
+        sermon_id, mock_record = self._submit_with_enqueue_failure(sermons)
+        ops = sermons.patch_item.call_args[1]["patch_operations"]
+        assert sermons.patch_item.call_args[0][0] == sermon_id
+        assert {"op": "set", "path": "/status", "value": "failed"} in ops
+        mock_record.assert_called_once_with("feed-1", ["ep-2"])
+
+
+# ── incremental parsing ──
+
+def _rss(items):
+    body = "".join(
+        f"<item><guid>{guid}</guid><title>T {guid}</title><pubDate>{date}</pubDate>"
+        f"<itunes:author>Pastor P</itunes:author>"
+        f'<enclosure url="https://example.com/{guid}.mp3" type="audio/mpeg" length="1"/></item>'
+        for guid, date in items)
+    return (f'<rss xmlns:itunes="http://www.itunes.com/dtds/podcast-1.0.dtd"><channel><title>Grace Podcast</title>'
+            f"{body}</channel></rss>").encode()
+
+
+class TestFeedStream:
+    ITEMS = [("ep-3", "Sun, 15 Mar 2026 10:00:00 GMT"), ("ep-2", "Sun, 08 Mar 2026 10:00:00 GMT"),
+             ("ep-1", "Sun, 01 Mar 2026 10:00:00 GMT")]
+
+    def test_full_parse_builds_feedparser_shaped_entries(self):
+        import feed_stream
+        parsed = feed_stream.parse_entries(_rss(self.ITEMS))
+        assert parsed.complete and parsed.sorted_by_date is True
+        assert parsed.feed["title"] == "Grace Podcast"
+        first = parsed.entries[0]
+        assert first["id"] == "ep-3" and first["author"] == "Pastor P"
+        assert first["enclosures"][0] == {"href": "https://example.com/ep-3.mp3", "type": "audio/mpeg", "length": "1"}
+        assert tuple(first["published_parsed"][:4]) == (2026, 3, 15, 10)
+
+    def test_stops_at_last_seen_guid_when_sorted(self):
+        import feed_stream
+        parsed = feed_stream.parse_entries(_rss(self.ITEMS), stop_guid="ep-2", assume_sorted=True)
+        assert [e["id"] for e in parsed.entries] == ["ep-3"] and parsed.complete is False
+
+    def test_stops_at_cutoff_and_backfill(self):
+        import datetime
+        import feed_stream
+        cutoff = datetime.datetime(2026, 3, 5, tzinfo=datetime.timezone.utc)
+        parsed = feed_stream.parse_entries(_rss(self.ITEMS), cutoff=cutoff, assume_sorted=True)
+        assert [e["id"] for e in parsed.entries] == ["ep-3", "ep-2"]
+        assert [e["id"] for e in feed_stream.parse_entries(_rss(self.ITEMS), max_items=1).entries] == ["ep-3"]
+
+    def test_out_of_order_feed_is_parsed_in_full(self):
+        import feed_stream
+        items = [self.ITEMS[1], self.ITEMS[0], self.ITEMS[2]]
+        parsed = feed_stream.parse_entries(_rss(items), stop_guid="ep-1", assume_sorted=True)
+        assert parsed.sorted_by_date is False
+        assert [e["id"] for e in parsed.entries] == ["ep-2", "ep-3", "ep-1"]
+        # Unknown order (never fully parsed) — no early stop either
+        assert len(feed_stream.parse_entries(_rss(self.ITEMS), stop_guid="ep-2").entries) == 3
+
+    def test_malformed_xml_falls_back_to_feedparser(self):
+        import feed_stream
+        import feedparser
+        fallback = MagicMock()
+        fallback.entries = [{"id": "x"}]
+        with patch.object(feedparser, "parse", return_value=fallback) as mock_parse:
+            parsed = feed_stream.parse_entries(b"<rss><channel><item>&nbsp;</channel>")
+        assert parsed.entries == [{"id": "x"}]
+        mock_parse.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_poll_stops_at_last_seen_guid_and_records_order(self):
+        feed = {**_mock_feed(last_polled="2026-03-10T00:00:00Z"), "lastSeenGuid": "ep-2", "sortedByDate": True}
+        mock_cosmos, mock_feed_ctr = _patch_cosmos([feed])
+        with contextlib.ExitStack() as stack:
+            for ctx in _feed_patches(mock_cosmos, mock_feed_ctr):
+                stack.enter_context(ctx)
+            stack.enter_context(patch("feed_fetcher.fetch", new_callable=AsyncMock, return_value=(_rss(self.ITEMS), {})))
+            mock_enqueue = stack.enter_context(patch("work_queue.enqueue"))
+            stack.enter_context(patch("work_queue.dispatch", new_callable=AsyncMock, return_value=[]))
+            results = await _poll_all_feeds(AsyncMock())
+
+        assert results[0]["new"] == 1
+        assert mock_enqueue.call_args[0][2]["audioUrl"] == "https://example.com/ep-3.mp3"
+        upserted = mock_feed_ctr.upsert_item.call_args[0][0]
+        assert upserted["lastSeenGuid"] == "ep-3" and upserted["sortedByDate"] is True
+
+
+# ── shared parsed-feed cache ──
+
+class _MemoryContainer:
+    """Just enough of a Cosmos container for feed_cache."""
+
+    def __init__(self):
+        self.items = {}
+
+    def read_item(self, item, partition_key=None):
+        from azure.cosmos import exceptions
+        if item not in self.items:
+            raise exceptions.CosmosResourceNotFoundError(status_code=404, message="x")
+        return json.loads(json.dumps(self.items[item]))
+
+    def upsert_item(self, doc):
+        self.items[doc["id"]] = json.loads(json.dumps(doc))
+
+
+class TestFeedCache:
+    ITEMS = TestFeedStream.ITEMS
+
+    def _stack(self, stack, feed, body=None):
+        mock_cosmos, mock_feed_ctr = _patch_cosmos([feed])
+        for ctx in _feed_patches(mock_cosmos, mock_feed_ctr):
+            stack.enter_context(ctx)
+        stack.enter_context(patch("feed_cache._container", return_value=self.cache))
+        mock_fetch = stack.enter_context(patch("feed_fetcher.fetch", new_callable=AsyncMock,
+                                               return_value=(body or _rss(self.ITEMS), {"ETag": '"v1"'})))
+        self.sermons = mock_cosmos.get_database_client.return_value.get_container_client.return_value
+        return mock_fetch, mock_feed_ctr
+
+    def setup_method(self):
+        self.cache = _MemoryContainer()
+
+    @pytest.mark.asyncio
+    async def test_poll_after_preview_reuses_parsed_feed(self):
+        feed = _mock_feed(backfill=2)
+        with contextlib.ExitStack() as stack:
+            mock_fetch, mock_feed_ctr = self._stack(stack, feed)
+            mock_enqueue = stack.enter_context(patch("work_queue.enqueue"))
+            preview = await _preview_feeds()
+            results = await _poll_all_feeds()
+
+        assert preview[0]["newCount"] == 2 and results[0]["new"] == 2
+        mock_fetch.assert_awaited_once()
+        assert mock_enqueue.call_args_list[0][0][2]["audioUrl"] == "https://example.com/ep-3.mp3"
+        created = [c[0][0] for c in self.sermons.create_item.call_args_list]
+        assert created[0]["feedGuid"] == "ep-3" and created[0]["date"] == "2026-03-15" and created[0]["pastor"] == "Pastor P"
+        upserted = mock_feed_ctr.upsert_item.call_args[0][0]
+        assert upserted["httpCache"]["etag"] == '"v1"' and upserted["lastSeenGuid"] == "ep-3"
+
+    @pytest.mark.asyncio
+    async def test_partial_parse_does_not_serve_other_stop_point(self):
+        import feed_cache
+        with contextlib.ExitStack() as stack:
+            mock_fetch, _ = self._stack(stack, _mock_feed())
+            first, _ = await feed_cache.fetch_parsed(None, "https://example.com/feed.xml", max_items=1)
+            again, _ = await feed_cache.fetch_parsed(None, "https://example.com/feed.xml", max_items=1)
+            full, _ = await feed_cache.fetch_parsed(None, "https://example.com/feed.xml")
+            partial, _ = await feed_cache.fetch_parsed(None, "https://example.com/feed.xml", max_items=1)
+
+        assert [e["id"] for e in first.entries] == [e["id"] for e in again.entries] == ["ep-3"]
+        assert len(full.entries) == 3 and len(partial.entries) == 3  # a complete parse serves any stop point
+        assert mock_fetch.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_matching_body_hash_is_unchanged_and_stale_entries_refetch(self):
+        import feed_cache
+        url = "https://example.com/feed.xml"
+        with contextlib.ExitStack() as stack:
+            mock_fetch, _ = self._stack(stack, _mock_feed())
+            _, validators = await feed_cache.fetch_parsed(None, url)
+            parsed, _ = await feed_cache.fetch_parsed(None, url, validators)
+            assert parsed is None and mock_fetch.await_count == 1
+
+            self.cache.items[feed_cache._doc_id(url)]["fetchedAt"] -= feed_cache.FEED_CACHE_TTL_SECONDS + 1
+            await feed_cache.fetch_parsed(None, url)
+        assert mock_fetch.await_count == 2
+
+
+# ── adaptive schedule ──
+
+class TestFeedSchedule:
+    @staticmethod
+    def _sundays(weeks, latest="2026-03-15T15:00:00Z"):
+        import datetime
+        end = datetime.datetime.fromisoformat(latest.replace("Z", "+00:00"))
+        return [(end - datetime.timedelta(weeks=i)).strftime("%Y-%m-%dT%H:%M:%SZ") for i in range(weeks)]
+
+    @staticmethod
+    def _at(value):
+        import datetime
+        return datetime.datetime.fromisoformat(value.replace("Z", "+00:00"))
+
+    def test_weekly_feed_polls_after_expected_slot_capped_daily(self):
+        import feed_schedule
+        history = self._sundays(8)
+        # Saturday noon — next Sunday 15:00 slot is 27h away, so the daily cap applies
+        assert feed_schedule.next_poll_at(history, self._at("2026-03-21T12:00:00Z")) == "2026-03-22T12:00:00Z"
+        # Sunday 09:00 — poll 30 min after the 15:00 slot opens
+        assert feed_schedule.next_poll_at(history, self._at("2026-03-22T09:00:00Z")) == "2026-03-22T15:30:00Z"
+
+    def test_follows_up_hourly_while_expected_episode_is_missing(self):
+        import feed_schedule
+        history = self._sundays(8)
+        assert feed_schedule.next_poll_at(history, self._at("2026-03-22T17:00:00Z")) == "2026-03-22T18:00:00Z"
+        # ...but not once this week's episode has arrived
+        history = self._sundays(8, latest="2026-03-22T15:10:00Z")
+        assert feed_schedule.next_poll_at(history, self._at("2026-03-22T17:00:00Z")) != "2026-03-22T18:00:00Z"
+
+    def test_dormant_feed_backs_off_exponentially(self):
+        import feed_schedule
+        history = self._sundays(8, latest="2025-01-05T15:00:00Z")
+        now = self._at("2026-03-22T00:00:00Z")
+        assert feed_schedule.next_poll_at(history, now, empty_polls=0) == "2026-03-23T00:00:00Z"
+        assert feed_schedule.next_poll_at(history, now, empty_polls=2) == "2026-03-26T00:00:00Z"
+        assert feed_schedule.next_poll_at(history, now, empty_polls=10) == "2026-04-05T00:00:00Z"
+
+    def test_history_merges_and_caps(self):
+        import time
+        import feed_schedule
+        entries = [{"published_parsed": time.struct_time((2026, 3, 22, 15, 0, 0, 6, 81, 0))}, {"title": "undated"}]
+        history = feed_schedule.update_history(self._sundays(feed_schedule.HISTORY_SIZE), entries)
+        assert history[0] == "2026-03-22T15:00:00Z" and len(history) == feed_schedule.HISTORY_SIZE
+
+    @pytest.mark.asyncio
+    async def test_due_poll_selects_due_feeds_and_stores_next_poll(self):
+        feed = {**_mock_feed(last_polled="2026-03-01T00:00:00Z"), "publishHistory": self._sundays(4)}
+        mock_cosmos, mock_feed_ctr = _patch_cosmos([feed], existing_guids=["ep-1"])
+        parsed = MagicMock()
+        parsed.entries = [_mock_entry("ep-1")]
+        with contextlib.ExitStack() as stack:
+            for ctx in _feed_patches(mock_cosmos, mock_feed_ctr, parsed=parsed):
+                stack.enter_context(ctx)
+            await _poll_all_feeds(due_only=True)
+
+        assert "c.nextPollAt <= @now" in mock_feed_ctr.query_items.call_args[0][0]
+        upserted = mock_feed_ctr.upsert_item.call_args[0][0]
+        assert upserted["nextPollAt"] and upserted["emptyPolls"] == 1
+
+    @pytest.mark.asyncio
+    async def test_timer_starts_singleton_due_poll(self):
+        from routes.feeds import poll_feeds_timer
+        import azure.durable_functions as df
+        timer = MagicMock()
+        timer.past_due = False
+        with patch.object(df.DurableOrchestrationClient, "__init__", return_value=None), \
+             patch.object(df.DurableOrchestrationClient, "get_status", new_callable=AsyncMock, return_value=None), \
+             patch.object(df.DurableOrchestrationClient, "start_new", new_callable=AsyncMock) as mock_start:
+            await poll_feeds_timer(timer, starter=MOCK_STARTER_JSON)
+        assert mock_start.call_args[0] == ("feed_poll_orchestrator", "feed-poll-scheduled", {"feedIds": None, "dueOnly": True})
+
+
 # ── new_feed_doc schema (sermon-2sm) ──
 
 class TestNewFeedDocSchema:
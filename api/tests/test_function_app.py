@@ -70,6 +70,73 @@ class TestJsonResponse:
         resp = _json_response({})
         assert json.loads(resp.get_body()) == {}
 
+    def test_etag_header(self):
+        resp = _json_response({"ok": True}, etag='"abc"')
+        assert resp.headers["ETag"] == '"abc"'
+
+    def test_if_none_match_returns_304(self):
+        req = MagicMock(spec=func.HttpRequest)
+        req.headers = {"If-None-Match": '"other", "abc"'}
+        resp = _json_response({"ok": True}, req=req, etag='"abc"')
+        assert resp.status_code == 304
+        assert resp.get_body() == b""
+        assert resp.headers["ETag"] == '"abc"'
+
+    def test_if_none_match_mismatch_returns_body(self):
+        req = MagicMock(spec=func.HttpRequest)
+        req.headers = {"If-None-Match": '"stale"'}
+        resp = _json_response({"ok": True}, req=req, etag='"abc"')
+        assert resp.status_code == 200
+        assert json.loads(resp.get_body()) == {"ok": True}
+
+
+class TestJsonResponseCompression:
+    def _req(self, accept):
+        req = MagicMock(spec=func.HttpRequest)
+        req.headers = {"Accept-Encoding": accept} if accept else {}
+        return req
+
+    def test_gzip_above_threshold(self):
+        import gzip
+        body = [{"id": str(i), "title": "Sermon title"} for i in range(200)]
+        resp = _json_response(body, req=self._req("gzip, deflate"))
+        assert resp.headers["Content-Encoding"] == "gzip"
+        assert json.loads(gzip.decompress(resp.get_body())) == body
+
+    def test_small_body_not_compressed(self):
+        resp = _json_response({"ok": True}, req=self._req("gzip"))
+        assert "Content-Encoding" not in resp.headers
+        assert json.loads(resp.get_body()) == {"ok": True}
+
+    def test_no_accept_encoding(self):
+        body = [{"id": str(i)} for i in range(500)]
+        resp = _json_response(body, req=self._req(None))
+        assert "Content-Encoding" not in resp.headers
+        assert resp.headers["Vary"] == "Accept-Encoding"
+
+    def test_gzip_q0_refused(self):
+        body = [{"id": str(i)} for i in range(500)]
+        resp = _json_response(body, req=self._req("gzip;q=0"))
+        assert "Content-Encoding" not in resp.headers
+
+    def test_etag_differs_per_encoding(self):
+        body = [{"id": str(i)} for i in range(500)]
+        identity = _json_response(body, req=self._req(None), etag='"abc"')
+        gz = _json_response(body, req=self._req("gzip"), etag='"abc"')
+        assert (identity.headers["ETag"], gz.headers["ETag"]) == ('"abc"', '"abc-gzip"')
+        assert gz.headers["Vary"] == "Accept-Encoding"
+
+    def test_encoded_etag_revalidates(self):
+        req = self._req("gzip")
+        req.headers["If-None-Match"] = '"abc-gzip"'
+        resp = _json_response([{"id": str(i)} for i in range(500)], req=req, etag='"abc"')
+        assert resp.status_code == 304
+        assert resp.headers["ETag"] == '"abc-gzip"'
+
+    def test_compact_separators(self):
+        resp = _json_response({"a": [1, 2]}, compact=True)
+        assert resp.get_body() == b'{"a":[1,2]}'
+
 
 # ── _default_audio_metrics ──
 
@@ -205,7 +272,11 @@ class TestUploadValidation:
         with patch.object(BlobClient, "from_connection_string", return_value=mock_blob), \
              patch.object(CosmosClient, "from_connection_string", return_value=mock_cosmos), \
              patch.object(df.DurableOrchestrationClient, "__init__", return_value=None), \
-             patch.object(df.DurableOrchestrationClient, "start_new", new_callable=AsyncMock, return_value="inst-1"):
+             patch.object(df.DurableOrchestrationClient, "start_new", new_callable=AsyncMock, return_value="inst-1"), \
+             patch("admission.take_upload_token", return_value=True), \
+             patch("work_queue.enqueue") as mock_enqueue, \
+             patch("work_queue.dispatch", new_callable=AsyncMock) as mock_dispatch:
+            mock_dispatch.side_effect = lambda starter: [mock_enqueue.call_args[0][0]]
             from function_app import upload_sermon
             resp = await upload_sermon(req, starter=self._make_mock_starter_json())
 
@@ -215,6 +286,8 @@ class TestUploadValidation:
         assert body["status"] == "processing"
         mock_blob.upload_blob.assert_called_once()
         mock_container.create_item.assert_called_once()
+        assert mock_container.create_item.call_args[0][0]["status"] == "queued"
+        assert mock_enqueue.call_args[0][1] == "sermon_orchestrator"
 
     @pytest.mark.asyncio
     async def test_upload_no_filename(self):
@@ -239,11 +312,60 @@ class TestUploadValidation:
                  get_database_client=MagicMock(return_value=MagicMock(
                      get_container_client=MagicMock(return_value=mock_container))))), \
              patch.object(df.DurableOrchestrationClient, "__init__", return_value=None), \
-             patch.object(df.DurableOrchestrationClient, "start_new", new_callable=AsyncMock, return_value="inst-1"):
+             patch.object(df.DurableOrchestrationClient, "start_new", new_callable=AsyncMock, return_value="inst-1"), \
+             patch("admission.take_upload_token", return_value=True), \
+             patch("work_queue.enqueue"), \
+             patch("work_queue.dispatch", new_callable=AsyncMock, return_value=[]):
             from function_app import upload_sermon
             resp = await upload_sermon(req, starter=self._make_mock_starter_json())
 
         assert resp.status_code == 202
+        assert json.loads(resp.get_body())["status"] == "queued"
+
+
+    @pytest.mark.asyncio
+    async def test_rate_limited(self):
+        req = MagicMock(spec=func.HttpRequest)
+        mock_file = MagicMock()
+        mock_file.content_type = "audio/mpeg"
+        mock_file.read.return_value = b"data"
+        req.files = {"file": mock_file}
+        req.headers = {}
+        with patch("admission.take_upload_token", return_value=False), \
+             patch("work_queue.enqueue") as mock_enqueue:
+            resp = await self._call_upload(req)
+        assert resp.status_code == 429
+        mock_enqueue.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_admission_error_fails_closed(self):
+        req = MagicMock(spec=func.HttpRequest)
+        mock_file = MagicMock()
+        mock_file.content_type = "audio/mpeg"
+        mock_file.read.return_value = b"data"
+        req.files = {"file": mock_file}
+        req.headers = {}
+        with patch("admission.take_upload_token", side_effect=RuntimeError("cosmos down")):
+            resp = await self._call_upload(req)
+        assert resp.status_code == 503
+
+    @pytest.mark.asyncio
+    async def test_blob_failure_refunds_token(self):
+        req = MagicMock(spec=func.HttpRequest)
+        mock_file = MagicMock()
+        mock_file.content_type = "audio/mpeg"
+        mock_file.read.return_value = b"data"
+        mock_file.filename = "s.mp3"
+        req.files = {"file": mock_file}
+        req.form = {}
+        req.headers = {}
+        from azure.storage.blob import BlobClient
+        with patch("admission.take_upload_token", return_value=True), \
+             patch("admission.refund_upload_token") as mock_refund, \
+             patch.object(BlobClient, "from_connection_string", side_effect=RuntimeError("blob down")):
+            resp = await self._call_upload(req)
+        assert resp.status_code == 500
+        mock_refund.assert_called_once()
 
 
 # ── list_sermons ──
@@ -286,6 +408,28 @@ class TestListSermons:
 
         assert json.loads(resp.get_body()) == []
 
+    @pytest.mark.asyncio
+    async def test_complete_items_carry_percentile(self):
+        from function_app import list_sermons
+        from azure.cosmos import CosmosClient
+
+        req = MagicMock(spec=func.HttpRequest)
+        mock_container = MagicMock()
+        mock_container.query_items.return_value = [
+            {"id": "1", "status": "complete", "compositePsr": 85},
+            {"id": "2", "status": "processing"},
+        ]
+        mock_cosmos = MagicMock()
+        mock_cosmos.get_database_client.return_value.get_container_client.return_value = mock_container
+
+        with patch.object(CosmosClient, "from_connection_string", return_value=mock_cosmos), \
+             patch("score_index.percentile", return_value=73) as mock_percentile:
+            resp = await list_sermons(req)
+
+        body = json.loads(resp.get_body())
+        assert body[0]["percentile"] == 73 and "percentile" not in body[1]
+        mock_percentile.assert_called_once_with(85)
+
 
 # ── get_sermon ──
 
@@ -331,3 +475,964 @@ class TestGetSermon:
 
         assert resp.status_code == 404
         assert "not found" in resp.get_body().decode()
+
+    @pytest.mark.asyncio
+    async def test_detail_includes_percentiles(self):
+        import score_index
+        from function_app import get_sermon
+        from azure.cosmos import CosmosClient
+
+        req = MagicMock(spec=func.HttpRequest)
+        req.route_params = {"sermon_id": "abc-123"}
+        req.params = {}
+        req.headers = {}
+        mock_container = MagicMock()
+        mock_container.read_item.return_value = {
+            "id": "abc-123", "status": "complete", "compositePsr": 70.0, "sermonType": "topical", "churchId": "c1",
+            "scoreIndex": {"psr": 70.0, "sermonType": "topical", "churchId": "c1"},
+        }
+        mock_cosmos = MagicMock()
+        mock_cosmos.get_database_client.return_value.get_container_client.return_value = mock_container
+        counts = [0] * score_index.BINS
+        counts[500], counts[700] = 3, 1
+        control = MagicMock()
+        control.read_item.side_effect = lambda doc_id, partition_key: (
+            {"id": doc_id, "counts": counts, "total": 4} if doc_id != "scorehist-church-c1"
+            else {"id": doc_id, "counts": [0] * 700 + [1] + [0] * 300, "total": 1})
+
+        score_index._cache.clear()
+        with patch.object(CosmosClient, "from_connection_string", return_value=mock_cosmos), \
+             patch("score_index._container", return_value=control):
+            resp = await get_sermon(req)
+        score_index._cache.clear()
+
+        body = json.loads(resp.get_body())
+        assert (body["percentile"], body["typePercentile"], body["churchPercentile"]) == (88, 88, 50)
+        assert "scoreIndex" not in body
+
+    @pytest.mark.asyncio
+    async def test_sets_strong_etag(self):
+        from function_app import get_sermon
+        from azure.cosmos import CosmosClient
+
+        req = MagicMock(spec=func.HttpRequest)
+        req.route_params = {"sermon_id": "abc-123"}
+        req.headers = {}
+        req.params = {}
+        mock_container = MagicMock()
+        mock_container.read_item.return_value = {"id": "abc-123", "_etag": '"cosmos-1"'}
+        mock_cosmos = MagicMock()
+        mock_cosmos.get_database_client.return_value.get_container_client.return_value = mock_container
+
+        with patch.object(CosmosClient, "from_connection_string", return_value=mock_cosmos):
+            resp = await get_sermon(req)
+
+        etag = resp.headers["ETag"]
+        assert etag.startswith('"') and etag.endswith('"')
+        mock_container.query_items.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_not_modified_skips_full_read(self):
+        from function_app import get_sermon
+        from helpers import _strong_etag
+        from azure.cosmos import CosmosClient
+
+        req = MagicMock(spec=func.HttpRequest)
+        req.route_params = {"sermon_id": "abc-123"}
+        req.headers = {"If-None-Match": _strong_etag('"cosmos-1"', "detail:hist-1")}
+        req.params = {}
+        mock_container = MagicMock()
+        mock_container.query_items.return_value = ['"cosmos-1"']
+        mock_container.read_item.return_value = {"id": "abc-123", "_etag": '"cosmos-1"'}
+        mock_cosmos = MagicMock()
+        mock_cosmos.get_database_client.return_value.get_container_client.return_value = mock_container
+
+        with patch.object(CosmosClient, "from_connection_string", return_value=mock_cosmos), \
+             patch("score_index.version", return_value="hist-1"):
+            resp = await get_sermon(req)
+
+        assert resp.status_code == 304
+        mock_container.read_item.assert_not_called()
+        assert mock_container.query_items.call_args[1]["partition_key"] == "abc-123"
+
+        # Same sermon, but the score distribution moved: percentiles may differ, so no 304
+        with patch.object(CosmosClient, "from_connection_string", return_value=mock_cosmos), \
+             patch("score_index.version", return_value="hist-2"), \
+             patch("score_index.percentiles", return_value={"percentile": 40}):
+            resp = await get_sermon(req)
+        assert resp.status_code == 200
+        assert json.loads(resp.get_body())["percentile"] == 40
+
+    @pytest.mark.asyncio
+    async def test_fields_projection_query(self):
+        from function_app import get_sermon
+        from azure.cosmos import CosmosClient
+
+        req = MagicMock(spec=func.HttpRequest)
+        req.route_params = {"sermon_id": "abc-123"}
+        req.headers = {}
+        req.params = {"fields": "title,compositePsr,transcript"}
+        mock_container = MagicMock()
+        mock_container.query_items.return_value = [
+            {"id": "abc-123", "title": "T", "compositePsr": 81.5, "transcript": {"wordCount": 4200}, "_etag": '"e"'},
+        ]
+        mock_cosmos = MagicMock()
+        mock_cosmos.get_database_client.return_value.get_container_client.return_value = mock_container
+
+        with patch.object(CosmosClient, "from_connection_string", return_value=mock_cosmos):
+            resp = await get_sermon(req)
+
+        assert resp.status_code == 200
+        assert json.loads(resp.get_body()) == {
+            "id": "abc-123", "title": "T", "compositePsr": 81.5, "transcript": {"wordCount": 4200},
+        }
+        mock_container.read_item.assert_not_called()
+        query = mock_container.query_items.call_args[0][0]
+        assert 'c["title"]' in query and "c.transcript.wordCount" in query
+        assert "@id" in query
+        assert mock_container.query_items.call_args[1]["partition_key"] == "abc-123"
+
+    @pytest.mark.asyncio
+    async def test_fields_quotes_keyword_names(self):
+        from function_app import get_sermon
+        from azure.cosmos import CosmosClient
+
+        req = MagicMock(spec=func.HttpRequest)
+        req.route_params = {"sermon_id": "abc-123"}
+        req.headers = {}
+        req.params = {"fields": "value,order"}
+        mock_container = MagicMock()
+        mock_container.query_items.return_value = [{"id": "abc-123", "value": 1, "order": 2, "_etag": '"e"'}]
+        mock_cosmos = MagicMock()
+        mock_cosmos.get_database_client.return_value.get_container_client.return_value = mock_container
+
+        with patch.object(CosmosClient, "from_connection_string", return_value=mock_cosmos):
+            resp = await get_sermon(req)
+
+        assert resp.status_code == 200
+        query = mock_container.query_items.call_args[0][0]
+        assert query.startswith('SELECT c["id"], c["value"], c["order"], c._etag FROM c')
+
+    @pytest.mark.asyncio
+    async def test_fields_rejects_private_and_nested(self):
+        from function_app import get_sermon
+        from azure.cosmos import CosmosClient
+
+        for bad in ("uploaderIp", "translations", "transcript.fullText", "title) FROM c --"):
+            req = MagicMock(spec=func.HttpRequest)
+            req.route_params = {"sermon_id": "abc-123"}
+            req.headers = {}
+            req.params = {"fields": bad}
+            with patch.object(CosmosClient, "from_connection_string", return_value=MagicMock()):
+                resp = await get_sermon(req)
+            assert resp.status_code == 400, bad
+
+    @pytest.mark.asyncio
+    async def test_stored_word_count_used(self):
+        from function_app import get_sermon
+        from azure.cosmos import CosmosClient
+
+        req = MagicMock(spec=func.HttpRequest)
+        req.route_params = {"sermon_id": "abc-123"}
+        req.headers = {}
+        req.params = {}
+        mock_container = MagicMock()
+        mock_container.read_item.return_value = {
+            "id": "abc-123", "transcript": {"fullText": "three words here", "wordCount": 999, "segments": []},
+            "translations": {"es": "..."},
+        }
+        mock_cosmos = MagicMock()
+        mock_cosmos.get_database_client.return_value.get_container_client.return_value = mock_container
+
+        with patch.object(CosmosClient, "from_connection_string", return_value=mock_cosmos):
+            resp = await get_sermon(req)
+
+        body = json.loads(resp.get_body())
+        assert body["transcript"] == {"wordCount": 999}
+        assert "translations" not in body
+
+
+class TestPatchWrites:
+    def _admin_req(self, body):
+        req = MagicMock(spec=func.HttpRequest)
+        req.route_params = {"sermon_id": "abc-123"}
+        req.headers = {"x-admin-key": "k"}
+        req.params = {}
+        req.get_json.return_value = body
+        return req
+
+    def _cosmos(self, container):
+        mock_cosmos = MagicMock()
+        mock_cosmos.get_database_client.return_value.get_container_client.return_value = container
+        return mock_cosmos
+
+    @pytest.mark.asyncio
+    async def test_apply_bonus_patches_with_filter(self):
+        from routes.sermons import apply_bonus
+        from azure.cosmos import CosmosClient
+
+        container = MagicMock()
+        container.query_items.return_value = [{"status": "complete", "compositePsr": 72.5}]
+        with patch.dict(os.environ, {"ADMIN_KEY": "k"}), \
+             patch.object(CosmosClient, "from_connection_string", return_value=self._cosmos(container)):
+            resp = await apply_bonus(self._admin_req({"bonus": 3}))
+
+        assert resp.status_code == 200
+        assert json.loads(resp.get_body())["totalScore"] == 75.5
+        container.read_item.assert_not_called()
+        container.upsert_item.assert_not_called()
+        kwargs = container.patch_item.call_args[1]
+        assert kwargs["filter_predicate"] == "FROM c WHERE c.status = 'complete' AND c.compositePsr = 72.5"
+        assert {"op": "set", "path": "/totalScore", "value": 75.5} in kwargs["patch_operations"]
+
+    @pytest.mark.asyncio
+    async def test_apply_bonus_conflict_on_concurrent_rescore(self):
+        from routes.sermons import apply_bonus
+        from azure.cosmos import CosmosClient, exceptions
+
+        container = MagicMock()
+        container.query_items.return_value = [{"status": "complete", "compositePsr": 72.5}]
+        container.patch_item.side_effect = exceptions.CosmosAccessConditionFailedError(status_code=412, message="x")
+        with patch.dict(os.environ, {"ADMIN_KEY": "k"}), \
+             patch.object(CosmosClient, "from_connection_string", return_value=self._cosmos(container)):
+            resp = await apply_bonus(self._admin_req({"bonus": 3}))
+        assert resp.status_code == 409
+
+    @pytest.mark.asyncio
+    async def test_edit_sermon_patches_only_edited_fields(self):
+        from routes.sermons import edit_sermon
+        from azure.cosmos import CosmosClient
+
+        container = MagicMock()
+        with patch.dict(os.environ, {"ADMIN_KEY": "k"}), \
+             patch.object(CosmosClient, "from_connection_string", return_value=self._cosmos(container)):
+            resp = await edit_sermon(self._admin_req({"title": "New", "compositePsr": 100}))
+
+        assert json.loads(resp.get_body()) == {"id": "abc-123", "title": "New"}
+        container.read_item.assert_not_called()
+        assert container.patch_item.call_args[1]["patch_operations"] == [
+            {"op": "set", "path": "/title", "value": "New"},
+        ]
+
+
+# ── admission control ──
+
+class TestAdmission:
+    def test_acquire_slot_is_filtered_incr(self):
+        import admission
+        container = MagicMock()
+        with patch("admission._control_container", return_value=container):
+            assert admission.acquire_slot() is True
+        kwargs = container.patch_item.call_args[1]
+        assert kwargs["patch_operations"] == [{"op": "incr", "path": "/count", "value": 1},
+                                              {"op": "incr", "path": "/interactive", "value": 1}]
+        assert kwargs["filter_predicate"] == (f"FROM c WHERE c.count < {admission.MAX_CONCURRENT}"
+                                              f" AND (c.interactive ?? 0) < {admission.LANE_LIMITS['interactive']}")
+        container.query_items.assert_not_called()
+
+    def test_background_lanes_leave_reserved_slots(self):
+        import admission
+        container = MagicMock()
+        with patch("admission._control_container", return_value=container):
+            assert admission.acquire_slot("rss") is True
+        predicate = container.patch_item.call_args[1]["filter_predicate"]
+        assert f"(c.rss ?? 0) < {admission.LANE_LIMITS['rss']}" in predicate
+        assert f"c.count - (c.interactive ?? 0) < {admission.MAX_CONCURRENT - admission.RESERVED_INTERACTIVE}" in predicate
+
+    def test_release_slot_decrements_lane(self):
+        import admission
+        container = MagicMock()
+        with patch("admission._control_container", return_value=container):
+            admission.release_slot("rescore")
+        kwargs = container.patch_item.call_args[1]
+        assert {"op": "incr", "path": "/rescore", "value": -1} in kwargs["patch_operations"]
+        assert "(c.rescore ?? 0) > 0" in kwargs["filter_predicate"]
+
+    def test_release_slot_without_lane_counter_frees_total(self):
+        import admission
+        from azure.cosmos import exceptions
+        container = MagicMock()
+        container.patch_item.side_effect = [exceptions.CosmosAccessConditionFailedError(status_code=412, message="x"), None]
+        with patch("admission._control_container", return_value=container):
+            admission.release_slot("rss")
+        kwargs = container.patch_item.call_args[1]
+        assert kwargs["patch_operations"] == [{"op": "incr", "path": "/count", "value": -1}]
+        assert kwargs["filter_predicate"] == "FROM c WHERE c.count > 0"
+
+    def test_acquire_slot_full(self):
+        import admission
+        from azure.cosmos import exceptions
+        container = MagicMock()
+        container.patch_item.side_effect = exceptions.CosmosAccessConditionFailedError(status_code=412, message="x")
+        with patch("admission._control_container", return_value=container):
+            assert admission.acquire_slot() is False
+
+    def test_acquire_slot_seeds_counter(self):
+        import admission
+        from azure.cosmos import exceptions
+        container = MagicMock()
+        container.patch_item.side_effect = [exceptions.CosmosResourceNotFoundError(status_code=404, message="x"), None]
+        with patch("admission._control_container", return_value=container):
+            assert admission.acquire_slot() is True
+        container.create_item.assert_called_once_with(
+            {"id": "inflight", "count": 0, "interactive": 0, "rss": 0, "rescore": 0, "bulk": 0})
+
+    def test_rate_window_weights_previous_bucket(self):
+        import admission
+        container = MagicMock()
+        container.read_item.return_value = {"count": 4}
+        now = 100 * admission.RATE_WINDOW_SECONDS + admission.RATE_WINDOW_SECONDS / 4  # 75% of last hour overlaps
+        with patch("admission._control_container", return_value=container):
+            assert admission.take_upload_token("1.2.3.4", limit=5, now=now) is True
+        # 5 - 4 * 0.75 = 2 → current bucket may hold at most 1 before this upload
+        assert container.patch_item.call_args[1]["filter_predicate"] == "FROM c WHERE c.count < 2"
+        assert container.patch_item.call_args[0][0].endswith("-100")
+
+    def test_rate_limited_without_write(self):
+        import admission
+        container = MagicMock()
+        container.read_item.return_value = {"count": 5}
+        with patch("admission._control_container", return_value=container):
+            assert admission.take_upload_token("1.2.3.4", limit=5, now=100 * admission.RATE_WINDOW_SECONDS) is False
+        container.patch_item.assert_not_called()
+
+    def test_orchestrator_releases_only_admitted_slots(self):
+        import orchestrators
+        context = MagicMock()
+        context.is_replaying = False
+        assert list(orchestrators._release_admission(context, {"sermonId": "s1"})) == []
+        steps = list(orchestrators._release_admission(context, {"sermonId": "s1", "admitted": True, "lane": "rss"}))
+        assert len(steps) == 1
+        name, _, payload = context.call_activity_with_retry.call_args[0]
+        assert name == "activity_release_slot" and payload["lane"] == "rss"
+
+
+# ── work queue ──
+
+class TestWorkQueue:
+    def _entry(self, sid, lane="interactive"):
+        return {"id": sid, "sermonId": sid, "lane": lane, "orchestrator": "sermon_orchestrator",
+                "inputArtifact": f"{sid}/pipeline-input.json.gz", "enqueuedAt": "2026-01-01T00:00:00Z",
+                "attempts": 0, "_etag": f"e-{sid}"}
+
+    def _lanes(self, queue, **by_lane):
+        queue.query_items.side_effect = lambda query, parameters=None, **kw: iter(by_lane.get(parameters[0]["value"], []))
+
+    @pytest.mark.asyncio
+    async def test_dispatch_starts_until_slots_run_out(self):
+        import work_queue
+        queue = MagicMock()
+        self._lanes(queue, interactive=[self._entry("s1"), self._entry("s2"), self._entry("s3")])
+        starter = AsyncMock()
+        with patch("work_queue._queue_container", return_value=queue), \
+             patch("work_queue._sermons_container", return_value=MagicMock()), \
+             patch("work_queue.get_artifact", return_value={"sermonId": "x"}), \
+             patch("work_queue._record_wait"), \
+             patch("admission.acquire_slot", side_effect=[True, True, False]):
+            started = await work_queue.dispatch(starter)
+        assert started == ["s1", "s2"]
+        assert starter.start_new.await_count == 2
+        args, kwargs = starter.start_new.await_args
+        assert args[0] == "sermon_orchestrator" and kwargs["instance_id"] == "s2"
+        assert kwargs["client_input"]["admitted"] is True
+        assert kwargs["client_input"]["lane"] == "interactive"
+        assert queue.delete_item.call_count == 2
+
+    @pytest.mark.asyncio
+    async def test_dispatch_drains_interactive_before_background_lanes(self):
+        import work_queue
+        queue = MagicMock()
+        self._lanes(queue, interactive=[self._entry("u1")], rss=[self._entry("r1"), self._entry("r2")],
+                    rescore=[{"id": "rescore-1", "sermonId": None, "lane": "rescore", "orchestrator": "rescore_orchestrator",
+                              "input": {"sermonIds": ["a"]}, "enqueuedAt": "2026-01-01T00:00:00Z", "_etag": "e"}])
+        starter = AsyncMock()
+        with patch("work_queue._queue_container", return_value=queue), \
+             patch("work_queue._sermons_container", return_value=MagicMock()), \
+             patch("work_queue.get_artifact", return_value={}), \
+             patch("work_queue._record_wait") as mock_record, \
+             patch("admission.acquire_slot", side_effect=[True, True, False, True]) as mock_acquire:
+            started = await work_queue.dispatch(starter)
+        assert started == ["u1", "r1", "rescore-1"]
+        assert [c[0][0] for c in mock_acquire.call_args_list] == ["interactive", "rss", "rss", "rescore"]
+        assert starter.start_new.await_args[1]["client_input"] == {"sermonIds": ["a"], "admitted": True, "lane": "rescore"}
+        assert [c[0][0] for c in mock_record.call_args_list] == ["interactive", "rss", "rescore"]
+
+    @pytest.mark.asyncio
+    async def test_lost_claim_returns_slot(self):
+        import work_queue
+        from azure.cosmos import exceptions
+        queue = MagicMock()
+        self._lanes(queue, interactive=[self._entry("s1")])
+        queue.delete_item.side_effect = exceptions.CosmosAccessConditionFailedError(status_code=412, message="x")
+        starter = AsyncMock()
+        with patch("work_queue._queue_container", return_value=queue), \
+             patch("admission.acquire_slot", return_value=True), \
+             patch("admission.release_slot") as mock_release:
+            assert await work_queue.dispatch(starter) == []
+        mock_release.assert_called_once()
+        starter.start_new.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_start_failure_requeues(self):
+        import work_queue
+        queue = MagicMock()
+        self._lanes(queue, interactive=[self._entry("s1")])
+        starter = AsyncMock()
+        starter.start_new.side_effect = RuntimeError("task hub down")
+        with patch("work_queue._queue_container", return_value=queue), \
+             patch("work_queue._sermons_container", return_value=MagicMock()), \
+             patch("work_queue.get_artifact", return_value={}), \
+             patch("admission.acquire_slot", return_value=True), \
+             patch("admission.release_slot") as mock_release:
+            assert await work_queue.dispatch(starter) == []
+        mock_release.assert_called_once()
+        requeued = queue.upsert_item.call_args[0][0]
+        assert requeued["attempts"] == 1 and "_etag" not in requeued
+
+    def test_lane_metrics(self):
+        import work_queue
+        queue = MagicMock()
+        queue.query_items.return_value = iter([{"lane": "rss", "queued": 4, "oldest": "2026-01-01T00:00:00Z"}])
+        control = MagicMock()
+        control.read_item.return_value = {"rssDispatched": 2, "rssWaitSecondsTotal": 90, "rssLastWaitSeconds": 60}
+        with patch("work_queue._queue_container", return_value=queue), \
+             patch("admission._control_container", return_value=control), \
+             patch("admission.slots_in_use", return_value={"count": 2, "interactive": 1, "rss": 1, "rescore": 0}):
+            metrics = work_queue.lane_metrics()
+        rss = metrics["lanes"]["rss"]
+        assert rss["queued"] == 4 and rss["running"] == 1 and rss["avgWaitSeconds"] == 45.0
+        assert rss["oldestWaitSeconds"] > 0
+        assert metrics["lanes"]["interactive"]["queued"] == 0
+        assert metrics["lanes"]["rescore"]["avgWaitSeconds"] is None
+        assert metrics["slots"]["inUse"] == 2
+
+
+# ── reaper ──
+
+class TestReaper:
+    def _status(self, runtime, name="sermon_orchestrator", client_input=None):
+        from azure.durable_functions.models.DurableOrchestrationStatus import DurableOrchestrationStatus
+        if runtime is None:
+            return DurableOrchestrationStatus(message="not found")
+        return DurableOrchestrationStatus(name=name, instanceId="s1", createdTime="2026-01-01T00:00:00Z",
+                                          runtimeStatus=runtime, input=client_input)
+
+    async def _reap(self, docs, statuses, slot_doc=None):
+        import reaper
+        sermons, control = MagicMock(), MagicMock()
+        sermons.query_items.return_value = iter(docs)
+        control.read_item.return_value = slot_doc or {"id": "inflight", "count": 0, "_ts": 0, "_etag": "e"}
+        client = AsyncMock()
+        client.get_status.side_effect = lambda iid, **kw: statuses[iid]
+        client.get_status_by.return_value = []
+        with patch("reaper._sermons_container", return_value=sermons), \
+             patch("admission._control_container", return_value=control), \
+             patch("work_queue.enqueue") as mock_enqueue:
+            report = await reaper.reap(client, now=10_000)
+        return report, sermons, control, mock_enqueue
+
+    @pytest.mark.asyncio
+    async def test_running_instance_left_alone(self):
+        report, sermons, _, mock_enqueue = await self._reap([{"id": "s1"}], {"s1": self._status("Running")})
+        assert report["reclaimed"] == 0
+        sermons.patch_item.assert_not_called()
+        mock_enqueue.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_double_fault_resubmitted_once(self):
+        status = self._status("Completed", client_input={"sermonId": "s1", "blobUrl": "b", "admitted": True, "lane": "interactive"})
+        report, sermons, _, mock_enqueue = await self._reap([{"id": "s1"}], {"s1": status})
+        assert report["resubmitted"] == ["s1"] and report["reclaimed"] == 1
+        mock_enqueue.assert_called_once_with("s1", "sermon_orchestrator", {"sermonId": "s1", "blobUrl": "b"}, lane="interactive")
+        kwargs = sermons.patch_item.call_args[1]
+        assert {"op": "set", "path": "/status", "value": "queued"} in kwargs["patch_operations"]
+        assert kwargs["filter_predicate"] == "FROM c WHERE c.status = 'processing'"
+
+    @pytest.mark.asyncio
+    async def test_resubmit_keeps_original_lane(self):
+        status = self._status("Terminated", name="rss_sermon_orchestrator",
+                              client_input={"sermonId": "s1", "audioUrl": "u", "admitted": True, "lane": "rss"})
+        report, _, _, mock_enqueue = await self._reap([{"id": "s1"}], {"s1": status})
+        assert report["resubmitted"] == ["s1"]
+        mock_enqueue.assert_called_once_with("s1", "rss_sermon_orchestrator", {"sermonId": "s1", "audioUrl": "u"}, lane="rss")
+
+    @pytest.mark.asyncio
+    async def test_missing_instance_or_resubmitted_already_fails(self):
+        status = self._status("Failed", client_input={"sermonId": "s2"})
+        report, sermons, _, mock_enqueue = await self._reap(
+            [{"id": "s1"}, {"id": "s2", "reaperResubmits": 1}], {"s1": self._status(None), "s2": status})
+        assert report["failed"] == ["s1", "s2"]
+        mock_enqueue.assert_not_called()
+        ops = sermons.patch_item.call_args[1]["patch_operations"]
+        assert {"op": "set", "path": "/status", "value": "failed"} in ops
+
+    @pytest.mark.asyncio
+    async def test_leaked_slots_reset_to_live_counts(self):
+        slot_doc = {"id": "inflight", "count": 3, "interactive": 2, "rss": 1, "rescore": 0, "_ts": 0, "_etag": "e"}
+        report, _, control, _ = await self._reap([], {}, slot_doc=slot_doc)
+        assert report["slotsReclaimed"] == 3
+        replaced = control.replace_item.call_args[0][1]
+        assert replaced == {"id": "inflight", "count": 0, "interactive": 0, "rss": 0, "rescore": 0, "bulk": 0}
+        assert control.replace_item.call_args[1]["etag"] == "e"
+
+    @pytest.mark.asyncio
+    async def test_live_import_children_counted_not_parent(self):
+        import reaper
+        parent = self._status("Running", name="bulk_import_orchestrator",
+                              client_input={"importId": "i", "admitted": True, "lane": "bulk"})
+        child = self._status("Running", name="text_sermon_orchestrator",
+                             client_input={"sermonId": "a", "admitted": True, "lane": "bulk"})
+        client = AsyncMock()
+        client.get_status_by.return_value = [MagicMock(instance_id="import-i"), MagicMock(instance_id="a")]
+        client.get_status_by.return_value[0].name = "bulk_import_orchestrator"
+        client.get_status_by.return_value[1].name = "text_sermon_orchestrator"
+        client.get_status.side_effect = lambda iid, **kw: {"import-i": parent, "a": child}[iid]
+        counts = await reaper._live_slots(client)
+        assert counts["count"] == 1 and counts["bulk"] == 1
+
+    @pytest.mark.asyncio
+    async def test_recently_moved_counter_not_touched(self):
+        slot_doc = {"id": "inflight", "count": 3, "interactive": 3, "_ts": 9_900, "_etag": "e"}
+        report, _, control, _ = await self._reap([], {}, slot_doc=slot_doc)
+        assert report["slotsReclaimed"] == 0
+        control.replace_item.assert_not_called()
+
+
+# ── bulk import ──
+
+class TestBulkImport:
+    WORDS = " ".join(["grace"] * 60)
+
+    def _zip(self, files):
+        import io, zipfile
+        buf = io.BytesIO()
+        with zipfile.ZipFile(buf, "w") as z:
+            for name, text in files.items():
+                z.writestr(name, text)
+        return buf.getvalue()
+
+    def test_zip_documents_titled_by_filename(self):
+        import bulk_import
+        body = self._zip({"2019/Easter Sunday.txt": self.WORDS, "notes.pdf": "x", "__MACOSX/._a.txt": "x"})
+        docs = list(bulk_import.iter_documents(body, "archive.zip"))
+        assert docs[0] == ("Easter Sunday.txt", self.WORDS, {"title": "Easter Sunday"}, None)
+        assert docs[1][0] == "notes.pdf" and "PDF" in docs[1][3]
+        assert len(docs) == 2
+
+    def test_malformed_docx_skipped_and_import_continues(self):
+        import bulk_import
+        broken = self._zip({"word/document.xml": "<w:document><unclosed>"})
+        body = self._zip({"a broken.docx": broken, "b ok.txt": self.WORDS})
+        docs = list(bulk_import.iter_documents(body, "archive.zip"))
+        assert docs[0] == ("a broken.docx", None, {}, "Could not extract text")
+        assert docs[1] == ("b ok.txt", self.WORDS, {"title": "b ok"}, None)
+
+    def test_fail_queued_only_touches_queued_sermons(self):
+        import bulk_import
+        from azure.cosmos import exceptions
+        container = MagicMock()
+        container.patch_item.side_effect = [None, exceptions.CosmosAccessConditionFailedError(status_code=412, message="x")]
+        assert bulk_import.fail_queued(container, ["a", "b"], "Import failed") == 1
+        kwargs = container.patch_item.call_args[1]
+        assert kwargs["filter_predicate"] == "FROM c WHERE c.status = 'queued'"
+        assert {"op": "set", "path": "/status", "value": "failed"} in kwargs["patch_operations"]
+
+    def test_ndjson_documents(self):
+        import bulk_import
+        body = (json.dumps({"text": self.WORDS, "title": "T", "pastor": "P", "date": "2020-01-05"}) + "\n\nnot json\n").encode()
+        docs = list(bulk_import.iter_documents(body, "", "application/x-ndjson"))
+        assert docs[0] == ("line 1", self.WORDS, {"title": "T", "pastor": "P", "date": "2020-01-05"}, None)
+        assert docs[1] == ("line 3", None, {}, "Invalid JSON")
+
+    def test_create_sermons_skips_short_and_queues_rest(self):
+        import bulk_import
+        container = MagicMock()
+        docs = [("a.txt", self.WORDS, {"title": "A"}, None), ("b.txt", "too short", {}, None), ("c.pdf", None, {}, "nope")]
+        with patch("bulk_import.put_artifact") as mock_put:
+            sermon_ids, skipped = bulk_import.create_sermons(container, "imp1", docs, {"pastor": "Default"})
+        assert len(sermon_ids) == 1
+        assert [s["name"] for s in skipped] == ["b.txt", "c.pdf"]
+        created = container.create_item.call_args[0][0]
+        assert created["status"] == "queued" and created["importId"] == "imp1" and created["pastor"] == "Default"
+        assert mock_put.call_args[0][0] == f"{sermon_ids[0]}/pipeline-input.json.gz"
+        assert mock_put.call_args[0][1]["transcript"] == self.WORDS
+
+    @pytest.mark.asyncio
+    async def test_endpoint_enqueues_one_parent_in_bulk_lane(self):
+        from routes.admin import admin_bulk_import
+        from azure.cosmos import CosmosClient
+        req = MagicMock(spec=func.HttpRequest)
+        req.headers = {"x-admin-key": "k"}
+        req.params = {"concurrency": "9"}
+        req.files = {}
+        req.get_body.return_value = (json.dumps({"text": self.WORDS}) + "\n").encode()
+        with patch.dict(os.environ, {"ADMIN_KEY": "k"}), \
+             patch.object(CosmosClient, "from_connection_string", return_value=MagicMock()), \
+             patch("bulk_import.put_artifact"), \
+             patch("work_queue.enqueue") as mock_enqueue, \
+             patch("work_queue.dispatch", new_callable=AsyncMock, return_value=[]):
+            resp = await admin_bulk_import(req, starter=TestUploadValidation._make_mock_starter_json(None))
+        assert resp.status_code == 202
+        body = json.loads(resp.get_body())
+        assert body["count"] == 1 and body["status"] == "queued"
+        args, kwargs = mock_enqueue.call_args
+        assert args[1] == "bulk_import_orchestrator" and kwargs["lane"] == "bulk"
+        assert args[2]["concurrency"] == 2
+        assert kwargs["instance_id"] == body["instanceId"]
+
+    def test_failed_import_fails_unstarted_children(self):
+        import datetime
+        import orchestrators
+        fn = orchestrators.bulk_import_orchestrator._function.get_user_function().orchestrator_function
+        ctx = MagicMock()
+        ctx.is_replaying = False
+        ctx.current_utc_datetime = datetime.datetime(2026, 1, 1)
+        ctx.get_input.return_value = {"importId": "imp1", "sermonIds": ["a", "b", "c"], "concurrency": 1,
+                                      "admitted": True, "lane": "bulk"}
+        ctx.call_activity_with_retry.side_effect = lambda name, retry, payload: ("activity", name, payload)
+        ctx.call_sub_orchestrator.side_effect = lambda name, payload, instance_id: MagicMock(result="ok")
+        ctx.task_any.side_effect = lambda tasks: ("any", tasks)
+
+        gen = fn(ctx)
+        step = gen.send(None)
+        assert step[1] == "activity_update_sermon"  # "a" → processing
+        assert gen.send(None)[0] == "any"
+        step = gen.throw(RuntimeError("host failure"))
+        assert step[1] == "activity_fail_queued_sermons" and step[2]["sermonIds"] == ["b", "c"]
+        with pytest.raises(RuntimeError):  # the running child still holds (and releases) the slot
+            gen.send(None)
+
+    def _run_import(self, free_slots, sermon_ids, concurrency=3):
+        """Drive bulk_import_orchestrator with a fake context; returns (slot log, peak children running, child inputs)."""
+        import datetime
+        import orchestrators
+        fn = orchestrators.bulk_import_orchestrator._function.get_user_function().orchestrator_function
+        ctx = MagicMock()
+        ctx.is_replaying = False
+        ctx.current_utc_datetime = datetime.datetime(2026, 1, 1)
+        ctx.get_input.return_value = {"importId": "imp1", "sermonIds": sermon_ids, "concurrency": concurrency,
+                                      "admitted": True, "lane": "bulk"}
+        ctx.call_activity_with_retry.side_effect = lambda name, retry, payload: ("activity", name, payload)
+        children = []
+        ctx.call_sub_orchestrator.side_effect = lambda name, payload, instance_id: children.append(payload) or MagicMock(result="ok")
+        ctx.task_any.side_effect = lambda tasks: ("any", tasks)
+
+        slots, running, peak = [], 0, 0
+        gen, reply = fn(ctx), None
+        try:
+            while True:
+                step = gen.send(reply)
+                reply = None
+                if isinstance(step, tuple) and step[0] == "any":
+                    running -= 1
+                    free_slots += 1  # the finished child released its slot
+                    reply = step[1][0]
+                elif isinstance(step, tuple) and step[1] == "activity_acquire_slot":
+                    ok = free_slots > 0
+                    free_slots -= ok
+                    slots.append("acquire" if ok else "full")
+                    reply = {"ok": ok}
+                elif isinstance(step, tuple) and step[1] == "activity_release_slot":
+                    slots.append("release")
+                elif isinstance(step, tuple) and step[1] == "activity_update_sermon" \
+                        and step[2]["updates"] == {"status": "processing"}:
+                    running += 1
+                    peak = max(peak, running)
+        except StopIteration as stop:
+            assert stop.value["completed"] == len(sermon_ids)
+        return slots, peak, children
+
+    def test_import_children_each_hold_a_slot(self):
+        slots, peak, children = self._run_import(free_slots=1, sermon_ids=["a", "b", "c"])
+        assert peak == 2  # the import's own slot (handed to "a") + the one free slot
+        assert slots.count("acquire") == 2  # "b", then "c" once "a" gave its slot back
+        assert "release" not in slots  # each child releases its own
+        assert all(c["admitted"] and c["lane"] == "bulk" for c in children)
+
+    def test_import_runs_one_at_a_time_when_lane_full(self):
+        slots, peak, _ = self._run_import(free_slots=0, sermon_ids=["a", "b"])
+        assert peak == 1
+        assert slots == ["full", "acquire"]
+
+    def test_enqueue_keeps_artifact_reference_inline(self):
+        import work_queue
+        queue = MagicMock()
+        with patch("work_queue._queue_container", return_value=queue), \
+             patch("work_queue.put_artifact") as mock_put:
+            entry = work_queue.enqueue("s1", "text_sermon_orchestrator", {"sermonId": "s1", "inputArtifact": "s1/pipeline-input.json.gz"})
+        mock_put.assert_not_called()
+        assert entry["input"]["inputArtifact"] == "s1/pipeline-input.json.gz"
+
+
+# ── CBV church lookup ──
+
+class TestCbvLookup:
+    @pytest.mark.asyncio
+    async def test_cache_miss_reads_only_the_churchs_beliefs(self):
+        from routes.sermons import get_cbv_score
+        from azure.cosmos import CosmosClient
+        sermons, churches = MagicMock(), MagicMock()
+        sermons.query_items.side_effect = lambda query, **kw: (
+            [{"fullText": "word " * 100}] if "c.transcript" in query
+            else [{"id": "s1", "pastor": "P", "churchId": "grace", "_etag": '"e"'}])
+        churches.query_items.return_value = [[{"title": "Grace", "description": "saved by grace"}]]
+        db = MagicMock()
+        db.get_container_client.side_effect = lambda name: {"sermons": sermons, "churches": churches}[name]
+        cosmos = MagicMock()
+        cosmos.get_database_client.return_value = db
+        req = MagicMock(spec=func.HttpRequest)
+        req.route_params = {"sermon_id": "s1"}
+        req.headers = {}
+        client = MagicMock()
+        client.chat.completions.create.return_value.choices = [MagicMock()]
+        client.chat.completions.create.return_value.choices[0].message.content = json.dumps(
+            {"results": [{"title": "Grace", "referenced": True}]})
+        with patch.object(CosmosClient, "from_connection_string", return_value=cosmos), \
+             patch("activities.helpers._openai_client", return_value=client):
+            resp = await get_cbv_score(req)
+        assert resp.status_code == 200
+        query, kwargs = churches.query_items.call_args[0][0], churches.query_items.call_args[1]
+        assert query == "SELECT VALUE c.beliefs FROM c WHERE c.id = @id"
+        assert kwargs["partition_key"] == "grace" and "enable_cross_partition_query" not in kwargs
+        assert "saved by grace" in client.chat.completions.create.call_args[1]["messages"][1]["content"]
+        sermons.read_item.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_cached_result_reads_only_the_cbv_projection(self):
+        from routes.sermons import get_cbv_score
+        from azure.cosmos import CosmosClient
+        sermons = MagicMock()
+        sermons.query_items.return_value = [{"id": "s1", "cbv": {"results": []}, "_etag": '"e"'}]
+        cosmos = MagicMock()
+        cosmos.get_database_client.return_value.get_container_client.return_value = sermons
+        req = MagicMock(spec=func.HttpRequest)
+        req.route_params = {"sermon_id": "s1"}
+        req.headers = {}
+        with patch.object(CosmosClient, "from_connection_string", return_value=cosmos):
+            resp = await get_cbv_score(req)
+        assert json.loads(resp.get_body()) == {"results": []}
+        sermons.read_item.assert_not_called()
+        assert sermons.query_items.call_count == 1
+        query = sermons.query_items.call_args[0][0]
+        assert 'c["cbv"]' in query and "transcript" not in query
+        assert sermons.query_items.call_args[1]["partition_key"] == "s1"
+
+    def test_unassigned_sermon_resolves_through_pastor_index(self):
+        import cbv
+        db = MagicMock()
+        with patch("pastor_index.lookup", return_value={"churchId": "hope", "church": "Hope"}):
+            assert cbv.resolve_church_id(db, {"pastor": "P", "churchId": "church-unassigned"}) == "hope"
+        db.get_container_client.assert_not_called()
+
+
+class TestCbvBatch:
+    def _client(self, content):
+        client = MagicMock()
+        client.chat.completions.create.return_value.choices = [MagicMock()]
+        client.chat.completions.create.return_value.choices[0].message.content = json.dumps(content)
+        return client
+
+    def test_plan_batches_respects_word_budget_and_size(self):
+        import cbv
+        sermons = [{"id": f"s{i}", "words": w} for i, w in enumerate([5000, 4000, 4000, 500, 100, 100, 100, None])]
+        batches = cbv.plan_batches(sermons)
+        assert batches == [["s0", "s1", "s2"], ["s3", "s4", "s5", "s6"], ["s7"]]
+
+    def test_batch_request_maps_results_by_id(self):
+        import cbv
+        client = self._client({"sermons": [{"id": "a", "results": [{"title": "Grace", "referenced": True}]},
+                                           {"id": "zzz", "results": []}]})
+        out = cbv.check_sermons(client, [{"title": "Grace"}], [("a", "text a"), ("b", "text b")])
+        assert out == {"a": {"results": [{"title": "Grace", "referenced": True}]}}
+        prompt = client.chat.completions.create.call_args[1]["messages"][1]["content"]
+        assert "Sermon a:\ntext a" in prompt and "Sermon b:\ntext b" in prompt
+
+    def test_compute_stores_beliefs_hash(self):
+        import cbv
+        beliefs = [{"title": "Grace", "description": "d"}]
+        sermons = MagicMock()
+        sermons.read_item.side_effect = lambda sid, **kw: {"id": sid, "transcript": {"fullText": f"text {sid}"}}
+        db = MagicMock()
+        db.get_container_client.return_value = sermons
+        client = self._client({"sermons": [{"id": "a", "results": []}, {"id": "b", "results": []}]})
+        assert cbv.compute(db, client, "grace", ["a", "b"], beliefs=beliefs) == ["a", "b"]
+        ops = sermons.patch_item.call_args[1]["patch_operations"]
+        assert {"op": "set", "path": "/cbvBeliefsHash", "value": cbv.beliefs_hash(beliefs)} in ops
+        assert client.chat.completions.create.call_count == 1
+
+    def test_beliefs_hash_changes_with_beliefs(self):
+        import cbv
+        assert cbv.beliefs_hash([{"title": "A"}]) == cbv.beliefs_hash([{"title": "A"}])
+        assert cbv.beliefs_hash([{"title": "A"}]) != cbv.beliefs_hash([{"title": "A", "description": "x"}])
+
+
+# ── Translation ──
+
+class TestTranslation:
+    def _resp(self, status, payload=None, headers=None):
+        resp = MagicMock()
+        resp.status_code = status
+        resp.headers = headers or {}
+        resp.json.return_value = payload
+        return resp
+
+    def test_chunks_on_sentences_and_reassembles_layout(self):
+        import translation
+        text = "Grace abounds. Does it? Yes!\n\nSecond paragraph " + "word " * 400
+        units = translation.chunk_text(text)
+        assert "".join(u["text"] + u["sep"] for u in units) == text
+        assert [u["text"] for u in units[:3]] == ["Grace abounds.", "Does it?", "Yes!"]
+        assert all(len(u["text"]) <= translation.MAX_UNIT_CHARS for u in units)
+        assert all(not u["text"].endswith("wor") for u in units)
+
+    def test_pack_respects_element_and_char_limits(self):
+        import translation
+        units = [{"text": "x" * 30_000, "sep": ""}, {"text": "y" * 30_000, "sep": ""}, {"text": "", "sep": "\n"}]
+        units += [{"text": "z", "sep": ""}] * 1500
+        batches = translation.pack_requests(units)
+        assert batches[0] == [0] and batches[1][0] == 1
+        assert 2 not in sum(batches, [])
+        assert all(len(b) <= translation.MAX_REQUEST_ELEMENTS for b in batches)
+
+    def test_retries_429_with_retry_after(self):
+        import translation
+        session = MagicMock()
+        session.post.side_effect = [self._resp(429, headers={"Retry-After": "3"}),
+                                    self._resp(200, [{"translations": [{"text": "Hola."}]}])]
+        with patch("translation.time.sleep") as mock_sleep:
+            assert translation._post(session, ["Hello."], "es", "k", "r") == ["Hola."]
+        mock_sleep.assert_called_once_with(3.0)
+
+    def test_translate_text_keeps_order_across_requests(self):
+        import translation
+        session = MagicMock()
+        session.__enter__.return_value = session
+        session.post.side_effect = lambda url, json, **kw: self._resp(
+            200, [{"translations": [{"text": item["Text"].upper()}]} for item in json])
+        with patch.dict(os.environ, {"TRANSLATOR_KEY": "k"}), \
+             patch("translation.MAX_REQUEST_ELEMENTS", 2), \
+             patch("translation._session", return_value=session), \
+             patch("translation_memory.lookup", return_value={}), \
+             patch("translation_memory.remember"):
+            out, stats = translation.translate_text("One. Two. Three.\nFour. Five.", "es")
+        assert out == "ONE. TWO. THREE.\nFOUR. FIVE."
+        assert stats["requests"] == 3 and stats["units"] == 5
+
+    @pytest.mark.asyncio
+    async def test_long_transcript_starts_background_job(self):
+        from routes.sermons import translate_sermon
+        from azure.cosmos import CosmosClient
+        import azure.durable_functions as df
+        container = MagicMock()
+        container.read_item.return_value = {"id": "s1", "transcript": {"fullText": "Amen. " * 5000}}
+        cosmos = MagicMock()
+        cosmos.get_database_client.return_value.get_container_client.return_value = container
+        req = MagicMock(spec=func.HttpRequest)
+        req.route_params = {"sermon_id": "s1"}
+        req.get_json.return_value = {"language": "es"}
+        with patch.dict(os.environ, {"TRANSLATOR_KEY": "k"}), \
+             patch.object(CosmosClient, "from_connection_string", return_value=cosmos), \
+             patch.object(df.DurableOrchestrationClient, "get_status", new_callable=AsyncMock, return_value=None), \
+             patch.object(df.DurableOrchestrationClient, "start_new", new_callable=AsyncMock) as mock_start, \
+             patch("translation.translate_text") as mock_translate:
+            resp = await translate_sermon(req, starter=TestUploadValidation._make_mock_starter_json(None))
+        assert resp.status_code == 202
+        assert json.loads(resp.get_body())["instanceId"] == "translate-s1-es"
+        assert mock_start.call_args[0] == ("translation_orchestrator", "translate-s1-es", {"sermonId": "s1", "language": "es"})
+        mock_translate.assert_not_called()
+
+    def test_memory_hits_skip_the_service_and_are_reported(self):
+        import translation
+        blessing = "The Lord bless you and keep you."
+        text = f"{blessing} Welcome to our church today.\n{blessing}"
+        with patch.dict(os.environ, {"TRANSLATOR_KEY": "k"}), \
+             patch("translation_memory.lookup", return_value={blessing: "El Señor te bendiga y te guarde."}), \
+             patch("translation_memory.remember") as mock_remember, \
+             patch("translation.translate_texts", side_effect=lambda texts, lang: [t.upper() for t in texts]) as mock_translate:
+            out, stats = translation.translate_text(text, "es")
+        assert out == "El Señor te bendiga y te guarde. WELCOME TO OUR CHURCH TODAY.\nEl Señor te bendiga y te guarde."
+        assert mock_translate.call_args[0][0] == ["Welcome to our church today."]
+        assert list(mock_remember.call_args[0][0]) == [("Welcome to our church today.", "WELCOME TO OUR CHURCH TODAY.")]
+        assert stats["memoryHits"] == 2 and stats["memoryHitRate"] == round(2 / 3, 3)
+        assert stats["charactersSaved"] == 2 * len(blessing)
+
+    def test_memory_lookup_normalises_and_checks_text(self):
+        import translation_memory
+        source = "Grace  and peace to you\nfrom God our Father."
+        normalised = translation_memory.normalize(source)
+        doc_id = translation_memory.entry_id(normalised, "es")
+        container = MagicMock()
+        container.read_items.return_value = [{"id": doc_id, "text": normalised, "translation": "Gracia y paz"}]
+        with patch("translation_memory._memory_container", return_value=container):
+            assert translation_memory.lookup([source, "Amen."], "es") == {normalised: "Gracia y paz"}
+        assert container.read_items.call_args[0][0] == [(doc_id, doc_id)]
+        assert normalised == "Grace and peace to you from God our Father."
+
+
+class TestScoringSimulateEndpoint:
+    def _req(self, body):
+        req = MagicMock(spec=func.HttpRequest)
+        req.headers = {"x-admin-key": "k"}
+        req.params = {}
+        req.get_body.return_value = json.dumps(body).encode()
+        req.get_json.return_value = body
+        return req
+
+    @pytest.mark.asyncio
+    async def test_reports_movers_without_llm_calls(self):
+        from routes.admin import admin_simulate_scoring
+        from azure.cosmos import CosmosClient
+        scores = {k: 90 for k in ("biblicalAccuracy", "timeInTheWord", "passageFocus", "clarity",
+                                  "engagement", "application", "delivery", "emotionalRange")}
+        container = MagicMock()
+        container.query_items.return_value = [
+            {"id": "s1", "title": "A", "rawScores": {**scores, "delivery": 40}, "sermonType": "expository",
+             "classificationConfidence": 95, "hasAudio": True, "compositePsr": 85.0},
+            {"id": "s2", "title": "B", "rawScores": scores, "sermonType": "expository",
+             "classificationConfidence": 95, "hasAudio": True, "compositePsr": 90.0},
+        ]
+        mock_cosmos = MagicMock()
+        mock_cosmos.get_database_client.return_value.get_container_client.return_value = container
+        weights = {"biblicalAccuracy": 25, "timeInTheWord": 20, "passageFocus": 10, "clarity": 10,
+                   "engagement": 10, "application": 10, "delivery": 15, "emotionalRange": 0}
+        with patch.dict(os.environ, {"ADMIN_KEY": "k"}), \
+             patch.object(CosmosClient, "from_connection_string", return_value=mock_cosmos), \
+             patch("activities.helpers._openai_client") as mock_llm:
+            resp = await admin_simulate_scoring(self._req({"config": {"weights": weights}}))
+
+        assert resp.status_code == 200
+        body = json.loads(resp.get_body())
+        assert body["sermons"] == 2 and body["storedMismatch"] == 0
+        assert body["topMovers"][0] == {"id": "s1", "title": "A", "current": 85.0, "proposed": 82.5, "delta": -2.5,
+                                        "rankBefore": 2, "rankAfter": 2}
+        mock_llm.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_bad_config_is_400(self):
+        from routes.admin import admin_simulate_scoring
+        with patch.dict(os.environ, {"ADMIN_KEY": "k"}):
+            resp = await admin_simulate_scoring(self._req({"config": {"weights": {"delivery": 90}}}))
+        assert resp.status_code == 400
+
+
+class TestRescoreRecompute:
+    @pytest.mark.asyncio
+    async def test_recompute_all_starts_bulk_job_without_listing_ids(self):
+        from routes.admin import admin_rescore
+        from azure.cosmos import CosmosClient
+        import azure.durable_functions as df
+        req = MagicMock(spec=func.HttpRequest)
+        req.headers = {"x-admin-key": "k"}
+        req.params = {}
+        req.get_body.return_value = b"{}"
+        req.get_json.return_value = {"all": True, "passes": ["recompute"], "staleOnly": True}
+        with patch.dict(os.environ, {"ADMIN_KEY": "k"}), \
+             patch.object(CosmosClient, "from_connection_string") as mock_cosmos, \
+             patch("work_queue.enqueue") as mock_enqueue, \
+             patch.object(df.DurableOrchestrationClient, "start_new", new_callable=AsyncMock, return_value="rc-1") as mock_start:
+            resp = await admin_rescore(req, starter=TestUploadValidation._make_mock_starter_json(None))
+        assert resp.status_code == 202
+        assert mock_start.call_args[0][0] == "recompute_orchestrator"
+        assert mock_start.call_args[1]["client_input"] == {"sermonIds": None, "staleOnly": True}
+        mock_cosmos.assert_not_called()
+        mock_enqueue.assert_not_called()
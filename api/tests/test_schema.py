@@ -205,6 +205,20 @@ class TestNormalizeScores:
         _, applied = normalize_scores(_raw_scores(80), "topical", 79)
         assert applied == "none"
 
+    def test_scored_with_audio_prefers_recorded_flag(self):
+        from schema import scored_with_audio
+        assert scored_with_audio(False, "audio", True, False) is False
+        assert scored_with_audio(None, "audio", False, False) is True  # audio pipeline, analysis failed
+        assert scored_with_audio(None, "audio", False, True) is False  # LLM rescore without audioMetrics
+        assert scored_with_audio(None, "text", False, False) is False
+
+    def test_missing_scoring_version_is_not_stale(self):
+        from schema import detect_stale_passes, SCORING_CODE_VERSION
+        with patch.dict("schema.PASS_HASHES", {}, clear=True):
+            assert detect_stale_passes({}) == []
+            assert detect_stale_passes({"scoringCodeVersion": SCORING_CODE_VERSION}) == []
+            assert detect_stale_passes({"scoringCodeVersion": "old"}) == ["recompute"]
+
 
 # ── build_summary_prompt ──
 
@@ -373,3 +387,82 @@ class TestValidateFlatResponse:
     def test_markdown_fences(self):
         result = validate_flat_response('```json\n{"a": 1}\n```', {})
         assert result["a"] == 1
+
+
+# ── scoring_sim (vectorised what-if) ──
+
+class TestScoringSimulator:
+    def _scalar(self, row):
+        from schema import consistency_check
+        raw = {k: {"score": v, "reasoning": ""} for k, v in row["rawScores"].items()}
+        enrichment = None
+        if row["hasEnrichment"]:
+            enrichment = {"biblicalLanguages": {"count": row["languageRefs"]},
+                          "churchHistory": {"count": row["historyRefs"]},
+                          "illustrations": {"total": row["illustrations"],
+                                            "byType": {"personalStory": ["x"] * row["personalStories"]}}}
+        cats, _ = normalize_scores(raw, row["sermonType"], row["classificationConfidence"],
+                                   audio_available=row["audioAvailable"])
+        cats, _ = consistency_check(cats, enrichment)
+        return compute_composite(cats)
+
+    def _rows(self, n=400):
+        import random
+        rng = random.Random(7)
+        return [{
+            "id": f"s{i}", "title": f"S{i}",
+            "rawScores": {k: rng.randint(5, 100) for k in CATEGORY_WEIGHTS},
+            "sermonType": rng.choice(["expository", "topical", "survey", "other"]),
+            "classificationConfidence": rng.choice([70, 79, 80, 85, 90, 97]),
+            "audioAvailable": rng.random() < 0.7, "hasAudio": rng.random() < 0.5, "hasEnrichment": rng.random() < 0.8,
+            "languageRefs": rng.randint(0, 4), "historyRefs": rng.randint(0, 2),
+            "illustrations": rng.randint(0, 3), "personalStories": rng.randint(0, 1),
+        } for i in range(n)]
+
+    def test_default_config_matches_scalar_pipeline(self):
+        import scoring_sim
+        rows = self._rows()
+        simulated = scoring_sim.simulate(scoring_sim.Corpus(rows), scoring_sim.resolve_config())
+        assert [float(x) for x in simulated] == [self._scalar(r) for r in rows]
+
+    def test_legacy_rows_use_the_scoring_audio_rule(self):
+        import scoring_sim
+        rows = [{**r, "audioAvailable": None, "hasAudio": False} for r in self._rows(3)]
+        rows[1]["inputType"] = "text"
+        rows[2]["rescored"] = True
+        assert scoring_sim.Corpus(rows).audio.tolist() == [True, False, False]
+
+    def test_proposed_weights_match_patched_constants(self):
+        import scoring_sim
+        rows = self._rows(100)
+        weights = {**CATEGORY_WEIGHTS, "biblicalAccuracy": 35, "delivery": 5, "emotionalRange": 0}
+        simulated = scoring_sim.simulate(scoring_sim.Corpus(rows), scoring_sim.resolve_config(
+            {"weights": weights, "gravity": {"threshold": 50}}))
+        with patch.dict("schema.CATEGORY_WEIGHTS", weights), patch.dict("schema.BIBLICAL_GRAVITY", {"threshold": 50}):
+            expected = [self._scalar(r) for r in rows]
+        assert [float(x) for x in simulated] == expected
+
+    def test_compare_reports_distribution_and_movers(self):
+        import scoring_sim
+        report = scoring_sim.compare(scoring_sim.Corpus(self._rows(50)),
+                                     {"normAdjustments": {"topical": {"passageFocus": 20}}}, top=5)
+        assert report["sermons"] == 50 and report["current"]["count"] == 50
+        assert sum(b["count"] for b in report["proposed"]["histogram"]) == 50
+        assert 0 < len(report["topMovers"]) <= 5
+        assert all(m["delta"] > 0 for m in report["topMovers"])
+        assert report["changed"] >= len(report["topMovers"])
+
+    def test_rejects_bad_config(self):
+        import scoring_sim
+        with pytest.raises(ValueError, match="sum to 100"):
+            scoring_sim.resolve_config({"weights": {"delivery": 50}})
+        with pytest.raises(ValueError, match="Unknown"):
+            scoring_sim.resolve_config({"weight": {}})
+
+    def test_100k_sermons_well_under_a_second(self):
+        import time
+        import scoring_sim
+        corpus = scoring_sim.synthetic_corpus(100_000)
+        started = time.perf_counter()
+        scoring_sim.compare(corpus, {"weights": {**CATEGORY_WEIGHTS, "timeInTheWord": 15, "passageFocus": 15}})
+        assert time.perf_counter() - started < 1.0
@@ -0,0 +1,228 @@
+"""Transcript translation through Azure Translator.
+
+* Chunking — the transcript is split into paragraphs (segment/line breaks)
+  and then sentences; a sentence is never cut mid-word, and runs without
+  punctuation are split at word boundaries past MAX_UNIT_CHARS. Each unit
+  keeps the whitespace that followed it, so the translation is reassembled
+  with the original paragraph layout.
+* Packing — many units go in one request, up to the service limits
+  (MAX_REQUEST_ELEMENTS array elements, MAX_REQUEST_CHARS characters).
+* Concurrency — up to TRANSLATE_CONCURRENCY requests in flight over one
+  pooled ``requests.Session``.
+* Backoff — 429 and 5xx are retried, honouring ``Retry-After`` when the
+  service sends it.
+* Memory — units already translated for any sermon come from
+  translation_memory instead of the service.
+
+Short transcripts are translated inside the HTTP request; longer ones run
+as ``translation_orchestrator`` (see translate_sermon / translation_status).
+"""
+
+import concurrent.futures
+import os
+import re
+import time
+
+from log import log
+
+TRANSLATOR_URL = "https://api.cognitive.microsofttranslator.com/translate"
+MAX_REQUEST_ELEMENTS = 1000
+MAX_REQUEST_CHARS = 50_000
+MAX_UNIT_CHARS = 1000
+TRANSLATE_CONCURRENCY = 4
+MAX_ATTEMPTS = 4
+MAX_BACKOFF_SECONDS = 30
+INLINE_MAX_CHARS = 15_000  # longer transcripts are translated by a durable job
+
+_SENTENCE_END = re.compile(r"(?<=[.!?…])[\"'”’)\]]*\s+")
+_PARAGRAPH_BREAK = re.compile(r"(\s*\n\s*)")
+
+
+class TranslationError(Exception):
+    """Translator rejected the request or stayed unavailable after retries."""
+
+    def __init__(self, message, status_code=None):
+        super().__init__(message)
+        self.status_code = status_code
+
+
+def _split_long(sentence):
+    """Split an over-long run (no sentence punctuation) at word boundaries."""
+    parts, start = [], 0
+    while len(sentence) - start > MAX_UNIT_CHARS:
+        cut = sentence.rfind(" ", start, start + MAX_UNIT_CHARS)
+        if cut <= start:
+            cut = start + MAX_UNIT_CHARS
+        parts.append(sentence[start:cut + 1])
+        start = cut + 1
+    parts.append(sentence[start:])
+    return [p for p in parts if p]
+
+
+def chunk_text(text):
+    """Split ``text`` into translation units: [{"text", "sep"}], where "".join(text + sep) == text."""
+    units = []
+    pieces = _PARAGRAPH_BREAK.split(text)
+    for i in range(0, len(pieces), 2):
+        paragraph = pieces[i]
+        paragraph_sep = pieces[i + 1] if i + 1 < len(pieces) else ""
+        if not paragraph.strip():
+            if units:
+                units[-1]["sep"] += paragraph + paragraph_sep
+            elif paragraph + paragraph_sep:
+                units.append({"text": "", "sep": paragraph + paragraph_sep})
+            continue
+        pos = 0
+        for match in _SENTENCE_END.finditer(paragraph):
+            end = match.end()
+            stripped_end = end - (len(match.group(0)) - len(match.group(0).rstrip()))
+            units.extend(_units(paragraph[pos:stripped_end], paragraph[stripped_end:end]))
+            pos = end
+        if pos < len(paragraph):
+            units.extend(_units(paragraph[pos:], ""))
+        units[-1]["sep"] += paragraph_sep
+    return units
+
+
+def _units(sentence, sep):
+    parts = _split_long(sentence)
+    units = [{"text": p.rstrip(" "), "sep": p[len(p.rstrip(" ")):]} for p in parts]
+    units[-1]["sep"] += sep
+    return units
+
+
+def pack_requests(units):
+    """Group unit indexes into requests within the element and character limits."""
+    requests_, current, chars = [], [], 0
+    for i, unit in enumerate(units):
+        size = len(unit["text"])
+        if not size:
+            continue
+        if current and (len(current) >= MAX_REQUEST_ELEMENTS or chars + size > MAX_REQUEST_CHARS):
+            requests_.append(current)
+            current, chars = [], 0
+        current.append(i)
+        chars += size
+    if current:
+        requests_.append(current)
+    return requests_
+
+
+def _retry_after(resp, attempt):
+    header = resp.headers.get("Retry-After")
+    try:
+        return min(float(header), MAX_BACKOFF_SECONDS)
+    except (TypeError, ValueError):
+        return min(2 ** attempt, MAX_BACKOFF_SECONDS)
+
+
+def _session(pool_size):
+    import requests
+    from requests.adapters import HTTPAdapter
+    session = requests.Session()
+    session.mount("https://", HTTPAdapter(pool_connections=1, pool_maxsize=pool_size))
+    return session
+
+
+def _credentials():
+    key = os.environ.get("TRANSLATOR_KEY", "")
+    if not key:
+        raise TranslationError("Translation service not configured")
+    return key, os.environ.get("TRANSLATOR_REGION", "eastus2")
+
+
+def is_configured():
+    return bool(os.environ.get("TRANSLATOR_KEY"))
+
+
+def _post(session, texts, target_lang, key, region):
+    for attempt in range(MAX_ATTEMPTS):
+        resp = session.post(
+            TRANSLATOR_URL,
+            params={"api-version": "3.0", "to": target_lang},
+            headers={"Ocp-Apim-Subscription-Key": key, "Ocp-Apim-Subscription-Region": region,
+                     "Content-Type": "application/json"},
+            json=[{"Text": t} for t in texts],
+            timeout=60,
+        )
+        if resp.status_code == 200:
+            return [item["translations"][0]["text"] for item in resp.json()]
+        if resp.status_code == 429 or resp.status_code >= 500:
+            if attempt + 1 < MAX_ATTEMPTS:
+                delay = _retry_after(resp, attempt)
+                log.warning(f"[translation] {resp.status_code}, retrying in {delay}s")
+                time.sleep(delay)
+                continue
+            raise TranslationError("Translation rate limited", resp.status_code)
+        log.error(f"[translation] Azure Translator error: {resp.status_code} {resp.text}")
+        raise TranslationError("Translation failed", resp.status_code)
+    raise TranslationError("Translation failed")
+
+
+def translate_texts(texts, target_lang):
+    """Translate a list of strings, packing and parallelising requests. Returns the list in order."""
+    key, region = _credentials()
+    units = [{"text": t, "sep": ""} for t in texts]
+    batches = pack_requests(units)
+    result = list(texts)
+    if not batches:
+        return result
+    workers = min(TRANSLATE_CONCURRENCY, len(batches))
+    with _session(workers) as session, concurrent.futures.ThreadPoolExecutor(max_workers=workers) as pool:
+        futures = {pool.submit(_post, session, [texts[i] for i in batch], target_lang, key, region): batch
+                   for batch in batches}
+        for future in concurrent.futures.as_completed(futures):
+            for i, translated in zip(futures[future], future.result()):
+                result[i] = translated
+    return result
+
+
+def translate_text(text, target_lang):
+    """Translate a whole transcript. Returns (translated_text, stats).
+
+    Units found in translation_memory, and repeats within the transcript,
+    aren't sent to the service; new translations are added to the memory.
+    """
+    import translation_memory
+    units = chunk_text(text)
+    keys = [translation_memory.normalize(u["text"]) for u in units]
+    try:
+        remembered = translation_memory.lookup(keys, target_lang)
+    except Exception as e:
+        log.warning(f"[translation] memory lookup failed, translating everything: {e}")
+        remembered = {}
+
+    pending = list(dict.fromkeys(k for k in keys if k and k not in remembered))
+    fresh = dict(zip(pending, translate_texts(pending, target_lang)))
+    try:
+        translation_memory.remember(fresh.items(), target_lang)
+    except Exception as e:
+        log.warning(f"[translation] memory store failed: {e}")
+
+    translated = {**remembered, **fresh}
+    characters = sum(len(k) for k in keys)
+    hits = sum(1 for k in keys if k in remembered)
+    sent = sum(len(k) for k in pending)
+    stats = {
+        "units": len(units), "requests": len(pack_requests([{"text": k} for k in pending])),
+        "characters": characters, "charactersSent": sent, "charactersSaved": characters - sent,
+        "memoryHits": hits, "memoryHitRate": round(hits / len([k for k in keys if k]), 3) if any(keys) else 0.0,
+    }
+    out = "".join(translated.get(k, u["text"]) + u["sep"] for k, u in zip(keys, units))
+    return out, stats
+
+
+def translate_and_store(container, doc, target_lang, text=None):
+    """Translate a sermon doc's transcript and save it as a translation artifact. Returns (text, stats)."""
+    from store import load_transcript, save_translation, set_translation_artifacts
+    sermon_id = doc["id"]
+    if text is None:
+        text = load_transcript(doc)["fullText"]
+    translated, stats = translate_text(text, target_lang)
+    set_translation_artifacts(container, sermon_id, {target_lang: save_translation(sermon_id, target_lang, translated)})
+    log.info(f"[translation] {sermon_id} → {target_lang}: {stats}")
+    return translated, stats
+
+
+def job_instance_id(sermon_id, target_lang):
+    return f"translate-{sermon_id}-{target_lang}"
@@ -0,0 +1,96 @@
+"""Segment-level translation memory shared across sermons.
+
+Scripture quotations, liturgy, benedictions and weekly announcements repeat
+from sermon to sermon; translate_text checks this memory before paying the
+Translator for a unit. One document per (normalised unit text, target
+language) on the ``translation-memory`` container:
+
+    {"id": "tm-es-<hash>", "language": "es", "text": "The Lord bless you…", "translation": "El Señor te bendiga…"}
+
+Lookups are one batched ``read_items`` per job. Entries expire
+ENTRY_TTL_SECONDS after their last write, so lines that stop recurring age
+out. Units shorter than MIN_CHARS aren't stored ("Amen." costs less to
+translate than to look up).
+"""
+
+import concurrent.futures
+import hashlib
+import os
+import re
+import unicodedata
+
+from log import log
+
+MIN_CHARS = 20
+ENTRY_TTL_SECONDS = 180 * 24 * 3600
+WRITE_CONCURRENCY = 8
+
+_container = None
+
+
+def normalize(text):
+    """Whitespace- and Unicode-form-insensitive version of a unit (case and punctuation kept)."""
+    return re.sub(r"\s+", " ", unicodedata.normalize("NFC", text or "")).strip()
+
+
+def entry_id(normalised, target_lang):
+    return f"tm-{target_lang}-{hashlib.sha256(normalised.encode()).hexdigest()[:32]}"
+
+
+def _memory_container():
+    """Get or create the translation-memory container (per-item TTL, point reads only)."""
+    global _container
+    if _container is None:
+        from azure.cosmos import CosmosClient
+        cosmos = CosmosClient.from_connection_string(os.environ["COSMOS_CONNECTION_STRING"])
+        db = cosmos.get_database_client("psr")
+        try:
+            _container = db.create_container_if_not_exists(
+                id="translation-memory", partition_key={"paths": ["/id"], "kind": "Hash"},
+                default_ttl=ENTRY_TTL_SECONDS,
+            )
+        except Exception:
+            _container = db.get_container_client("translation-memory")
+    return _container
+
+
+def lookup(texts, target_lang):
+    """Remembered translations for ``texts``: {normalised text: translation}."""
+    wanted = {}
+    for text in texts:
+        normalised = normalize(text)
+        if len(normalised) >= MIN_CHARS:
+            wanted[entry_id(normalised, target_lang)] = normalised
+    if not wanted:
+        return {}
+    found = {}
+    for doc in _memory_container().read_items([(doc_id, doc_id) for doc_id in wanted]):
+        # Guard against hash collisions — the id only identifies a candidate
+        if doc.get("text") == wanted.get(doc["id"]):
+            found[doc["text"]] = doc["translation"]
+    return found
+
+
+def remember(pairs, target_lang):
+    """Store (source, translation) pairs. Best effort — failures are logged, not raised."""
+    docs = {}
+    for source, translated in pairs:
+        normalised = normalize(source)
+        if len(normalised) >= MIN_CHARS and translated:
+            doc_id = entry_id(normalised, target_lang)
+            docs[doc_id] = {"id": doc_id, "language": target_lang, "text": normalised, "translation": translated}
+    if not docs:
+        return 0
+    container = _memory_container()
+    with concurrent.futures.ThreadPoolExecutor(max_workers=WRITE_CONCURRENCY) as pool:
+        results = list(pool.map(_upsert, [container] * len(docs), docs.values()))
+    return sum(results)
+
+
+def _upsert(container, doc):
+    try:
+        container.upsert_item(doc)
+        return 1
+    except Exception as e:
+        log.warning(f"[translation_memory] failed to store {doc['id']}: {e}")
+        return 0
@@ -0,0 +1,249 @@
+"""Persistent queue of pipeline work waiting for a slot, split into priority lanes.
+
+Uploads, RSS polling and admin rescores no longer start orchestrators
+directly. They add an entry here (``queue`` container, one doc per unit of
+work); uploads and RSS also create the sermon doc with status ``queued``.
+
+Lanes, in dispatch order:
+
+* ``interactive`` — user uploads (audio, text, YouTube)
+* ``rss``         — feed polling and backfill
+* ``rescore``     — admin rescores
+* ``bulk``        — bulk imports (each running child holds its own slot)
+
+``dispatch`` walks the lanes in that order, starting each lane's entries
+oldest-first for as long as admission.acquire_slot(lane) hands out slots.
+Admission caps the background lanes and keeps RESERVED_INTERACTIVE slots
+for uploads, so a 50-episode backfill never holds a live upload back.
+Dispatch runs:
+
+* right after every enqueue (an idle pipeline starts the work immediately),
+* when an orchestrator finishes and releases its slot (activity_release_slot),
+* on a one-minute timer, as a safety net.
+
+Sermon pipeline inputs can be large (text uploads carry the whole
+transcript), so they are stored as a sermon artifact and the entry only
+references it. Inputs that already point at an artifact, and entries not
+tied to a sermon, are carried inline.
+"""
+
+import datetime
+import os
+import uuid
+
+from log import log
+from store import put_artifact, get_artifact, patch_fields
+import admission
+
+LANES = ("interactive", "rss", "rescore", "bulk")
+MAX_START_ATTEMPTS = 3
+STATS_DOC_ID = "queue-stats"
+
+_container = None
+
+
+def _queue_container():
+    """Get or create the queue Cosmos container (composite index for per-lane arrival order)."""
+    global _container
+    if _container is None:
+        from azure.cosmos import CosmosClient
+        cosmos = CosmosClient.from_connection_string(os.environ["COSMOS_CONNECTION_STRING"])
+        db = cosmos.get_database_client("psr")
+        try:
+            _container = db.create_container_if_not_exists(
+                id="queue", partition_key={"paths": ["/id"], "kind": "Hash"},
+                indexing_policy={
+                    "indexingMode": "consistent",
+                    "includedPaths": [{"path": "/*"}],
+                    "compositeIndexes": [[
+                        {"path": "/lane", "order": "ascending"},
+                        {"path": "/enqueuedAt", "order": "ascending"},
+                    ]],
+                },
+            )
+        except Exception:
+            _container = db.get_container_client("queue")
+    return _container
+
+
+def _sermons_container():
+    from azure.cosmos import CosmosClient
+    cosmos = CosmosClient.from_connection_string(os.environ["COSMOS_CONNECTION_STRING"])
+    return cosmos.get_database_client("psr").get_container_client("sermons")
+
+
+def _now():
+    return datetime.datetime.now(datetime.timezone.utc)
+
+
+def enqueue(sermon_id, orchestrator, client_input, lane="interactive", instance_id=None):
+    """Queue ``orchestrator`` in ``lane`` to run once a slot is free.
+
+    ``sermon_id`` is None for work that isn't tied to one sermon doc (a
+    rescore batch, a bulk import). The entry id doubles as the orchestration
+    instance id.
+    """
+    if lane not in LANES:
+        raise ValueError(f"Unknown lane: {lane}")
+    entry = {
+        "id": instance_id or sermon_id or f"{lane}-{uuid.uuid4().hex[:12]}",
+        "sermonId": sermon_id,
+        "lane": lane,
+        "orchestrator": orchestrator,
+        "enqueuedAt": _now().isoformat().replace("+00:00", "Z"),
+        "attempts": 0,
+    }
+    if sermon_id and "inputArtifact" not in client_input:
+        entry["inputArtifact"] = put_artifact(f"{sermon_id}/pipeline-input.json.gz", client_input)
+    else:
+        entry["input"] = client_input
+    _queue_container().create_item(entry)
+    return entry
+
+
+def depth():
+    """Number of queued entries across all lanes."""
+    rows = list(_queue_container().query_items("SELECT VALUE COUNT(1) FROM c", enable_cross_partition_query=True))
+    return rows[0] if rows else 0
+
+
+def _claim(container, entry):
+    """Remove ``entry`` from the queue. False if another dispatcher got there first."""
+    from azure.core import MatchConditions
+    from azure.cosmos import exceptions
+    try:
+        container.delete_item(entry["id"], partition_key=entry["id"],
+                              etag=entry["_etag"], match_condition=MatchConditions.IfNotModified)
+        return True
+    except (exceptions.CosmosResourceNotFoundError, exceptions.CosmosAccessConditionFailedError):
+        return False
+
+
+def _requeue_or_fail(container, entry, error):
+    """Put an entry whose orchestrator failed to start back on the queue, or fail the sermon."""
+    from schema import fail_sermon_doc
+    attempts = entry.get("attempts", 0) + 1
+    sermon_id = entry.get("sermonId")
+    if attempts >= MAX_START_ATTEMPTS:
+        log.error(f"[work_queue] {entry['id']}: giving up after {attempts} start attempts ({error})")
+        if sermon_id:
+            patch_fields(_sermons_container(), sermon_id, fail_sermon_doc("Processing failed to start — please re-upload"))
+        elif entry.get("orchestrator") == "bulk_import_orchestrator":
+            import bulk_import
+            bulk_import.fail_queued(_sermons_container(), (entry.get("input") or {}).get("sermonIds") or [],
+                                    "Import failed to start")
+        return
+    retry = {k: v for k, v in entry.items() if not k.startswith("_")}
+    retry["attempts"] = attempts
+    container.upsert_item(retry)
+    if sermon_id:
+        patch_fields(_sermons_container(), sermon_id, {"status": "queued"})
+
+
+def _wait_seconds(enqueued_at, now=None):
+    enqueued = datetime.datetime.fromisoformat(enqueued_at.replace("Z", "+00:00"))
+    return max(0, round(((now or _now()) - enqueued).total_seconds()))
+
+
+def _record_wait(lane, wait_seconds):
+    """Add one dispatch to the lane's wait-time counters (best effort — never blocks dispatch)."""
+    from azure.cosmos import exceptions
+    container = admission._control_container()
+    update = {"fields": {f"{lane}LastWaitSeconds": wait_seconds},
+              "incr": {f"{lane}Dispatched": 1, f"{lane}WaitSecondsTotal": wait_seconds}}
+    try:
+        try:
+            patch_fields(container, STATS_DOC_ID, **update)
+        except exceptions.CosmosResourceNotFoundError:
+            admission._ensure_doc(container, STATS_DOC_ID, {})
+            patch_fields(container, STATS_DOC_ID, **update)
+    except Exception as e:
+        log.warning(f"[work_queue] {lane}: failed to record wait time: {e}")
+
+
+async def _start(container, entry, lane, starter):
+    """Start one claimed entry. True if its orchestrator is running."""
+    from azure.cosmos import exceptions
+    entry_id, sermon_id = entry["id"], entry.get("sermonId")
+    try:
+        if sermon_id:
+            patch_fields(_sermons_container(), sermon_id, {"status": "processing"},
+                         filter_predicate="FROM c WHERE c.status = 'queued'")
+        client_input = entry["input"] if "input" in entry else get_artifact(entry["inputArtifact"])
+        await starter.start_new(entry["orchestrator"], instance_id=entry_id,
+                                client_input={**client_input, "admitted": True, "lane": lane})
+        return True
+    except (exceptions.CosmosResourceNotFoundError, exceptions.CosmosAccessConditionFailedError):
+        # Deleted, or no longer waiting (e.g. failed by an admin) while queued — drop the entry
+        log.warning(f"[work_queue] {entry_id}: sermon no longer queued, skipping")
+    except Exception as e:
+        log.error(f"[work_queue] {entry_id}: start failed: {e}", exc_info=True)
+        try:
+            _requeue_or_fail(container, entry, e)
+        except Exception as requeue_err:
+            log.critical(f"[work_queue] {entry_id}: start failed ({e}) AND requeue failed ({requeue_err})")
+    admission.release_slot(lane)
+    return False
+
+
+async def dispatch(starter, limit=None):
+    """Start queued work lane by lane while slots are available. Returns the started entry ids."""
+    container = _queue_container()
+    started = []
+    for lane in LANES:
+        entries = container.query_items(
+            "SELECT * FROM c WHERE c.lane = @lane ORDER BY c.enqueuedAt ASC",
+            parameters=[{"name": "@lane", "value": lane}],
+            enable_cross_partition_query=True,
+        )
+        for entry in entries:
+            if limit is not None and len(started) >= limit:
+                return started
+            if not admission.acquire_slot(lane):
+                break  # lane full — lower lanes may still have room
+            if not _claim(container, entry):
+                admission.release_slot(lane)
+                continue
+            if not await _start(container, entry, lane, starter):
+                continue
+
+            wait = _wait_seconds(entry["enqueuedAt"])
+            _record_wait(lane, wait)
+            started.append(entry["id"])
+            log.info(f"[work_queue] started {entry['orchestrator']} for {entry['id']} ({lane}, waited {wait}s)")
+    return started
+
+
+def lane_metrics():
+    """Per-lane queue depth, oldest wait, running slots and dispatch wait times."""
+    from azure.cosmos import exceptions
+    rows = list(_queue_container().query_items(
+        "SELECT c.lane, COUNT(1) AS queued, MIN(c.enqueuedAt) AS oldest FROM c GROUP BY c.lane",
+        enable_cross_partition_query=True,
+    ))
+    queued = {r.get("lane"): r for r in rows}
+    running = admission.slots_in_use()
+    try:
+        stats = admission._control_container().read_item(STATS_DOC_ID, partition_key=STATS_DOC_ID)
+    except exceptions.CosmosResourceNotFoundError:
+        stats = {}
+
+    now = _now()
+    lanes = {}
+    for lane in LANES:
+        row = queued.get(lane) or {}
+        dispatched = stats.get(f"{lane}Dispatched", 0)
+        lanes[lane] = {
+            "queued": row.get("queued", 0),
+            "oldestWaitSeconds": _wait_seconds(row["oldest"], now) if row.get("oldest") else 0,
+            "running": running.get(lane, 0),
+            "limit": admission.LANE_LIMITS[lane],
+            "dispatched": dispatched,
+            "avgWaitSeconds": round(stats.get(f"{lane}WaitSecondsTotal", 0) / dispatched, 1) if dispatched else None,
+            "lastWaitSeconds": stats.get(f"{lane}LastWaitSeconds"),
+        }
+    return {
+        "lanes": lanes,
+        "slots": {"inUse": running["count"], "max": admission.MAX_CONCURRENT,
+                  "reservedInteractive": admission.RESERVED_INTERACTIVE},
+    }
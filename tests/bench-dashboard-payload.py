@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""PSR dashboard payload benchmark — response size + serialization time.
+
+Builds synthetic /api/sermons/dashboard rows (categories, strengths,
+enrichment, cbv — same fields the route selects) and runs them through
+helpers._json_response in each mode: default, compact, compact+gzip and
+compact+br (when the brotli wheel is installed).
+
+Usage:
+    python tests/bench-dashboard-payload.py                # 1k and 10k sermons
+    python tests/bench-dashboard-payload.py --sizes 1000 50000 --repeat 5
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "api"))
+
+import helpers  # noqa: E402
+from helpers import _json_response  # noqa: E402
+
+CATEGORIES = [
+    "biblicalAccuracy", "timeInTheWord", "passageFocus", "clarity",
+    "engagement", "application", "delivery", "emotionalRange",
+]
+WEIGHTS = [25, 20, 10, 10, 10, 10, 10, 5]
+PHRASES = [
+    "The preacher grounds each point in the text of Romans 8",
+    "illustrations are vivid but occasionally run long",
+    "application is concrete and tied to the congregation's week",
+    "transitions between movements are clear and signposted",
+    "several cross-references are handled in context",
+    "pacing slows noticeably in the final third",
+]
+
+
+class _Req:
+    def __init__(self, accept):
+        self.headers = {"Accept-Encoding": accept} if accept else {}
+
+
+def _reasoning(rng):
+    return ". ".join(rng.sample(PHRASES, 3)) + "."
+
+
+def make_rows(n, seed=7):
+    rng = random.Random(seed)
+    rows = []
+    for i in range(n):
+        cats = {k: {"score": rng.randint(30, 95), "weight": w, "reasoning": _reasoning(rng)}
+                for k, w in zip(CATEGORIES, WEIGHTS)}
+        rows.append({
+            "id": f"{i:08x}-bench-4000-8000-{i:012x}",
+            "title": f"Sermon {i}: {rng.choice(PHRASES)[:40]}",
+            "pastor": f"Pastor {rng.randint(1, 200)}",
+            "date": f"2025-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}",
+            "duration": rng.randint(1500, 3600),
+            "compositePsr": round(rng.uniform(40, 90), 1),
+            "totalScore": None,
+            "status": "complete",
+            "sermonType": rng.choice(["expository", "topical", "survey"]),
+            "categories": cats,
+            "strengths": [rng.choice(PHRASES) for _ in range(3)],
+            "improvements": [rng.choice(PHRASES) for _ in range(3)],
+            "enrichment": {
+                "biblicalLanguages": {"count": rng.randint(0, 5), "items": []},
+                "churchHistory": {"count": rng.randint(0, 3), "items": []},
+                "illustrations": {"total": rng.randint(0, 8), "byType": {"personalStory": ["..."] * rng.randint(0, 3)}},
+            },
+            "cbv": None,
+            "inputType": rng.choice(["audio", "text", "rss"]),
+        })
+    return rows
+
+
+def bench(rows, repeat):
+    modes = [
+        ("default", None, False),
+        ("compact", None, True),
+        ("compact+gzip", "gzip", True),
+    ]
+    if helpers.brotli is not None:
+        modes.append(("compact+br", "br", True))
+
+    results = []
+    for name, accept, compact in modes:
+        best = float("inf")
+        size = 0
+        for _ in range(repeat):
+            t0 = time.perf_counter()
+            resp = _json_response(rows, req=_Req(accept), compact=compact)
+            best = min(best, time.perf_counter() - t0)
+            size = len(resp.get_body())
+        results.append((name, size, best))
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000])
+    parser.add_argument("--repeat", type=int, default=3, help="Best-of-N timing")
+    args = parser.parse_args()
+
+    if helpers.brotli is None:
+        print("(brotli not installed — skipping br mode)")
+    for n in args.sizes:
+        rows = make_rows(n)
+        print(f"\n── {n:,} sermons ──")
+        print(f"  {'mode':<14} {'bytes':>14} {'vs default':>11} {'time (ms)':>10}")
+        results = bench(rows, args.repeat)
+        base = results[0][1]
+        for name, size, secs in results:
+            print(f"  {name:<14} {size:>14,} {size / base:>10.1%} {secs * 1000:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -125,9 +125,21 @@ function FeedsInner() {
       setPreview(null);
       try {
         const r = await adminFetch("/api/feeds/poll", { method: "POST" });
-        const data = await r.json();
-        const total = data.results?.reduce((s: number, r: { new?: number }) => s + (r.new || 0), 0) || 0;
-        setMessage({ text: `Polled ${data.polled} feeds — ${total} new episodes submitted`, error: false });
+        if (!r.ok) throw new Error(`poll ${r.status}`);
+        const started = await r.json();
+        // The poll runs as an orchestration — wait for its summary (up to ~10 minutes)
+        let status = { status: "Pending", progress: null as { polled?: number; total?: number } | null, output: null as { polled: number; new: number } | null };
+        for (let attempt = 0; attempt < 300 && (status.status === "Pending" || status.status === "Running"); attempt++) {
+          await new Promise((res) => setTimeout(res, 2000));
+          const sr = await adminFetch(started.statusUrl);
+          if (!sr.ok) throw new Error(`status ${sr.status}`);
+          status = await sr.json();
+          if (status.progress?.total) {
+            setMessage({ text: `Polling feeds… ${status.progress.polled}/${status.progress.total}`, error: false });
+          }
+        }
+        if (status.status !== "Completed" || !status.output) throw new Error(status.status);
+        setMessage({ text: `Polled ${status.output.polled} feeds — ${status.output.new} new episodes submitted`, error: false });
       } catch {
         setMessage({ text: "Poll failed", error: true });
       } finally {
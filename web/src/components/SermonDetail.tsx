@@ -21,6 +21,25 @@ const RadarView = dynamic(() => import("@/components/RadarView"), {
 import TranscriptViewer from "@/components/TranscriptViewer";
 
 const UUID_RE = /^[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}$/i;
+const TRANSLATE_POLL_MS = 3000;
+const TRANSLATE_MAX_POLLS = 100;
+
+/** Translate a transcript; long ones come back 202 and are polled until the background job finishes. */
+async function fetchTranslation(sermonId: string, language: string): Promise<string | null> {
+  const r = await fetch(apiUrl(`/api/sermons/${sermonId}/translate`), {
+    method: "POST",
+    headers: { "Content-Type": "application/json" },
+    body: JSON.stringify({ language }),
+  });
+  if (r.status !== 202) return r.ok ? (await r.json()).text : null;
+  for (let i = 0; i < TRANSLATE_MAX_POLLS; i++) {
+    await new Promise(resolve => setTimeout(resolve, TRANSLATE_POLL_MS));
+    const poll = await fetch(apiUrl(`/api/sermons/${sermonId}/translate/${language}`));
+    if (poll.status === 202) continue;
+    return poll.ok ? (await poll.json()).text : null;
+  }
+  return null;
+}
 
 function CbvTooltip() {
   const [show, setShow] = useState(false);
@@ -158,7 +177,7 @@ export default function SermonDetailClient({ sermonId, sample, preloadedData }:
         if (!active) return;
         setSermon(data);
         setLoading(false);
-        if (data.status === "processing") {
+        if (data.status === "processing" || data.status === "queued") {
           pollAttempts++;
           if (pollAttempts >= MAX_POLL) {
             setError("Analysis is taking longer than expected. Try refreshing in a few minutes.");
@@ -230,6 +249,13 @@ export default function SermonDetailClient({ sermonId, sample, preloadedData }:
         )}
       </p>
 
+      {sermon.status === "queued" && (
+        <div aria-live="polite" className="mt-12 text-center text-gray-500">
+          <p className="text-lg font-medium text-gray-900 mb-2">Waiting in line...</p>
+          <p className="text-sm">Other sermons are being analyzed right now. Yours will start automatically.</p>
+        </div>
+      )}
+
       {sermon.status === "processing" && (
         <div aria-live="polite" className="mt-12 text-center text-gray-500">
           <div className="flex justify-center mb-6">
@@ -413,14 +439,7 @@ export default function SermonDetailClient({ sermonId, sample, preloadedData }:
                         }
                         setTranslating(true);
                         try {
-                          const r = await fetch(apiUrl(`/api/sermons/${sermon.id}/translate`), {
-                            method: "POST",
-                            headers: { "Content-Type": "application/json" },
-                            body: JSON.stringify({ language: "es" }),
-                          });
-                          const data = await r.json();
-                          if (r.ok) setSpanishText(data.text);
-                          else setSpanishText(null);
+                          setSpanishText(await fetchTranslation(sermon.id, "es"));
                         } catch {} finally { setTranslating(false); }
                       }}
                       className={`px-3 py-1 ${transcriptLang === "es" ? "bg-blue-600 text-white" : "text-gray-600 hover:bg-gray-50"}`}
@@ -462,12 +481,8 @@ export default function SermonDetailClient({ sermonId, sample, preloadedData }:
                   <button onClick={async () => {
                     setTranslating(true);
                     try {
-                      const r = await fetch(apiUrl(`/api/sermons/${sermon.id}/translate`), {
-                        method: "POST", headers: { "Content-Type": "application/json" },
-                        body: JSON.stringify({ language: "es" }),
-                      });
-                      const data = await r.json();
-                      if (r.ok) setSpanishText(data.text);
+                      const text = await fetchTranslation(sermon.id, "es");
+                      if (text) setSpanishText(text);
                     } catch {} finally { setTranslating(false); }
                   }} className="text-sm text-blue-600 hover:underline text-center py-4 w-full">Translation failed — click to retry</button>
                 )
@@ -6,7 +6,7 @@ export interface SermonSummary {
   pastor: string | null;
   date: string;
   duration: number | null;
-  status: "processing" | "complete" | "failed";
+  status: "queued" | "processing" | "complete" | "failed";
   sermonType: string | null;
   compositePsr: number | null;
   inputType?: "audio" | "text" | "youtube";